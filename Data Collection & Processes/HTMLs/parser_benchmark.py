@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Times the Flashscore parsers over the saved pages in this folder (and the
+# HTML Cache with --cache), and checks they still pull out the same values:
+    # parse_participant_rows, classify_event -> incidents
+    # parse_stats_soup, match_canonical      -> stats
+    # parse_summary_soup                     -> summary
+# For every function it prints the median time per page, pages/sec and the
+# peak memory of one call. Then:
+    # - Any output that differs from golden_results.json   -> FAIL
+    # - Any function slower than benchmark_baseline.json
+    #   by more than the tolerance (default 1.5x)          -> FAIL
+# It exits with 1 on any FAIL, so a parser change can't sneak through.
+# python3 parser_benchmark.py [--cache] [--parser=selectolax] [--repeat=5]
+#                             [--tolerance=1.5] [--update-golden] [--update-baseline]
+
+import os
+import sys
+import json
+import glob
+import time
+import statistics
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "Pipeline Tools"))
+from flashscore_parsers import (
+    classify_event,
+    match_canonical,
+    parse_participant_rows,
+    parse_stats_soup,
+    parse_summary_soup,
+)
+from soup_backends import DEFAULT_BACKEND, make_soup
+
+GOLDEN_PATH = os.path.join(HERE, "golden_results.json")
+BASELINE_PATH = os.path.join(HERE, "benchmark_baseline.json")
+TOLERANCE = 1.5
+
+# The icon divs classify_event gets called with (same lookup as the parser).
+def icon_divs(soup):
+    icons = []
+    vs = soup.select_one("div.smv__verticalSections.section")
+    if not vs:
+        return icons
+    for inc in vs.select("div.smv__participantRow div.smv__incident"):
+        icon = inc.find("div", class_="smv__incidentIcon") or inc.find("div", class_="smv__incidentIconSub")
+        if icon:
+            icons.append(icon)
+    return icons
+
+# The category texts match_canonical gets called with.
+def category_texts(soup):
+    texts = []
+    for row in soup.select("div.wcl-row_2oCpS"):
+        category = row.select_one("div.wcl-category_6sT1J strong, div[class*='wcl-category'] strong, div[class*='wcl-category']")
+        if category:
+            texts.append(category.get_text(strip=True))
+    return texts
+
+# name -> (setup(soup) -> inputs, run(inputs) -> output). The soup is built
+# once per page outside the timer, except for the "soup" entry which times
+# building it.
+def benchmarks(backend):
+    return {
+        "soup": (lambda html, soup: html, lambda html: make_soup(html, backend) is not None),
+        "parse_participant_rows": (lambda html, soup: soup, parse_participant_rows),
+        "classify_event": (lambda html, soup: icon_divs(soup), lambda icons: [classify_event(i) for i in icons]),
+        "parse_stats_soup": (lambda html, soup: soup, parse_stats_soup),
+        "match_canonical": (lambda html, soup: category_texts(soup), lambda texts: {t: match_canonical(t) for t in texts}),
+        "parse_summary_soup": (lambda html, soup: soup, parse_summary_soup),
+    }
+
+def load_documents(use_cache=False):
+    docs = {}
+    for path in sorted(glob.glob(os.path.join(glob.escape(HERE), "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            docs[os.path.basename(path)] = f.read()
+    if use_cache:
+        from html_cache import cached_pages, load_page
+        for (match_id, tab), digest in sorted(cached_pages().items()):
+            docs[f"cache/{match_id}/{tab}"] = load_page(digest)
+    return docs
+
+def time_call(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def peak_memory(fn, arg):
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+# Returns ({function: {doc: output}}, {function: stats}).
+def run(docs, backend=DEFAULT_BACKEND, repeat=5):
+    outputs = {}
+    timings = {}
+    soups = {name: make_soup(html, backend) for name, html in docs.items()}
+    for func_name, (setup, fn) in benchmarks(backend).items():
+        per_doc, peaks = [], []
+        outputs[func_name] = {}
+        for doc_name, html in docs.items():
+            arg = setup(html, soups[doc_name])
+            outputs[func_name][doc_name] = fn(arg)
+            per_doc.append(time_call(fn, arg, repeat))
+            peaks.append(peak_memory(fn, arg))
+        total = sum(per_doc)
+        timings[func_name] = {
+            "ms_per_doc": total / len(per_doc) * 1000,
+            "docs_per_sec": len(per_doc) / total if total else float("inf"),
+            "peak_kb": max(peaks) / 1024,
+        }
+        print(f"{func_name:24} {timings[func_name]['ms_per_doc']:9.3f} ms/doc  "
+              f"{timings[func_name]['docs_per_sec']:10.1f} docs/s  {timings[func_name]['peak_kb']:9.1f} KB peak")
+    # The soup entry only checks the build worked; its output isn't a parser result.
+    outputs.pop("soup")
+    return outputs, timings
+
+# Compares against the golden file; only documents that have a golden entry
+# get checked (cached pages don't, unless --update-golden was run with --cache).
+def check_golden(outputs, golden):
+    failures = []
+    for func_name, per_doc in outputs.items():
+        for doc_name, got in per_doc.items():
+            expected = golden.get(func_name, {}).get(doc_name)
+            if expected is None:
+                continue
+            # Round-trip through json so tuples/lists compare the same way.
+            if json.loads(json.dumps(got)) != expected:
+                failures.append(f"{func_name} changed output on {doc_name}:\n  expected: {expected}\n  got:      {got}")
+    return failures
+
+def check_baseline(timings, baseline, tolerance=TOLERANCE):
+    failures = []
+    for func_name, stats in timings.items():
+        before = baseline.get(func_name)
+        if before and stats["ms_per_doc"] > before["ms_per_doc"] * tolerance:
+            failures.append(f"{func_name} got slower: {stats['ms_per_doc']:.3f} ms/doc "
+                            f"vs {before['ms_per_doc']:.3f} ms/doc baseline (> {tolerance}x)")
+    return failures
+
+def main(use_cache=False, backend=DEFAULT_BACKEND, repeat=5, tolerance=TOLERANCE,
+         update_golden=False, update_baseline=False):
+    docs = load_documents(use_cache)
+    print(f"{len(docs)} pages, backend: {backend}, best of {repeat} (median)\n")
+    outputs, timings = run(docs, backend=backend, repeat=repeat)
+
+    if update_golden:
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump(outputs, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print("\nWrote", GOLDEN_PATH)
+    if update_baseline:
+        baselines = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+                baselines = json.load(f)
+        baselines[backend] = timings
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print("\nWrote", BASELINE_PATH)
+    if update_golden or update_baseline:
+        return 0
+
+    failures = []
+    if os.path.exists(GOLDEN_PATH):
+        with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+            failures += check_golden(outputs, json.load(f))
+    else:
+        print("\nNo golden results yet, run with --update-golden first.")
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            failures += check_baseline(timings, json.load(f).get(backend, {}), tolerance)
+
+    print()
+    for failure in failures:
+        print("FAIL:", failure)
+    print("FAILED" if failures else "OK: outputs match the golden results and nothing got slower")
+    return 1 if failures else 0
+
+def _arg(name, default, cast):
+    for arg in sys.argv[1:]:
+        if arg.startswith(f"--{name}="):
+            return cast(arg.split("=", 1)[1])
+    return default
+
+if __name__ == "__main__":
+    sys.exit(main(
+        use_cache="--cache" in sys.argv,
+        backend=_arg("parser", DEFAULT_BACKEND, str),
+        repeat=_arg("repeat", 5, int),
+        tolerance=_arg("tolerance", TOLERANCE, float),
+        update_golden="--update-golden" in sys.argv,
+        update_baseline="--update-baseline" in sys.argv,
+    ))
@@ -7,13 +7,18 @@
 # scored before the 15 minute mark, and before the half time mark.
 
 import os
+import sys
 import ast
 import pandas as pd
 
+# Shared tools (event store, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from event_store import event_lists_for
+from excel_cache import read_excel
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
-input_file = os.path.join(script_dir, "input_HT_incidents_AllYears.xlsx")
-output_file = os.path.join(script_dir, "output_HT_incidents_AllYears.xlsx")
-df = pd.read_excel(input_file)
+INPUT_FILE = os.path.join(script_dir, "input_HT_incidents_AllYears.xlsx")
+OUTPUT_FILE = os.path.join(script_dir, "output_HT_incidents_AllYears.xlsx")
 
 # Name of header column i'm looking for
 EVENTS_COL = "Inc"
@@ -33,15 +38,19 @@ def parse_time(event: str) -> int:
 
 
 def analyze_events(cell):
+    # Already a list when it comes from the event table.
+    if isinstance(cell, list):
+        events = cell
     # Checks if any info was missing, replaces it with defaults
-    if pd.isna(cell):
+    elif pd.isna(cell):
         return None, False, False, 0, 0 
     
     # Convert the incident report string into a list.
-    try:
-        events = ast.literal_eval(cell)  
-    except:
-        return cell, False, False, 0, 0
+    else:
+        try:
+            events = ast.literal_eval(cell)  
+        except:
+            return cell, False, False, 0, 0
 
     # This is what we initialize / start off with.
     h_15 = False
@@ -74,10 +83,19 @@ def analyze_events(cell):
 
     return events, h_15, a_15, ht_h_score, ht_a_score
 
-# Apply the analyze_events function to each row
-df[["Incident", "H_15", "A_15", "HT_H_Score", "HT_A_Score"]] = df[EVENTS_COL].apply(
-    lambda x: pd.Series(analyze_events(x))
-)
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    df = read_excel(input_file)
+
+    # Apply the analyze_events function to each row
+    # (the lists come from the parsed event table instead of the raw strings)
+    event_lists = pd.Series(event_lists_for(input_file, df, EVENTS_COL), index=df.index, dtype=object)
+    df[["Incident", "H_15", "A_15", "HT_H_Score", "HT_A_Score"]] = event_lists.apply(
+        lambda x: pd.Series(analyze_events(x))
+    )
+
+    # Save our results.
+    df.to_excel(output_file, index=False)
 
-# Save our results.
-df.to_excel(output_file, index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    # Usage: python3 'HalfTime Cleanup.py' [InputFile] [OutputFile]
+    main(*sys.argv[1:3])
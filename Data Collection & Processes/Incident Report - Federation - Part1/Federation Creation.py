@@ -1,28 +1,19 @@
+import os
+import sys
 import pandas as pd
 import ast
 import re
 
-incidents_df = pd.read_excel("full_data_v5.xlsx")
-players_df = pd.read_excel("Player Information v3.xlsx")
-players_df["Corrected Name"] = players_df["Corrected Name"].str.strip()
+# Shared tools (event store, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from event_store import event_lists_for
+from excel_cache import read_excel
+from player_index import FUZZY_THRESHOLD, federations_for, player_index_for, resolve_names, unmatched_names
 
 card_pattern = re.compile(r"(Yellow|Red)[_\w]*\s*-\s*(.+)")
 
-players_found_list = []
-federations_list = []
-
-for cell in incidents_df["INC"]:
-    if pd.isna(cell):
-        players_found_list.append([])
-        federations_list.append([])
-        continue
-    try:
-        incidents = ast.literal_eval(cell) # String to List
-    except Exception:
-        players_found_list.append([])
-        federations_list.append([])
-        continue
-
+# Names of everyone who got a card in one match's incident list.
+def card_players(incidents):
     player_names = []
 
     for incident in incidents:
@@ -32,20 +23,49 @@ for cell in incidents_df["INC"]:
             player_name = re.sub(r"\(.*?\)", "", player_name).strip()
             player_names.append(player_name)
 
-    unique_players = list(set(player_names))
+    return list(set(player_names))
+
+# fuzzy_threshold=None turns the fuzzy matching off (exact names only).
+def main(fuzzy_threshold=FUZZY_THRESHOLD):
+    incidents_df = read_excel("full_data_v5.xlsx")
+    # name -> player info, built once (and saved next to the Excel file).
+    player_index = player_index_for("Player Information v3.xlsx")
+
+    players_found_list = []
+
+    # The incident lists come from the parsed event table (parsed once, not per run).
+    for cell in event_lists_for("full_data_v5.xlsx", incidents_df, "INC"):
+        if not isinstance(cell, list) and pd.isna(cell):
+            players_found_list.append([])
+            continue
+        try:
+            incidents = cell if isinstance(cell, list) else ast.literal_eval(cell) # String to List
+        except Exception:
+            players_found_list.append([])
+            continue
+
+        players_found_list.append(card_players(incidents))
+
+    # Names that aren't in the player table as-is ("Al Habsi A.", "Cucho Hernandez")
+    # get a fuzzy match; the scores are cached so the next run skips this.
+    aliases = {}
+    if fuzzy_threshold is not None:
+        unmatched = unmatched_names(players_found_list, player_index)
+        aliases = resolve_names(unmatched, "Player Information v3.xlsx", player_index, threshold=fuzzy_threshold)
+        print(f"{len(aliases)} of {len(unmatched)} unmatched names resolved by fuzzy matching")
 
-    federations = []
-    for name in unique_players:
-        match = players_df.loc[players_df["Corrected Name"] == name, "Federation"]
-        if not match.empty:
-            federations.append(match.values[0])
-        else:
-            federations.append("Unknown")
+    # Every match's players get their federation in one join.
+    federations_list = federations_for(players_found_list, player_index, aliases=aliases)
 
-    players_found_list.append(unique_players)
-    federations_list.append(federations)
+    incidents_df["Players Found"] = players_found_list
+    incidents_df["Federations"] = federations_list
+    output_path = "output_incidents_with_federations.xlsx"
+    incidents_df.to_excel(output_path, index=False)
 
-incidents_df["Players Found"] = players_found_list
-incidents_df["Federations"] = federations_list
-output_path = "output_incidents_with_federations.xlsx"
-incidents_df.to_excel(output_path, index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    # Usage: python3 'Federation Creation.py' [--fuzzy-threshold=0.88] [--no-fuzzy]
+    threshold = FUZZY_THRESHOLD
+    for arg in sys.argv[1:]:
+        if arg.startswith("--fuzzy-threshold="):
+            threshold = float(arg.split("=", 1)[1])
+    main(None if "--no-fuzzy" in sys.argv else threshold)
@@ -1,8 +1,14 @@
+import os
+import sys
 import pandas as pd
 import ast
 
+# Shared tools (excel cache, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from excel_cache import read_excel
+
 confederations = ["AFC", "CAF", "CONMEBOL", "CONCACAF", "OFC", "UEFA"]
-df = pd.read_excel("Output_Incidents_Federations.xlsx")
+df = read_excel("Output_Incidents_Federations.xlsx")
 
 def count_federations(fed_list_str):
     if isinstance(fed_list_str, str):
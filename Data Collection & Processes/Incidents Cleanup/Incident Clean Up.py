@@ -10,43 +10,25 @@
 # However, this file wasn't 'removing', simply going through each item and
 # ignoring anything that fit the above criteria.
 
+import os
+import sys
 import pandas as pd
 import ast
 import re
 
-# Load your Excel file
-df = pd.read_excel("output_incidents_random.xlsx")
-# df = pd.read_excel("output_incidents_2002-2003.xlsx")
-# df = pd.read_excel("output_incidents_2003-2004.xlsx")
-# df = pd.read_excel("output_incidents_2004-2005.xlsx")
-# df = pd.read_excel("output_incidents_2005-2006.xlsx")
-# df = pd.read_excel("output_incidents_2006-2007.xlsx")
-# df = pd.read_excel("output_incidents_2007-2008.xlsx")
-# df = pd.read_excel("output_incidents_2008-2009.xlsx")
-# df = pd.read_excel("output_incidents_2009-2010.xlsx")
-# df = pd.read_excel("output_incidents_2010-2011.xlsx")
-# df = pd.read_excel("output_incidents_2011-2012.xlsx")
-# df = pd.read_excel("output_incidents_2012-2013.xlsx")
-# df = pd.read_excel("output_incidents_2013-2014.xlsx")
-# df = pd.read_excel("output_incidents_2014-2015.xlsx")
-# df = pd.read_excel("output_incidents_2015-2016.xlsx")
-# df = pd.read_excel("output_incidents_2016-2017.xlsx")
-# df = pd.read_excel("output_incidents_2017-2018.xlsx")
-# df = pd.read_excel("output_incidents_2018-2019.xlsx")
-# df = pd.read_excel("output_incidents_2019-2020.xlsx")
-# df = pd.read_excel("output_incidents_2020-2021.xlsx")
-# df = pd.read_excel("output_incidents_2021-2022.xlsx")
-# df = pd.read_excel("output_incidents_2022-2023.xlsx")
-# df = pd.read_excel("output_incidents_2023-2024.xlsx")
-# df = pd.read_excel("output_incidents_2024-2025.xlsx")
+# Shared tools (event store, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from event_store import event_lists_for
+from excel_cache import read_excel
 
 def clean_events(cell):
     # Checks if anything in the row was left blank.
-    if pd.isna(cell):
+    if not isinstance(cell, list) and pd.isna(cell):
         return cell, None
     
     try:
-        events = ast.literal_eval(cell)
+        # Already a list when it comes from the event table.
+        events = cell if isinstance(cell, list) else ast.literal_eval(cell)
         cleaned_events = []
         error_flag = None
 
@@ -70,36 +52,48 @@ def clean_events(cell):
     except Exception:
         return cell, "Error"  # mark parsing failures as errors
 
-# Apply the function to get both cleaned events and error flag
-df[["Cleaned_Events", "Error"]] = df["events"].apply(
-    lambda x: pd.Series(clean_events(x))
-)
+def main(input_file="output_incidents_random.xlsx", output_file="cleaned_file_random.xlsx"):
+    df = read_excel(input_file)
 
-# Keep id, original, cleaned, error
-cleaned_df = df[["id", "events", "Cleaned_Events", "Error"]]
+    # Apply the function to get both cleaned events and error flag
+    # (the lists come from the parsed event table instead of the raw strings)
+    event_lists = pd.Series(event_lists_for(input_file, df, "events"), index=df.index, dtype=object)
+    df[["Cleaned_Events", "Error"]] = event_lists.apply(
+        lambda x: pd.Series(clean_events(x))
+    )
 
-# Save back to Excel
-cleaned_df.to_excel("cleaned_file_random.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2002-2003.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2003-2004.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2004-2005.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2005-2006.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2006-2007.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2007-2008.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2008-2009.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2009-2010.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2010-2011.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2011-2012.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2012-2013.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2013-2014.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2014-2015.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2015-2016.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2016-2017.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2017-2018.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2018-2019.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2019-2020.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2020-2021.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2021-2022.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2022-2023.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2023-2024.xlsx", index=False)
-# cleaned_df.to_excel("cleaned_file_2024-2025.xlsx", index=False)
+    # Keep id, original, cleaned, error
+    cleaned_df = df[["id", "events", "Cleaned_Events", "Error"]]
+
+    # Save back to Excel
+    cleaned_df.to_excel(output_file, index=False)
+
+# The other seasons I ran it on (python3 'Pipeline Tools/season_runner.py' clean
+# does all of them at once):
+# main("output_incidents_2002-2003.xlsx", "cleaned_file_2002-2003.xlsx")
+# main("output_incidents_2003-2004.xlsx", "cleaned_file_2003-2004.xlsx")
+# main("output_incidents_2004-2005.xlsx", "cleaned_file_2004-2005.xlsx")
+# main("output_incidents_2005-2006.xlsx", "cleaned_file_2005-2006.xlsx")
+# main("output_incidents_2006-2007.xlsx", "cleaned_file_2006-2007.xlsx")
+# main("output_incidents_2007-2008.xlsx", "cleaned_file_2007-2008.xlsx")
+# main("output_incidents_2008-2009.xlsx", "cleaned_file_2008-2009.xlsx")
+# main("output_incidents_2009-2010.xlsx", "cleaned_file_2009-2010.xlsx")
+# main("output_incidents_2010-2011.xlsx", "cleaned_file_2010-2011.xlsx")
+# main("output_incidents_2011-2012.xlsx", "cleaned_file_2011-2012.xlsx")
+# main("output_incidents_2012-2013.xlsx", "cleaned_file_2012-2013.xlsx")
+# main("output_incidents_2013-2014.xlsx", "cleaned_file_2013-2014.xlsx")
+# main("output_incidents_2014-2015.xlsx", "cleaned_file_2014-2015.xlsx")
+# main("output_incidents_2015-2016.xlsx", "cleaned_file_2015-2016.xlsx")
+# main("output_incidents_2016-2017.xlsx", "cleaned_file_2016-2017.xlsx")
+# main("output_incidents_2017-2018.xlsx", "cleaned_file_2017-2018.xlsx")
+# main("output_incidents_2018-2019.xlsx", "cleaned_file_2018-2019.xlsx")
+# main("output_incidents_2019-2020.xlsx", "cleaned_file_2019-2020.xlsx")
+# main("output_incidents_2020-2021.xlsx", "cleaned_file_2020-2021.xlsx")
+# main("output_incidents_2021-2022.xlsx", "cleaned_file_2021-2022.xlsx")
+# main("output_incidents_2022-2023.xlsx", "cleaned_file_2022-2023.xlsx")
+# main("output_incidents_2023-2024.xlsx", "cleaned_file_2023-2024.xlsx")
+# main("output_incidents_2024-2025.xlsx", "cleaned_file_2024-2025.xlsx")
+
+if __name__ == "__main__":
+    # Usage: python3 'Incident Clean Up.py' [InputFile] [OutputFile]
+    main(*sys.argv[1:3])
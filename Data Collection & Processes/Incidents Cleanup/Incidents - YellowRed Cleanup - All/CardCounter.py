@@ -4,13 +4,41 @@
 # Summary:
 # ----------------------------------------------------------------------- #
 # This file just counts all yellows and red cards in an incident report
-
+# count_cards() is the original one-match-at-a-time version. process_excel()
+# now uses count_cards_table(), which does every match in the file at once
+# off the event table's already split event_type / side / player columns,
+# with the same rules (and gives the exact same numbers):
+    # - 'red_home' / 'red_card_home' (or _away) in the event -> straight red
+    # - otherwise 'yellow_home' / 'yellow_away'              -> yellow for the
+    #   player (the text right after ' - ', "(detail)" and all)
+    # - 2+ yellows for the same player                        -> +1 red
+# Run with --verify to also run the old loop (and the VERIFY_CASES) and check
+# they match.
+# Speed, full_data_v8 (6,080 matches): the old loop ~1.05s, this ~45ms
+# (~23x) once the event sidecar is there. The first run on a file still has
+# to parse every event once to write the sidecar, so that one is only ~1.8x
+# faster than the loop (python3 event_store.py convert {ExcelFile} does that
+# part ahead of time).
+
+import time
 import pandas as pd
+import numpy as np
 import ast
 from collections import Counter
 import sys
 import os
 
+# Shared tools (event store, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Pipeline Tools"))
+from event_store import event_table_for, to_event_table
+from excel_cache import read_excel
+
+try:
+    import pyarrow as pa
+    ARROW_STRING = pd.ArrowDtype(pa.string())
+except ImportError:
+    ARROW_STRING = None
+
 def parse_incidents(cell):
     if isinstance(cell, list):
         return cell
@@ -67,17 +95,144 @@ def count_cards(events):
     return counts
 
 
-def process_excel(infile, outfile):
-    df = pd.read_excel(infile, dtype=str)
+COUNT_COLS = ["H_Yellow_Card", "A_Yellow_Card", "H_Red_Card", "A_Red_Card"]
+TABLE_COLS = ["row", "event_type", "side", "raw"]
+
+# The same substring checks count_cards does on event.lower(), made on
+# "<event_type>_<side>" from the event table.
+RED_HOME_TAGS = ("red_home", "red_card_home")
+RED_AWAY_TAGS = ("red_away", "red_card_away")
+YELLOW_HOME_TAGS = ("yellow_home",)
+YELLOW_AWAY_TAGS = ("yellow_away",)
+
+# Marks the events whose "<event_type>_<side>" contains any of `tags`. The
+# check runs once per distinct type/side pair (a few dozen), then every event
+# just looks its pair up by category code.
+def kind_mask(types, sides, tags):
+    names = [f"{t}_{s}".lower() for t in types.categories for s in sides.categories]
+    lookup = np.array([any(tag in name for tag in tags) for name in names] + [False])
+    type_codes = types.codes.to_numpy(dtype=np.int64)
+    side_codes = sides.codes.to_numpy(dtype=np.int64)
+    pair = np.where((type_codes >= 0) & (side_codes >= 0), type_codes * len(sides.categories) + side_codes, len(names))
+    return lookup[pair]
+
+# event.split(" - ")[1].strip() for events that have a " - ". With pyarrow
+# the split runs in Arrow instead of making a Python list per event.
+def player_keys(raw):
+    if ARROW_STRING is not None:
+        return raw.astype(ARROW_STRING).str.split(" - ", n=2, regex=False).list[1].str.strip()
+    return raw.str.split(" - ", n=2, regex=False).str[1].str.strip()
+
+# Events the tag lookup can't be trusted for: "_home" / "_away" shows up in
+# the text again after the type/side (a name or detail that looks like a tag),
+# which the old substring checks on the whole event would have seen.
+EXTRA_TAG_PATTERN = r"_(?:home|away).*_(?:home|away)"
+
+# The vectorized count_cards over a whole event table (columns row,
+# event_type, side, raw). Returns one row of counts per match, plus the rows
+# it can't count the old way from the table alone (an event it couldn't split
+# into type/side, or one matched by EXTRA_TAG_PATTERN).
+def count_cards_table(table, n_rows):
+    rows = table["row"].to_numpy(dtype=np.int64)
+    types = table["event_type"].astype("category").cat
+    sides = table["side"].astype("category").cat
+
+    red_home = kind_mask(types, sides, RED_HOME_TAGS)
+    red_away = ~red_home & kind_mask(types, sides, RED_AWAY_TAGS)
+    yellow_home = kind_mask(types, sides, YELLOW_HOME_TAGS)
+    yellow = ~red_home & ~red_away & (yellow_home | kind_mask(types, sides, YELLOW_AWAY_TAGS))
+
+    raw = table["raw"]
+    odd = table["event_type"].isna().to_numpy() | raw.str.contains(EXTRA_TAG_PATTERN, case=False, regex=True).to_numpy(dtype=bool, na_value=False)
+    unsure = np.unique(rows[odd])
+
+    # Only yellows with a " - " count, keyed on the same player text the
+    # loop used ("(detail)" and all).
+    has_dash = raw.str.contains(" - ", regex=False).to_numpy(dtype=bool, na_value=False)
+    booked = yellow & has_dash
+    booked_rows = rows[booked]
+    booked_home = yellow_home[booked]
+    players = pd.DataFrame({"row": booked_rows, "home": booked_home, "player": player_keys(raw[booked]).to_numpy()})
+
+    # 2+ yellows for the same player in the same match (same side) is a red.
+    per_player = players.groupby(["row", "home", "player"], sort=False).size()
+    doubled = per_player[per_player.to_numpy() >= 2].index
+    doubled_rows = doubled.get_level_values("row").to_numpy(dtype=np.int64)
+    doubled_home = doubled.get_level_values("home").to_numpy(dtype=bool)
+
+    counts = pd.DataFrame({
+        "H_Yellow_Card": np.bincount(booked_rows[booked_home], minlength=n_rows),
+        "A_Yellow_Card": np.bincount(booked_rows[~booked_home], minlength=n_rows),
+        "H_Red_Card": np.bincount(rows[red_home], minlength=n_rows) + np.bincount(doubled_rows[doubled_home], minlength=n_rows),
+        "A_Red_Card": np.bincount(rows[red_away], minlength=n_rows) + np.bincount(doubled_rows[~doubled_home], minlength=n_rows),
+    })
+    return counts, unsure
+
+# Card counts for every row of `df` from its event table. Cells the table
+# couldn't read (not a list), and the rows count_cards_table wasn't sure
+# about, go through the original parse_incidents/count_cards so they behave
+# the same.
+def count_cards_events(table, meta, df, events_col="INC"):
+    counts, unsure = count_cards_table(table, len(df))
+    redo = set(int(row_number) for row_number in meta["bad_rows"]) | set(unsure.tolist())
+    for row_number in sorted(redo):
+        counts.loc[row_number, COUNT_COLS] = list(count_cards(parse_incidents(df[events_col].iloc[row_number])).values())
+    counts.index = df.index
+    return counts
 
+# Same, for a sheet read from infile (the event table comes from its sidecar).
+def count_cards_frame(infile, df, events_col="INC"):
+    table, meta = event_table_for(infile, df, events_col, columns=TABLE_COLS)
+    return count_cards_events(table, meta, df, events_col)
+
+# Matches --verify always checks as well, whatever is in the file: the
+# corners where the table and the old string checks could part ways.
+VERIFY_CASES = [
+    ["10' Yellow_Home - Mendy B.(Foul)", "50' Yellow_Home - Mendy B.(Argument)"],
+    ["10' Yellow_Home - Mendy B.(Foul)", "50' Yellow_Home - Mendy B.(Foul)"],
+    ["10' Yellow_Away - Mendy B. (Foul)", "50' Yellow_Away - Mendy B.(Foul)"],
+    ["39' Yellow_Away - ", "60' Yellow_Away - ", "70' Yellow_Home"],
+    ["20' Yellow_Home -Kane H.", "30' Yellow_Home - Kane H. - Spurs", "80' Yellow_Home - Kane H. - Spurs"],
+    ["5' Red_Card_Away - Keane R.", "7' Yellow_Red_Home - Vieira P.", "9' Goal_Home - Yellow_Home Jr."],
+    ["73:00 Yellow_Home - Pinnock E. (Roughing)", "75' Yellow_Home - Pinnock E. (Roughing)"],
+]
+
+def verify_cases():
+    df = pd.DataFrame({"INC": [str(case) for case in VERIFY_CASES]})
+    table, meta = to_event_table(df, "INC")
+    got = count_cards_events(table[TABLE_COLS], meta, df)
+    return count_cards_loop(df)[COUNT_COLS].equals(got[COUNT_COLS])
+
+# The old row-by-row loop, kept to check the fast one against.
+def count_cards_loop(df, events_col="INC"):
     results = []
     for _, row in df.iterrows():
-        events = parse_incidents(row["INC"])
+        events = parse_incidents(row[events_col])
         counts = count_cards(events)
         results.append(counts)
+    return pd.DataFrame(results, index=df.index)
+
+def process_excel(infile, outfile, verify=False):
+    df = read_excel(infile, dtype=str)
+
+    start = time.perf_counter()
+    counts_df = count_cards_frame(infile, df)
+    print(f"Counted cards for {len(df)} matches in {time.perf_counter() - start:.3f}s")
+
+    if verify:
+        start = time.perf_counter()
+        expected = count_cards_loop(df)
+        print(f"Old loop took {time.perf_counter() - start:.3f}s")
+        if not verify_cases():
+            print("MISMATCH on the built-in VERIFY_CASES")
+            sys.exit(1)
+        if not expected[COUNT_COLS].equals(counts_df[COUNT_COLS]):
+            bad = (expected[COUNT_COLS] != counts_df[COUNT_COLS]).any(axis=1)
+            print(f"MISMATCH on {bad.sum()} rows:\n", pd.concat([expected[bad], counts_df[bad]], axis=1).head(20))
+            sys.exit(1)
+        print("Verified: same counts as the old loop.")
 
     # merge the results into the dataframe
-    counts_df = pd.DataFrame(results)
     df = pd.concat([df, counts_df], axis=1)
 
     df.to_excel(outfile, index=False)
@@ -93,4 +248,4 @@ if __name__ == "__main__":
     outfile = sys.argv[2]
 
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    process_excel(infile, outfile)
+    process_excel(infile, outfile, verify="--verify" in sys.argv)
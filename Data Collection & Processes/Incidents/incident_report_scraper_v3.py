@@ -11,8 +11,12 @@
 # The output that this creates is a list of items that look like this:
 # ['<time> <EventType>_<Side> - <PlayerName> (AssistOrReason)']
 
+import os
 import re
+import sys
 import time
+import queue
+import multiprocessing as mp
 import pandas as pd
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -20,7 +24,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # Just driver stuff; allows this file to run without issues.
 try:
@@ -30,6 +34,14 @@ try:
 except Exception:
     WEBDRIVER_MANAGER = False
 
+# Shared tools (scrape journal, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from scrape_journal import journal_path_for, start_journal, append_journal, compact_journal
+from html_cache import store_url_page
+from browser_extract import extract_incidents
+from rate_limiter import DEFAULT_RPS, PageNotLoaded, RateLimiter, rps_from_argv
+from event_store import save_event_sidecar
+
 def get_driver(headless=True):
     opts = Options()
     if headless:
@@ -143,37 +155,218 @@ def scrape_incidents_for_url(driver, url):
             EC.presence_of_element_located((By.CSS_SELECTOR, "div.smv__verticalSections.section"))
         )
     except TimeoutException:
-        return []
+        raise PageNotLoaded(f"incidents section never loaded for: {url}")
 
     time.sleep(0.5)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = driver.page_source
+    store_url_page(url, html)
+    soup = BeautifulSoup(html, "html.parser")
     return parse_participant_rows(soup)
 
+# Picks how a page gets read: "soup" pulls the whole page_source into
+# BeautifulSoup, "js" runs the in-page extractor and only gets the rows back.
+def scraper_for(extract):
+    return extract_incidents if extract == "js" else scrape_incidents_for_url
+
 # This bad boy is the main function that runs the entire show #
-def main(infile, outfile, headless=True):
+# Every url is written to the journal as soon as it's scraped; resume=True
+# skips the urls that already finished fine in a previous run.
+# The rate limiter paces the requests (at most `rps` per second) and backs off
+# + retries when a page didn't load. A match with no incidents is kept as [].
+def main(infile, outfile, headless=True, resume=False, extract="soup", rps=DEFAULT_RPS):
+    scrape = scraper_for(extract)
+    limiter = RateLimiter(rps=rps)
     df = pd.read_excel(infile, dtype=str)
+    urls = df["URLS"].dropna().tolist()
+    journal = journal_path_for(outfile)
+    done = start_journal(journal, resume=resume)
     driver = get_driver(headless=headless)
-    rows = []
     try:
-        urls = df["URLS"].dropna().tolist()
         for i, url in enumerate(urls, start=1):
-            print(f"[{i}/{len(urls)}] {url}")
+            if url in done:
+                continue
+            print(f"[{i}/{len(urls)}] {url} ({limiter.describe(url)})")
             try:
-                incs = scrape_incidents_for_url(driver, url)
-                rows.append({"SourceURL": url, "INC": str(incs)})
+                incs = limiter.fetch(url, lambda: scrape(driver, url))
+                row = {"SourceURL": url, "INC": str(incs)}
             except Exception as e:
-                rows.append({"SourceURL": url, "INC": "[]", "Error": str(e)})
-            time.sleep(0.5)
+                row = {"SourceURL": url, "INC": "[]", "Error": str(e)}
+            append_journal(journal, url, row)
     finally:
         driver.quit()
 
-    out_df = pd.DataFrame(rows)
-    out_df.to_excel(outfile, index=False)
+    out_df = compact_journal(journal, urls, outfile)
+    # The parsed event table (Parquet) goes right next to the Excel file.
+    save_event_sidecar(out_df, outfile)
+    print("Saved:", outfile)
+
+# ----------------------------------------------------------------------- #
+# Pool mode: several isolated Chrome workers instead of one serial driver.
+# ----------------------------------------------------------------------- #
+
+# Chrome slowly leaks memory over a long session, so each worker throws its
+# driver away and starts a fresh one after this many pages.
+DRIVER_MAX_PAGES = 150
+
+# Starts (or restarts) a worker's driver, quitting the old one if it exists.
+def _fresh_driver(driver, headless):
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    return get_driver(headless=headless)
+
+# Each worker process owns its own driver and scrapes whatever (index, url)
+# the parent puts in its inbox, until it gets None. Each worker paces itself
+# with its own slice of the requests-per-second budget.
+def _pool_worker(worker_id, inbox, result_queue, headless, max_pages, extract, rps):
+    scrape = scraper_for(extract)
+    limiter = RateLimiter(rps=rps)
+    driver = None
+    pages = 0
+    try:
+        while True:
+            task = inbox.get()
+            if task is None:
+                break
+            index, url = task
+
+            row = None
+            for attempt in range(2):
+                try:
+                    if driver is None or pages >= max_pages:
+                        driver = _fresh_driver(driver, headless)
+                        pages = 0
+                    pages += 1
+                    incs = limiter.fetch(url, lambda: scrape(driver, url))
+                    row = {"SourceURL": url, "INC": str(incs)}
+                    break
+                # Chrome crashed or hung; drop the driver so the retry gets a fresh one.
+                except WebDriverException as e:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+                    row = {"SourceURL": url, "INC": "[]", "Error": str(e)}
+                except Exception as e:
+                    row = {"SourceURL": url, "INC": "[]", "Error": str(e)}
+                    break
+
+            result_queue.put((worker_id, index, row))
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+# Same output as main(), but spreads the urls over `workers` Chrome processes.
+# The parent keeps the shared queue of urls and hands the next one to whichever
+# worker just finished, so it always knows which url each worker is holding.
+# Rows go to the journal as they come back, and the Excel file is written in
+# the same order as the input file.
+# `rps` is the budget for ALL the workers together; each one gets rps / workers.
+def main_pool(infile, outfile, workers=4, headless=True, max_pages=DRIVER_MAX_PAGES, resume=False, extract="soup", rps=DEFAULT_RPS):
+    df = pd.read_excel(infile, dtype=str)
+    urls = df["URLS"].dropna().tolist()
+    journal = journal_path_for(outfile)
+    already_done = start_journal(journal, resume=resume)
+    pending = [(index, url) for index, url in enumerate(urls) if url not in already_done]
+    pending.reverse()
+    total = len(pending)
+    if total == 0:
+        save_event_sidecar(compact_journal(journal, urls, outfile), outfile)
+        print("Saved:", outfile)
+        return
+
+    ctx = mp.get_context("spawn")
+    result_queue = ctx.Queue()
+    procs = {}
+    inboxes = {}
+    in_flight = {}
+    retried = set()
+    done = 0
+    workers = max(1, min(workers, total))
+
+    def start_worker(worker_id):
+        inboxes[worker_id] = ctx.Queue()
+        procs[worker_id] = ctx.Process(
+            target=_pool_worker,
+            args=(worker_id, inboxes[worker_id], result_queue, headless, max_pages, extract, rps / workers),
+        )
+        procs[worker_id].start()
+
+    def hand_out(worker_id):
+        if pending:
+            in_flight[worker_id] = pending.pop()
+            inboxes[worker_id].put(in_flight[worker_id])
+
+    start_time = time.time()
+    for worker_id in range(workers):
+        start_worker(worker_id)
+        hand_out(worker_id)
+
+    try:
+        while done < total:
+            try:
+                worker_id, index, row = result_queue.get(timeout=5)
+            except queue.Empty:
+                # A worker process died outright (not just its driver): retry its
+                # url once on a replacement worker, then give it up as an error.
+                for worker_id, proc in list(procs.items()):
+                    if proc.is_alive():
+                        continue
+                    task = in_flight.pop(worker_id, None)
+                    if task is not None:
+                        index, url = task
+                        if index in retried:
+                            append_journal(journal, url, {"SourceURL": url, "INC": "[]", "Error": "worker process died"})
+                            done += 1
+                        else:
+                            retried.add(index)
+                            pending.append(task)
+                    if pending:
+                        start_worker(worker_id)
+                        hand_out(worker_id)
+                    else:
+                        del procs[worker_id]
+                continue
+
+            in_flight.pop(worker_id, None)
+            hand_out(worker_id)
+            append_journal(journal, urls[index], row)
+            done += 1
+            elapsed = time.time() - start_time
+            rate = done / elapsed * 60 if elapsed else 0.0
+            print(f"[{done}/{total}] worker {worker_id}: {urls[index]} ({rate:.1f} matches/min)")
+    finally:
+        for worker_id in procs:
+            inboxes[worker_id].put(None)
+        for proc in procs.values():
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+
+    elapsed = time.time() - start_time
+    rate = total / elapsed * 60 if elapsed else 0.0
+    print(f"Scraped {total} matches in {elapsed / 60:.1f} min ({rate:.1f} matches/min)")
+
+    save_event_sidecar(compact_journal(journal, urls, outfile), outfile)
     print("Saved:", outfile)
 
 if __name__ == "__main__":
+    # Run with --resume to pick up where a crashed run left off.
+    # Run with --js to read the pages with the in-browser extractor.
+    # Run with --rps=2 to change the requests-per-second budget.
+    resume = "--resume" in sys.argv
+    extract = "js" if "--js" in sys.argv else "soup"
+    rps = rps_from_argv(sys.argv)
     # main("input_urls_test.xlsx", "output_incidents_test.xlsx", headless=True)
-    main("input_urls_random-test.xlsx", "output_incidents_random-test.xlsx", headless=True)
+    main("input_urls_random-test.xlsx", "output_incidents_random-test.xlsx", headless=True, resume=resume, extract=extract, rps=rps)
+    # main_pool("input_urls_random-test.xlsx", "output_incidents_random-test.xlsx", workers=4, headless=True, resume=resume, extract=extract, rps=rps)
+    # Every season at once: python3 'Pipeline Tools/season_runner.py' scrape
     # main("input_urls_2002-2003.xlsx", "output_incidents_2002-2003.xlsx", headless=True)
     # main("input_urls_2003-2004.xlsx", "output_incidents_2003-2004.xlsx", headless=True)
     # main("input_urls_2004-2005.xlsx", "output_incidents_2004-2005.xlsx", headless=True)
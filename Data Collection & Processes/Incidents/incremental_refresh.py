@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Re-running a season used to re-scrape all 380 matches, even when almost all
+# of them were already sitting in '[Output] Incident Reports - 2002-2025' or
+# in the master full_data_v*.xlsx. This only scrapes what's missing:
+    # 1. Reads the season's input urls and its existing output file.
+    # 2. Skips every match id that is already collected: a row in the output
+    #    with a non-empty INC and no Error, or a 'Game Link' in the newest
+    #    full_data_v*.xlsx.
+    # 3. Scrapes the rest (new urls, errored urls, empty INC lists) with the
+    #    incident scraper, and merges them back into the season's output file
+    #    in the same order as the input file.
+# During the season that's usually a handful of matches, so a daily refresh
+# takes seconds instead of a full season crawl.
+# python3 incremental_refresh.py 2024-2025 [more seasons...] [--all]
+#         [--resume] [--js] [--workers=4] [--rps=1] [--ignore-master] [--dry-run]
+
+import os
+import re
+import sys
+import ast
+import glob
+import time
+import pandas as pd
+
+# Shared tools (journal, rate limiter, url helpers) live in 'Pipeline Tools'.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+import incident_report_scraper_v3 as incident_scraper
+from event_store import save_event_sidecar
+from excel_cache import read_excel
+from flashscore_urls import match_id_from_url
+from rate_limiter import DEFAULT_RPS, rps_from_argv
+from script_loader import REPO_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+INPUT_DIR = os.path.join(HERE, "[Input] Incident URLs - 2002-2025")
+OUTPUT_DIR = os.path.join(HERE, "[Output] Incident Reports - 2002-2025")
+MASTER_DIR = os.path.join(REPO_DIR, "Master Datasets", "Incident Report Dataset")
+
+def season_paths(season):
+    return (os.path.join(INPUT_DIR, f"input_urls_{season}.xlsx"),
+            os.path.join(OUTPUT_DIR, f"output_incidents_{season}.xlsx"))
+
+def all_seasons():
+    seasons = []
+    for path in sorted(glob.glob(os.path.join(glob.escape(INPUT_DIR), "input_urls_*.xlsx"))):
+        match = re.search(r"input_urls_(\d{4}-\d{4})\.xlsx$", path)
+        if match:
+            seasons.append(match.group(1))
+    return seasons
+
+# The newest full_data_vN.xlsx (by N, not by name, so v10 beats v9).
+def latest_master(master_dir=MASTER_DIR):
+    versions = []
+    for path in glob.glob(os.path.join(glob.escape(master_dir), "full_data_v*.xlsx")):
+        match = re.search(r"full_data_v(\d+)\.xlsx$", path)
+        if match:
+            versions.append((int(match.group(1)), path))
+    return max(versions)[1] if versions else None
+
+def master_match_ids(master_path):
+    if master_path is None:
+        return set()
+    links = read_excel(master_path, columns=["Game Link"], dtype=str)["Game Link"].dropna()
+    return {match_id for match_id in map(match_id_from_url, links) if match_id}
+
+# A row counts as done when it has at least one incident and no error.
+def is_good_row(row):
+    if isinstance(row.get("Error"), str) and row["Error"]:
+        return False
+    inc = row.get("INC")
+    if not isinstance(inc, str):
+        return False
+    try:
+        return len(ast.literal_eval(inc)) > 0
+    except (ValueError, SyntaxError):
+        return False
+
+def load_output(outfile):
+    if not os.path.exists(outfile):
+        return pd.DataFrame(columns=["SourceURL", "INC"])
+    return read_excel(outfile, dtype=str)
+
+# Returns the urls that still need scraping, and why (for the printout).
+def plan_refresh(urls, existing_df, master_ids):
+    good_ids = set()
+    seen_ids = set()
+    for row in existing_df.to_dict("records"):
+        match_id = match_id_from_url(row.get("SourceURL") or "")
+        if match_id is None:
+            continue
+        seen_ids.add(match_id)
+        if is_good_row(row):
+            good_ids.add(match_id)
+
+    todo, reasons = [], {"new": 0, "retry": 0}
+    for url in urls:
+        match_id = match_id_from_url(url)
+        if match_id in good_ids or match_id in master_ids:
+            continue
+        todo.append(url)
+        reasons["retry" if match_id in seen_ids else "new"] += 1
+    return todo, reasons
+
+# New rows replace old ones for the same match id, unless the new one failed
+# and the old one was fine. Rows end up in input order; rows for urls that
+# aren't in the input any more stay at the end.
+def merge_rows(urls, existing_df, new_df):
+    rows = {}
+    for row in existing_df.to_dict("records"):
+        rows[match_id_from_url(row.get("SourceURL") or "") or row.get("SourceURL")] = row
+    for row in new_df.to_dict("records"):
+        key = match_id_from_url(row.get("SourceURL") or "") or row.get("SourceURL")
+        if key not in rows or is_good_row(row) or not is_good_row(rows[key]):
+            rows[key] = row
+
+    ordered = []
+    for url in urls:
+        key = match_id_from_url(url) or url
+        if key in rows:
+            ordered.append(rows.pop(key))
+    ordered.extend(rows.values())
+
+    merged = pd.DataFrame(ordered)
+    columns = ["SourceURL", "INC"] + [c for c in merged.columns if c not in ("SourceURL", "INC")]
+    merged = merged.reindex(columns=columns)
+    if "Error" in merged.columns and merged["Error"].isna().all():
+        merged = merged.drop(columns="Error")
+    return merged
+
+def refresh_season(season, resume=False, extract="soup", workers=1, rps=DEFAULT_RPS,
+                   master_ids=frozenset(), dry_run=False):
+    infile, outfile = season_paths(season)
+    urls = pd.read_excel(infile, dtype=str)["URLS"].dropna().tolist()
+    existing_df = load_output(outfile)
+    todo, reasons = plan_refresh(urls, existing_df, master_ids)
+    print(f"{season}: {len(urls)} urls, {len(todo)} to scrape ({reasons['new']} new, {reasons['retry']} errored/empty)")
+    if not todo or dry_run:
+        return 0
+
+    # The delta gets its own input/output (and journal) next to the season's
+    # output, so a crashed refresh can be picked up again with --resume.
+    delta_in = os.path.join(OUTPUT_DIR, f"refresh_urls_{season}.xlsx")
+    delta_out = os.path.join(OUTPUT_DIR, f"refresh_incidents_{season}.xlsx")
+    if not (resume and os.path.exists(delta_in)):
+        pd.DataFrame({"URLS": todo}).to_excel(delta_in, index=False)
+
+    if workers > 1:
+        incident_scraper.main_pool(delta_in, delta_out, workers=workers, resume=resume, extract=extract, rps=rps)
+    else:
+        incident_scraper.main(delta_in, delta_out, resume=resume, extract=extract, rps=rps)
+
+    merged = merge_rows(urls, existing_df, pd.read_excel(delta_out, dtype=str))
+    # Write next to the real file first so a crash never leaves a broken output.
+    tmp_out = outfile.replace(".xlsx", ".tmp.xlsx")
+    merged.to_excel(tmp_out, index=False)
+    os.replace(tmp_out, outfile)
+    save_event_sidecar(merged, outfile)
+
+    for path in (delta_in, delta_out, f"{delta_out}.journal.jsonl"):
+        if os.path.exists(path):
+            os.remove(path)
+    print(f"{season}: merged into {outfile}")
+    return len(todo)
+
+def main(seasons, resume=False, extract="soup", workers=1, rps=DEFAULT_RPS, use_master=True, dry_run=False):
+    start_time = time.time()
+    master_path = latest_master() if use_master else None
+    master_ids = master_match_ids(master_path)
+    if master_path:
+        print(f"{len(master_ids)} matches already in {os.path.basename(master_path)}")
+
+    scraped = 0
+    for season in seasons:
+        scraped += refresh_season(season, resume=resume, extract=extract, workers=workers, rps=rps,
+                                  master_ids=master_ids, dry_run=dry_run)
+    print(f"Refreshed {len(seasons)} season(s), scraped {scraped} matches in {time.time() - start_time:.1f}s")
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    seasons = all_seasons() if "--all" in sys.argv else args
+    if not seasons:
+        print("CMD Terminal Should Read: python3 incremental_refresh.py 2024-2025 [more seasons] [--all] "
+              "[--resume] [--js] [--workers=4] [--rps=1] [--ignore-master] [--dry-run]")
+        sys.exit(1)
+    workers = 1
+    for arg in sys.argv[1:]:
+        if arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+    main(seasons, resume="--resume" in sys.argv, extract="js" if "--js" in sys.argv else "soup",
+         workers=workers, rps=rps_from_argv(sys.argv), use_master="--ignore-master" not in sys.argv,
+         dry_run="--dry-run" in sys.argv)
@@ -14,6 +14,8 @@
     #   Free Kicks - Home, Free Kicks - Away,
     #   Fouls - Home, Fouls - Away
 
+import os
+import sys
 import time
 import re
 from urllib.parse import urljoin
@@ -32,6 +34,13 @@ try:
 except Exception:
     WEBDRIVER_MANAGER = False
 
+# Shared tools (scrape journal, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from scrape_journal import journal_path_for, start_journal, append_journal, compact_journal
+from html_cache import store_url_page
+from browser_extract import extract_stats
+from rate_limiter import DEFAULT_RPS, PageNotLoaded, RateLimiter, rps_from_argv
+
 # canonical stat names (Title Case for output)
 CANONICAL_STATS = [
     "Ball Possession",
@@ -173,9 +182,9 @@ def scrape_stats_for_url(driver, url):
     driver.get(url)
 
     # Wait for stat rows to appear
+    # (never showing up = the page didn't load; the rate limiter retries it)
     if not wait_for_any(driver, ["div.wcl-row_2oCpS", "[data-analytics-context='tab-match-statistics']"], timeout=15):
-        print("warning: stats container not found")
-        return {}
+        raise PageNotLoaded(f"stats container not found: {url}")
 
     # Wait until we have non-empty numbers for at least one key stat
     end_time = time.time() + 15
@@ -188,30 +197,47 @@ def scrape_stats_for_url(driver, url):
         time.sleep(0.3)
 
     # Final parse after ensuring numbers are present
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = driver.page_source
+    store_url_page(url, html)
+    soup = BeautifulSoup(html, "html.parser")
     return parse_stats_soup(soup)
 
 
-def main(infile, outfile, headless=True):
+# The "js" way: one in-page script waits for the numbers and returns only the
+# stat rows, instead of pulling and re-parsing page_source every 0.3s.
+def scrape_stats_js(driver, url):
+    return extract_stats(driver, url, match_canonical, CANONICAL_STATS)
+
+# Each url goes into the journal as soon as it's scraped. With resume=True,
+# the urls that already finished fine in an earlier run are skipped.
+# Requests are paced by the shared rate limiter (at most `rps` per second),
+# which backs off and retries when a page didn't load. A page that loaded
+# without numbers (older seasons) is kept as is.
+def main(infile, outfile, headless=True, resume=False, extract="soup", rps=DEFAULT_RPS):
 
+    scrape = scrape_stats_js if extract == "js" else scrape_stats_for_url
+    limiter = RateLimiter(rps=rps)
     df = pd.read_excel(infile, dtype=str)
+    urls = df["URLS"].dropna().tolist()
+    journal = journal_path_for(outfile)
+    done = start_journal(journal, resume=resume)
     driver = get_driver(headless=headless)
-    rows = []
     
     # Tells me the index / total, then scrapes the stats.
-    for index, url in enumerate(df["URLS"].dropna().tolist(), start=1):
-        print(f"[{index}/{len(df)}] scraping stats for: {url}")
-        try:
-            row = scrape_stats_for_url(driver, url)
-            row["SourceURL"] = url
-            rows.append(row)
-        except Exception as e:
-            print("Error:", e)
-            rows.append({"SourceURL": url, "Error": str(e)})
-        time.sleep(1)
-
-    driver.quit()
-    out_df = pd.DataFrame(rows)
+    try:
+        for index, url in enumerate(urls, start=1):
+            if url in done:
+                continue
+            print(f"[{index}/{len(df)}] scraping stats for: {url} ({limiter.describe(url)})")
+            try:
+                row = limiter.fetch(url, lambda: scrape(driver, url))
+                row["SourceURL"] = url
+            except Exception as e:
+                print("Error:", e)
+                row = {"SourceURL": url, "Error": str(e)}
+            append_journal(journal, url, row)
+    finally:
+        driver.quit()
 
     # Puts the columns in order.
     ordered_cols = ["SourceURL"]
@@ -219,8 +245,7 @@ def main(infile, outfile, headless=True):
         ordered_cols.append(f"{stat} - Home")
         ordered_cols.append(f"{stat} - Away")
 
-    out_df = out_df[ordered_cols]
-    out_df.to_excel(outfile, index=False)
+    compact_journal(journal, urls, outfile, columns=ordered_cols)
     print("Output file complete! Find it as:", outfile)
 
 # Main bad boy that runs the entire file
@@ -229,10 +254,11 @@ if __name__ == "__main__":
     import os
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-    if len(sys.argv) < 2:
-        print("CMD Terminal Should Read: python3 {This Scripts Filepath} {InputFile} {OutputFile}")
+    if len(sys.argv) < 3:
+        print("CMD Terminal Should Read: python3 {This Scripts Filepath} {InputFile} {OutputFile} [--resume] [--js] [--rps=1]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2], headless=True)
+    main(sys.argv[1], sys.argv[2], headless=True, resume="--resume" in sys.argv,
+         extract="js" if "--js" in sys.argv else "soup", rps=rps_from_argv(sys.argv))
 
 # USE THE FOLLOWING IN THE CMD TERMINAL TO RUN THIS
 # python3 '/Users/erwinmedina/code/finalproject/Output Stats/Flashscore - Stats Scraper'.py input_urls_2024-2025-test.xlsx stats_test_output.xlsx
\ No newline at end of file
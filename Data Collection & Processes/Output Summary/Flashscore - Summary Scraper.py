@@ -8,6 +8,8 @@
     # HomeTeamScore, AwayTeamScore, Referee, Attendance
 
 #!/usr/bin/env python3
+import os
+import sys
 import pandas as pd
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -16,6 +18,13 @@ from selenium.webdriver.common.by import By
 import time
 import re
 
+# Shared tools (scrape journal, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline Tools"))
+from scrape_journal import journal_path_for, start_journal, append_journal, compact_journal
+from html_cache import store_url_page
+from browser_extract import extract_summary
+from rate_limiter import DEFAULT_RPS, PageNotLoaded, RateLimiter, rps_from_argv
+
 def get_driver(headless=True):
     opts = Options()
     if headless:
@@ -71,29 +80,48 @@ def parse_summary_soup(soup):
 def scrape_summary(driver, url):
     driver.get(url)
     time.sleep(2)  # This timer lets the javascript load.
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    return parse_summary_soup(soup)
+    html = driver.page_source
+    store_url_page(url, html)
+    soup = BeautifulSoup(html, "html.parser")
+    data = parse_summary_soup(soup)
+    # Every match has its teams up top, so no teams = the page didn't load.
+    if not data.get("HomeTeam"):
+        raise PageNotLoaded(f"summary never loaded for: {url}")
+    return data
 
-def main(input_file, output_file, headless=True):
+# Every url is journaled as soon as it's scraped; resume=True skips the urls
+# that already finished fine in an earlier run.
+# extract="js" waits for the page inside the browser (no fixed 2s sleep) and
+# only sends back the summary fields.
+# The rate limiter keeps it under `rps` requests per second and retries pages
+# that didn't load (no teams on them).
+def main(input_file, output_file, headless=True, resume=False, extract="soup", rps=DEFAULT_RPS):
+    scrape = extract_summary if extract == "js" else scrape_summary
+    limiter = RateLimiter(rps=rps)
     df = pd.read_excel(input_file, dtype=str)
+    urls = df["URLS"].dropna().tolist()
+    journal = journal_path_for(output_file)
+    done = start_journal(journal, resume=resume)
 
     driver = get_driver(headless=headless)
-    results = []
     # Needed to tell me which iteration it was on so I knew it was doing its job.
-    for index, url in enumerate(df["URLS"].dropna(), start=1):
-        print(f"[{index}] Scraping {url} ...")
-        try:
-            data = scrape_summary(driver, url)
-            data["SourceURL"] = url
-            results.append(data)
-        except Exception as e:
-            print(f"Error: {e}")
-            results.append({"SourceURL": url, "Error": str(e)})
-
-    # Wraps up, closes, saves.
-    driver.quit()
-    out_df = pd.DataFrame(results)
-    out_df.to_excel(output_file, index=False)
+    try:
+        for index, url in enumerate(urls, start=1):
+            if url in done:
+                continue
+            print(f"[{index}] Scraping {url} ...")
+            try:
+                data = limiter.fetch(url, lambda: scrape(driver, url))
+                data["SourceURL"] = url
+            except Exception as e:
+                print(f"Error: {e}")
+                data = {"SourceURL": url, "Error": str(e)}
+            append_journal(journal, url, data)
+    finally:
+        # Wraps up, closes, saves.
+        driver.quit()
+
+    compact_journal(journal, urls, output_file)
     print(f"Saved {output_file}")
 
 # Basically, runs the file. Use long string below as basis to run entire script
@@ -103,7 +131,8 @@ if __name__ == "__main__":
     import os
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-    if len(sys.argv) < 2:
-        print("Usage: python3 '/Users/erwinmedina/code/finalproject/Output Summary/Flashscore - Summary Scraper.py' input_urls_2024-2025-test.xlsx output.xlsx")
+    if len(sys.argv) < 3:
+        print("Usage: python3 '/Users/erwinmedina/code/finalproject/Output Summary/Flashscore - Summary Scraper.py' input_urls_2024-2025-test.xlsx output.xlsx [--resume] [--js] [--rps=1]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2], headless=True)
\ No newline at end of file
+    main(sys.argv[1], sys.argv[2], headless=True, resume="--resume" in sys.argv,
+         extract="js" if "--js" in sys.argv else "soup", rps=rps_from_argv(sys.argv))
\ No newline at end of file
@@ -0,0 +1,245 @@
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The soup way of scraping pulls the whole ~640 KB page_source out of Chrome
+# and parses it in python, and the stats scraper did that every 0.3s while it
+# waited for numbers to show up. The referee scraper did one WebDriver call
+# per info box instead.
+# This runs ONE script inside the page instead. The script:
+    # 1. Waits (with a MutationObserver) until the part of the page we need is
+    #    there and has stopped changing.
+    # 2. Reads just the fields we need and hands them back as a small json.
+# The js follows the python parsers line by line, so the output is the same:
+    # extract_incidents -> same list as parse_participant_rows
+    # extract_stats     -> same dict as parse_stats_soup
+    # extract_summary   -> same dict as parse_summary_soup
+    # extract_info_values -> the <strong> values the referee scraper reads
+# Note: this mode doesn't pull page_source, so nothing goes into the HTML cache.
+
+from rate_limiter import PageNotLoaded
+
+# Shared js: text helpers that act like BeautifulSoup's get_text(strip=True),
+# a wait-until-ready helper, and one extractor per page type.
+EXTRACT_JS = r"""
+var kind = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+
+// get_text(sep, strip=True): every text piece stripped, empties dropped, joined by sep.
+function pieces(el) {
+    var out = [];
+    var walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT, null);
+    var node;
+    while ((node = walker.nextNode())) {
+        var parent = node.parentNode ? node.parentNode.nodeName : "";
+        if (parent === "SCRIPT" || parent === "STYLE") continue;
+        var t = node.nodeValue.trim();
+        if (t) out.push(t);
+    }
+    return out;
+}
+function text(el, sep) { return el ? pieces(el).join(sep || "") : ""; }
+function cls(el) { return (el.getAttribute("class") || "").toLowerCase(); }
+
+function classify(icon) {
+    if (!icon) return "Other";
+    var homeGoal = icon.querySelector("div.smv__incidentHomeScore");
+    var awayGoal = icon.querySelector("div.smv__incidentAwayScore");
+    var svg = icon.querySelector("svg");
+    if (svg && (svg.getAttribute("data-testid") || "").indexOf("penalty-missed") >= 0) return "Penalty_Missed";
+    if (homeGoal || awayGoal) return "Goal";
+    if (!svg) return "Other";
+    var title = svg.querySelector("title");
+    if (title && text(title).indexOf("Yellow card / Red card") >= 0) return "Red_Card";
+    var c = cls(svg);
+    if (c.indexOf("yellow") >= 0) return "Yellow";
+    if (c.indexOf("red") >= 0) return "Red_Card";
+    if (c.indexOf("own") >= 0) return "Own";
+    if (c.indexOf("sub") >= 0) return "Sub";
+    if (c.indexOf("var") >= 0) return "VAR";
+    return "Other";
+}
+
+function incidents() {
+    var results = [];
+    var vs = document.querySelector("div.smv__verticalSections.section");
+    if (!vs) return results;
+    vs.querySelectorAll("div.smv__participantRow").forEach(function (row) {
+        var rc = cls(row);
+        var side = rc.indexOf("homeparticipant") >= 0 ? "Home" : rc.indexOf("awayparticipant") >= 0 ? "Away" : "Unknown";
+        var inc = row.querySelector("div.smv__incident");
+        if (!inc) return;
+        var timeText = text(inc.querySelector("div.smv__timeBox"));
+        var icon = inc.querySelector("div.smv__incidentIcon") || inc.querySelector("div.smv__incidentIconSub");
+        var eventType = classify(icon);
+        var player = text(inc.querySelector(".smv__playerName"), " ");
+        var extra = "()";
+        if (eventType !== "Penalty_Missed") {
+            var extraText = text(inc.querySelector(".smv__subIncident, .smv__assist"), " ");
+            extra = extraText ? "(" + extraText + ")" : "";
+        }
+        results.push(timeText + " " + eventType + "_" + side + " - " + player + extra);
+    });
+    return results;
+}
+
+// Raw [category, home, away] rows; python maps the category to its canonical name.
+function stats() {
+    var rows = document.querySelectorAll("div.wcl-row_2oCpS");
+    if (!rows.length) rows = document.querySelectorAll("[data-analytics-context='tab-match-statistics'] .section div[class*='wcl-row']");
+    var out = [];
+    rows.forEach(function (row) {
+        var cat = row.querySelector("div.wcl-category_6sT1J strong, div[class*='wcl-category'] strong, div[class*='wcl-category']");
+        if (!cat) return;
+        var home = row.querySelector("div[class*='homeValue'] strong");
+        var away = row.querySelector("div[class*='awayValue'] strong");
+        if (!home && !away) {
+            home = row.querySelector(".wcl-homeValue_3Q-7P strong, .wcl-value_XJG99 .wcl-homeValue_3Q-7P strong");
+            away = row.querySelector(".wcl-awayValue_Y-QR1 strong, .wcl-value_XJG99 .wcl-awayValue_Y-QR1 strong");
+        }
+        if (home || away) {
+            out.push([text(cat), home ? text(home) : null, away ? text(away) : null]);
+            return;
+        }
+        var strongs = row.querySelectorAll("strong");
+        if (strongs.length) {
+            out.push([text(cat), text(strongs[0]), strongs.length > 1 ? text(strongs[strongs.length - 1]) : null]);
+        } else {
+            out.push([text(cat), null, null]);
+        }
+    });
+    return out;
+}
+
+function summary() {
+    var out = {};
+    var teams = document.querySelectorAll("a.participant__participantName");
+    if (teams.length >= 2) { out.HomeTeam = text(teams[0]); out.AwayTeam = text(teams[1]); }
+    var matchday = document.querySelector("ol.wcl-breadcrumbList_lC9sI li:last-of-type a span");
+    if (matchday) out.Matchday = text(matchday);
+    var start = document.querySelector("div.duelParticipant__startTime > div");
+    if (start) out.StartDateTime = text(start);
+    var scores = document.querySelectorAll("div.detailScore__wrapper span");
+    if (scores.length >= 2) { out.HomeTeamScore = text(scores[0]); out.AwayTeamScore = text(scores[scores.length - 1]); }
+    document.querySelectorAll("div.wcl-infoLabelWrapper_DXbvw").forEach(function (w) {
+        var labelEl = w.querySelector(".wcl-overline_uwiIT, .wcl-infoLabel_xPJVi, span");
+        var label = (labelEl ? text(labelEl) : text(w)).replace(/:+$/, "").toLowerCase();
+        var value = w.nextElementSibling;
+        while (value && !value.classList.contains("wcl-infoValue_grawU")) value = value.nextElementSibling;
+        if (!value) return;
+        var strong = value.querySelector("strong");
+        var val = strong ? text(strong) : text(value);
+        if (label.indexOf("attendance") >= 0) out.Attendance = val;
+        else if (label.indexOf("referee") >= 0) out.Referee = val;
+    });
+    return out;
+}
+
+function infoValues() {
+    var out = [];
+    document.querySelectorAll("div.wcl-infoValue_grawU").forEach(function (div) {
+        var strong = div.querySelector("strong");
+        out.push(strong ? strong.innerText.trim() : null);
+    });
+    return out;
+}
+
+// When each page type counts as "there".
+var READY = {
+    incidents: function () { return !!document.querySelector("div.smv__verticalSections.section"); },
+    stats: function () {
+        return Array.prototype.some.call(document.querySelectorAll("div.wcl-row_2oCpS strong"), function (s) { return s.textContent.trim(); });
+    },
+    summary: function () { return !!document.querySelector("div.duelParticipant__startTime"); },
+    info: function () { return !!document.querySelector("div.wcl-infoValue_grawU strong"); }
+};
+var EXTRACT = { incidents: incidents, stats: stats, summary: summary, info: infoValues };
+
+// On timeout we still read the page if it's at least there (the soup scraper
+// also parsed whatever it had once its 15s were up).
+var PRESENT = {
+    incidents: READY.incidents,
+    stats: function () {
+        return !!document.querySelector("div.wcl-row_2oCpS, [data-analytics-context='tab-match-statistics']");
+    },
+    summary: READY.summary,
+    info: READY.info
+};
+
+// Waits until ready, then until the page stops changing for a moment.
+var SETTLE_MS = 400;
+var finished = false;
+var settleTimer = null;
+function finish(ready) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(settleTimer);
+    clearTimeout(giveUp);
+    done({ ready: ready, data: ready ? EXTRACT[kind]() : null });
+}
+function check() {
+    if (!READY[kind]()) return;
+    clearTimeout(settleTimer);
+    settleTimer = setTimeout(function () { finish(true); }, SETTLE_MS);
+}
+var observer = new MutationObserver(check);
+observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+var giveUp = setTimeout(function () { finish(PRESENT[kind]()); }, timeoutMs);
+check();
+"""
+
+# Runs the script for one page type. Returns the extracted data, or None if
+# the page never got ready before the timeout.
+def run_extract(driver, kind, timeout=15):
+    driver.set_script_timeout(timeout + 5)
+    result = driver.execute_async_script(EXTRACT_JS, kind, int(timeout * 1000))
+    if not result or not result.get("ready"):
+        return None
+    return result.get("data")
+
+# The extractors raise PageNotLoaded when the page never got ready (so the
+# rate limiter retries it); a page that loaded with nothing on it comes back
+# empty like it always did.
+def extract_incidents(driver, url, timeout=10):
+    driver.get(url)
+    incidents = run_extract(driver, "incidents", timeout)
+    if incidents is None:
+        raise PageNotLoaded(f"incidents section never loaded for: {url}")
+    return incidents
+
+# Same output as parse_stats_soup: the js hands back raw rows and the
+# category matching stays in the stats scraper (match_canonical), which passes
+# its own match_canonical / CANONICAL_STATS in.
+def extract_stats(driver, url, match_canonical, canonical_stats, timeout=15):
+    driver.get(url)
+    rows = run_extract(driver, "stats", timeout)
+    if rows is None:
+        raise PageNotLoaded(f"stats container never loaded for: {url}")
+
+    out = {}
+    for category_text, home_val, away_val in rows:
+        canonical = match_canonical(category_text)
+        if canonical is None:
+            continue
+        out[f"{canonical} - Home"] = home_val
+        out[f"{canonical} - Away"] = away_val
+    for stat in canonical_stats:
+        out.setdefault(f"{stat} - Home", None)
+        out.setdefault(f"{stat} - Away", None)
+    return out
+
+def extract_summary(driver, url, timeout=10):
+    driver.get(url)
+    summary = run_extract(driver, "summary", timeout)
+    if summary is None:
+        raise PageNotLoaded(f"summary never loaded for: {url}")
+    return summary
+
+# The <strong> text of every 'wcl-infoValue_grawU' box, in page order.
+def extract_info_values(driver, url, timeout=15):
+    driver.get(url)
+    values = run_extract(driver, "info", timeout)
+    if not values:
+        raise PageNotLoaded(f"info values never loaded for: {url}")
+    return values
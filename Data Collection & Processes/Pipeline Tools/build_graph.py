@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The master dataset came out of a long chain: cleanup -> card counter ->
+# halftime -> federation -> breakdown, copied by hand into full_data_v1.xlsm
+# ... full_data_v8.xlsx, then Master_ML_FirstPass/SecondPass/ThirdPass, then
+# renamed to Jupyter/MasterDataset_ML.xlsx. Nothing wrote down which file
+# came from which. This puts the whole chain in one table (STAGES): every
+# stage lists its input files, output files and code, and is one of
+    # script  runs a python script (the same command I'd type)
+    # copy    copies its one input to its one output
+    # manual  done by hand in Excel; can't be re-run from here
+# Every file gets a sha1 (only re-hashed when its size / mtime changes, same
+# as excel_cache). Workbooks are hashed without docProps/core.xml, which only
+# holds the time the file was saved, so re-running a stage that writes the
+# same data doesn't count as a change further down. A stage counts as up to date while the sha1s of its
+# inputs + code are the ones it was last built from and its outputs are
+# still the ones it wrote. 'build' re-runs only the stale stages, and stages
+# that don't depend on each other run at the same time. A stale manual stage
+# just gets reported (and holds up whatever comes after it) until it's redone
+# by hand and recorded.
+# What each stage was built from is kept in build_lineage.json in the repo
+# root, so 'lineage' can trace any artifact back to the files it came from.
+# python3 build_graph.py status
+# python3 build_graph.py build [stage ...] [--workers=4] [--dry-run]
+# python3 build_graph.py record {stage ...|--all}     (the current files are up to date)
+# python3 build_graph.py lineage {File}
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import subprocess
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from excel_cache import file_sha1
+from script_loader import REPO_DIR
+
+STATE_PATH = os.path.join(REPO_DIR, "build_lineage.json")
+
+# Folders (relative to the repo root) the stages below use.
+DATA = "Data Collection & Processes"
+TOOLS = f"{DATA}/Pipeline Tools"
+PRE_CLEAN = f"{DATA}/Incidents Cleanup/Incidents - Pre Clean - 2002-2025"
+POST_CLEAN = f"{DATA}/Incidents Cleanup/Incidents - Post Clean - 2002-2025"
+CARDS = f"{DATA}/Incidents Cleanup/Incidents - YellowRed Cleanup - All"
+HALFTIME = f"{DATA}/Halftime Cleanup"
+FED_1 = f"{DATA}/Incident Report - Federation - Part1"
+FED_2 = f"{DATA}/Incident Report - Federation - Part2"
+MASTER = "Master Datasets/Incident Report Dataset"
+PLAYERS = "Master Datasets/Player Info Dataset"
+REFEREES = "Master Datasets/Referee Data/Referee Info [Dataset]"
+
+# Modules the scripted stages pull in from Pipeline Tools.
+EVENT_TOOLS = [f"{TOOLS}/event_store.py", f"{TOOLS}/excel_cache.py"]
+
+# name -> stage. Paths are relative to the repo root and the file part can
+# be a glob. "run" is the script + its arguments, run from the script's folder.
+STAGES = {
+    "clean": {
+        "inputs": [f"{PRE_CLEAN}/output_incidents_[0-9]*.xlsx"],
+        # season_runner's combined_<first>_to_<last>.xlsx isn't listed: it's
+        # an extra that nothing downstream reads (and isn't committed).
+        "outputs": [f"{POST_CLEAN}/cleaned_file_[0-9]*.xlsx"],
+        "code": [f"{TOOLS}/season_runner.py", f"{DATA}/Incidents Cleanup/Incident Clean Up.py"] + EVENT_TOOLS,
+        "run": [f"{TOOLS}/season_runner.py", "clean"],
+    },
+    # The combined.xlsx full_data_v1 was built from is put together by hand
+    # from the cleaned seasons (season_runner's combined file is separate).
+    "combined": {
+        "inputs": [f"{POST_CLEAN}/cleaned_file_[0-9]*.xlsx"],
+        "outputs": [f"{POST_CLEAN}/combined.xlsx"],
+    },
+    "full_data_v1": {
+        "inputs": [f"{POST_CLEAN}/combined.xlsx"],
+        "outputs": [f"{MASTER}/full_data_v1.xlsm"],
+    },
+    "full_data_v2": {"inputs": [f"{MASTER}/full_data_v1.xlsm"], "outputs": [f"{MASTER}/full_data_v2.xlsm"]},
+    "full_data_v3": {"inputs": [f"{MASTER}/full_data_v2.xlsm"], "outputs": [f"{MASTER}/full_data_v3.xlsm"]},
+    "full_data_v4": {"inputs": [f"{MASTER}/full_data_v3.xlsm"], "outputs": [f"{MASTER}/full_data_v4.xlsm"]},
+    "cards": {
+        "inputs": [f"{MASTER}/full_data_v4.xlsm"],
+        "outputs": [f"{CARDS}/full_data_v4_revisedCards.xlsx"],
+        "code": [f"{CARDS}/CardCounter.py"] + EVENT_TOOLS,
+        "run": [f"{CARDS}/CardCounter.py", f"{MASTER}/full_data_v4.xlsm", f"{CARDS}/full_data_v4_revisedCards.xlsx"],
+    },
+    "halftime": {
+        "inputs": [f"{HALFTIME}/Input_HT_incidents_AllYears.xlsx"],
+        "outputs": [f"{HALFTIME}/output_HT_incidents_AllYears.xlsx"],
+        "code": [f"{HALFTIME}/HalfTime Cleanup.py"] + EVENT_TOOLS,
+        "run": [f"{HALFTIME}/HalfTime Cleanup.py", f"{HALFTIME}/Input_HT_incidents_AllYears.xlsx",
+                f"{HALFTIME}/output_HT_incidents_AllYears.xlsx"],
+    },
+    "full_data_v5": {
+        "inputs": [f"{MASTER}/full_data_v4.xlsm", f"{CARDS}/full_data_v4_revisedCards.xlsx",
+                   f"{HALFTIME}/output_HT_incidents_AllYears.xlsx"],
+        "outputs": [f"{MASTER}/full_data_v5.xlsx"],
+    },
+    "federation_input": {
+        "inputs": [f"{MASTER}/full_data_v5.xlsx"],
+        "outputs": [f"{FED_1}/full_data_v5.xlsx"],
+        "copy": True,
+    },
+    "federation": {
+        "inputs": [f"{FED_1}/full_data_v5.xlsx", f"{FED_1}/Player Information v3.xlsx"],
+        "outputs": [f"{FED_1}/output_incidents_with_federations.xlsx"],
+        "code": [f"{FED_1}/Federation Creation.py", f"{TOOLS}/player_index.py",
+                 f"{PLAYERS}/NormalizeNames.py"] + EVENT_TOOLS,
+        "run": [f"{FED_1}/Federation Creation.py"],
+    },
+    "federations_checked": {
+        "inputs": [f"{FED_1}/output_incidents_with_federations.xlsx"],
+        "outputs": [f"{FED_1}/Output_Incidents_Federations.xlsx"],
+    },
+    "breakdown_input": {
+        "inputs": [f"{FED_1}/Output_Incidents_Federations.xlsx"],
+        "outputs": [f"{FED_2}/Output_Incidents_Federations.xlsx"],
+        "copy": True,
+    },
+    "breakdown": {
+        "inputs": [f"{FED_2}/Output_Incidents_Federations.xlsx"],
+        "outputs": [f"{FED_2}/incidents_with_federation_counts.xlsx"],
+        "code": [f"{FED_2}/FederationBreakdown.py"],
+        "run": [f"{FED_2}/FederationBreakdown.py"],
+    },
+    "full_data_v6": {
+        "inputs": [f"{MASTER}/full_data_v5.xlsx", f"{FED_2}/incidents_with_federation_counts.xlsx"],
+        "outputs": [f"{MASTER}/full_data_v6.xlsx"],
+    },
+    "full_data_v7": {"inputs": [f"{MASTER}/full_data_v6.xlsx"], "outputs": [f"{MASTER}/full_data_v7.xlsx"]},
+    "full_data_v8": {"inputs": [f"{MASTER}/full_data_v7.xlsx"], "outputs": [f"{MASTER}/full_data_v8.xlsx"]},
+    "ml_first_pass": {"inputs": [f"{MASTER}/full_data_v8.xlsx"], "outputs": [f"{MASTER}/Master_ML_FirstPass.xlsx"]},
+    "ml_second_pass": {
+        "inputs": [f"{MASTER}/Master_ML_FirstPass.xlsx", f"{MASTER}/full_data_v8.xlsx"],
+        "outputs": [f"{MASTER}/Master_ML_SecondPass.xlsx"],
+    },
+    "ml_third_pass": {
+        "inputs": [f"{MASTER}/Master_ML_SecondPass.xlsx", f"{REFEREES}/Referee Data.xlsx"],
+        "outputs": [f"{MASTER}/Master_ML_ThirdPass.xlsx"],
+    },
+    "ml_dataset": {
+        "inputs": [f"{MASTER}/Master_ML_ThirdPass.xlsx"],
+        "outputs": ["Jupyter/MasterDataset_ML.xlsx"],
+    },
+}
+
+def kind_of(stage):
+    if "run" in stage:
+        return "script"
+    return "copy" if stage.get("copy") else "manual"
+
+def expand(pattern):
+    folder, name = os.path.split(os.path.join(REPO_DIR, pattern))
+    if not glob.has_magic(name):
+        return [os.path.join(folder, name)]
+    return sorted(glob.glob(os.path.join(glob.escape(folder), name)))
+
+def relpath(path):
+    return os.path.relpath(path, REPO_DIR).replace(os.sep, "/")
+
+# stage -> the stages that make its inputs.
+def dependencies():
+    made_by = {out: name for name, stage in STAGES.items() for out in stage["outputs"]}
+    return {name: sorted({made_by[p] for p in stage["inputs"] if p in made_by} - {name})
+            for name, stage in STAGES.items()}
+
+def topological_order():
+    deps, order, seen = dependencies(), [], set()
+    def visit(name):
+        if name not in seen:
+            seen.add(name)
+            for dep in deps[name]:
+                visit(dep)
+            order.append(name)
+    for name in STAGES:
+        visit(name)
+    return order
+
+def load_state():
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    return {"files": {}, "stages": {}}
+
+def save_state(state):
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+# Parts of a workbook that change on every save even when the data doesn't.
+SAVE_STAMPS = {"docProps/core.xml"}
+
+def workbook_sha1(path):
+    digest = hashlib.sha1()
+    with zipfile.ZipFile(path) as book:
+        for part in sorted(book.namelist()):
+            if part not in SAVE_STAMPS:
+                digest.update(part.encode("utf-8"))
+                digest.update(book.read(part))
+    return digest.hexdigest()
+
+def file_hash(path):
+    if path.endswith((".xlsx", ".xlsm")) and zipfile.is_zipfile(path):
+        return workbook_sha1(path)
+    return file_sha1(path)
+
+# sha1 of a file, re-using the last one while size + mtime haven't changed.
+def content_hash(path, state):
+    stat = os.stat(path)
+    known = state["files"].get(relpath(path))
+    if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+        return known["sha1"]
+    sha1 = file_hash(path)
+    state["files"][relpath(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": sha1}
+    return sha1
+
+# {relative path: sha1} for some patterns; None for a file that isn't there.
+def hash_files(patterns, state):
+    hashes = {}
+    for pattern in patterns:
+        paths = expand(pattern)
+        if not paths:
+            hashes[pattern] = None
+        for path in paths:
+            hashes[relpath(path)] = content_hash(path, state) if os.path.exists(path) else None
+    return hashes
+
+# Why a stage needs building ([] = up to date).
+def stale_reasons(name, state):
+    stage, record = STAGES[name], state["stages"].get(name)
+    outputs = hash_files(stage["outputs"], state)
+    missing = [p for p, h in outputs.items() if h is None]
+    if missing:
+        return [f"missing output {p}" for p in missing]
+    if record is None:
+        return ["never built or recorded"]
+    reasons = []
+    for label, now, then in (("input", hash_files(stage["inputs"], state), record["inputs"]),
+                             ("code", hash_files(stage.get("code", []), state), record.get("code", {}))):
+        for path in sorted(set(now) | set(then)):
+            if now.get(path) != then.get(path):
+                reasons.append(f"{label} changed: {path}")
+    for path, sha1 in outputs.items():
+        if record["outputs"].get(path) != sha1:
+            reasons.append(f"output edited since it was built: {path}")
+    return reasons
+
+def record_stage(name, state, seconds=None):
+    stage = STAGES[name]
+    state["stages"][name] = {
+        "kind": kind_of(stage),
+        "inputs": hash_files(stage["inputs"], state),
+        "code": hash_files(stage.get("code", []), state),
+        "outputs": hash_files(stage["outputs"], state),
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": seconds,
+    }
+
+# Runs one script / copy stage. Returns (name, seconds, error).
+def run_stage(name):
+    stage = STAGES[name]
+    start = time.perf_counter()
+    try:
+        if kind_of(stage) == "copy":
+            source, target = expand(stage["inputs"][0])[0], expand(stage["outputs"][0])[0]
+            shutil.copy2(source, target)
+        else:
+            script, *args = stage["run"]
+            script = os.path.join(REPO_DIR, script)
+            args = [os.path.join(REPO_DIR, a) if "/" in a else a for a in args]
+            done = subprocess.run([sys.executable, script, *args], cwd=os.path.dirname(script),
+                                  capture_output=True, text=True)
+            if done.returncode != 0:
+                tail = (done.stderr or done.stdout).strip().splitlines()[-1:] or ["no output"]
+                return name, time.perf_counter() - start, f"exit {done.returncode}: {tail[0]}"
+        return name, time.perf_counter() - start, None
+    except Exception as e:
+        return name, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+# Everything downstream of `names` (including them).
+def downstream(names):
+    deps, found = dependencies(), set(names)
+    changed = True
+    while changed:
+        changed = False
+        for name in STAGES:
+            if name not in found and any(dep in found for dep in deps[name]):
+                found.add(name)
+                changed = True
+    return found
+
+def status(state):
+    for name in topological_order():
+        reasons = stale_reasons(name, state)
+        print(f"{name:20} {kind_of(STAGES[name]):7} {'stale' if reasons else 'ok'}")
+        for reason in reasons:
+            print(f"{'':29}- {reason}")
+    save_state(state)
+
+def build(state, targets=None, workers=4, dry_run=False):
+    deps = dependencies()
+    stale = {name for name in STAGES if stale_reasons(name, state)}
+    # Anything after a stale stage might change too; it gets checked again
+    # once the stages before it are done (same outputs -> nothing to redo).
+    candidates = downstream(stale)
+    if targets:
+        wanted = set(targets)
+        for name in reversed(topological_order()):
+            if name in wanted:
+                wanted.update(deps[name])
+        candidates &= wanted
+    if not candidates:
+        print("Everything is up to date.")
+        save_state(state)
+        return 0
+
+    order = [name for name in topological_order() if name in candidates]
+    print(f"{len([n for n in order if n in stale])} stale stage(s): {', '.join(n for n in order if n in stale)}")
+    later = [n for n in order if n not in stale]
+    if later:
+        print(f"Checked again after those: {', '.join(later)}")
+    if dry_run:
+        save_state(state)
+        return 0
+
+    start = time.perf_counter()
+    done, skipped, blocked, failed, running = set(), set(), set(), set(), {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for name in order:
+                if name in done | skipped | blocked | failed or name in running.values():
+                    continue
+                waiting_on = [dep for dep in deps[name] if dep in candidates and dep not in done | skipped]
+                if any(dep in blocked | failed for dep in waiting_on):
+                    blocked.add(name)
+                elif waiting_on:
+                    continue
+                elif not stale_reasons(name, state):
+                    skipped.add(name)
+                elif kind_of(STAGES[name]) == "manual":
+                    print(f"  {name}: manual stage, redo it by hand then run "
+                          f"'python3 build_graph.py record {name}'")
+                    for reason in stale_reasons(name, state):
+                        print(f"      - {reason}")
+                    blocked.add(name)
+                else:
+                    print(f"  {name}: running")
+                    running[pool.submit(run_stage, name)] = name
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del running[future]
+                name, seconds, error = future.result()
+                if error:
+                    failed.add(name)
+                    print(f"  {name}: FAILED in {seconds:.1f}s ({error})")
+                else:
+                    done.add(name)
+                    record_stage(name, state, round(seconds, 2))
+                    save_state(state)
+                    print(f"  {name}: built in {seconds:.1f}s")
+
+    print(f"Built {len(done)} stage(s), {len(skipped)} still up to date, in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print("Failed:", ", ".join(sorted(failed)))
+    if blocked:
+        print("Waiting on a manual stage:", ", ".join(name for name in order if name in blocked))
+    save_state(state)
+    return 1 if failed else 0
+
+# Prints the chain of stages + files `path` came from.
+def lineage(path, state, depth=0, seen=None):
+    seen = set() if seen is None else seen
+    target = relpath(os.path.abspath(path))
+    for name, record in state["stages"].items():
+        if target not in record["outputs"]:
+            continue
+        sha1 = (record["outputs"][target] or "")[:10]
+        print(f"{'  ' * depth}{target} [{sha1}] <- {name} ({record['kind']}, {record['built_at']})")
+        if name in seen:
+            return
+        seen.add(name)
+        for code, code_sha1 in record.get("code", {}).items():
+            print(f"{'  ' * (depth + 1)}code {code} [{(code_sha1 or '')[:10]}]")
+        for source in record["inputs"]:
+            lineage(os.path.join(REPO_DIR, source), state, depth + 1, seen)
+        return
+    sha1 = content_hash(os.path.join(REPO_DIR, target), state)[:10] if os.path.exists(os.path.join(REPO_DIR, target)) else "missing"
+    print(f"{'  ' * depth}{target} [{sha1}] (source)")
+
+def _arg(argv, name, default=None):
+    for arg in argv:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+if __name__ == "__main__":
+    commands = ("status", "build", "record", "lineage")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("CMD Terminal Should Read: python3 build_graph.py status")
+        print("                      or: python3 build_graph.py build [stage ...] [--workers=4] [--dry-run]")
+        print("                      or: python3 build_graph.py record {stage ...|--all}")
+        print("                      or: python3 build_graph.py lineage {File}")
+        sys.exit(1)
+
+    state = load_state()
+    names = [a for a in sys.argv[2:] if not a.startswith("--")]
+    unknown = [n for n in names if n not in STAGES] if sys.argv[1] != "lineage" else []
+    if unknown:
+        print("Unknown stage(s):", ", ".join(unknown), "| stages:", ", ".join(STAGES))
+        sys.exit(1)
+
+    if sys.argv[1] == "status":
+        status(state)
+    elif sys.argv[1] == "build":
+        sys.exit(build(state, names or None, workers=int(_arg(sys.argv, "workers", 4)),
+                       dry_run="--dry-run" in sys.argv))
+    elif sys.argv[1] == "record":
+        for name in (list(STAGES) if "--all" in sys.argv else names):
+            missing = [p for p, h in hash_files(STAGES[name]["outputs"], state).items() if h is None]
+            if missing:
+                print(f"  {name}: not recorded, missing {', '.join(missing)}")
+                continue
+            record_stage(name, state)
+            print(f"  {name}: recorded")
+        save_state(state)
+    else:
+        for path in names:
+            lineage(path, state)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Bad data used to get noticed by accident: clean_events flags an "Error"
+# when an event ends in '-', the scrapers write "Error" into Referee /
+# Attendance, and stats columns just come back empty. This runs every check
+# over the whole master dataset (and its event table) at once, column by
+# column, so it's a couple of seconds for all 16 seasons and can run before
+# training instead of finding out after.
+# Every rule gets the dataset and says which rows break it:
+    # columns              expected columns are there
+    # numeric              numeric columns only hold numbers (no "Error" text)
+    # error_values         no cell says "Error"
+    # missing_stats        stats columns filled in (warning)
+    # possession_sum       H + A possession adds up to 100% (stored as 0-1)
+    # non_negative         counts / scores / attendance aren't negative
+    # shots_vs_attempts    shots on goal <= goal attempts (warning)
+    # halftime_vs_fulltime half-time score <= full-time score
+    # result_vs_score      WIN agrees with the score
+    # round_range          Round is 1-38
+    # duplicate_match_id   MatchId / Game Link only once
+    # unknown_referee      referee is in 'Referee Data.xlsx'
+    # unknown_team         Home / Away are known teams and not the same team
+    # season_fixtures      20 teams a season, 19 home + 19 away games each
+    # cards_vs_incidents   card columns match the incident list (CardCounter rules)
+    # score_vs_incidents   score matches the goals in the incident list
+    # incident_unparsed    incidents that don't parse, or cards / goals with no player (warning)
+# Rules whose columns aren't in the file (or that need the incident list /
+# referee file and don't have it) get skipped, so it also runs on the ML
+# datasets. A new check is a new function with @rule("name", [columns]).
+# python3 dataset_validator.py [ExcelFile] [--report=violations.xlsx] [--only=rule1,rule2] [--events-col=INC]
+# (ExcelFile defaults to full_data_v8.xlsx; exits with 1 if an error rule fails)
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from event_store import event_table_for
+from excel_cache import read_excel
+from script_loader import DATA_DIR, REPO_DIR, load_script
+
+DATASET = os.path.join(REPO_DIR, "Master Datasets", "Incident Report Dataset", "full_data_v8.xlsx")
+REFEREE_FILE = os.path.join(REPO_DIR, "Master Datasets", "Referee Data", "Referee Info [Dataset]", "Referee Data.xlsx")
+CARDS_SCRIPT = os.path.join(DATA_DIR, "Incidents Cleanup", "Incidents - YellowRed Cleanup - All", "CardCounter.py")
+
+# Every team that's been in the data (2009-2025).
+KNOWN_TEAMS = {
+    "Arsenal", "Aston Villa", "Birmingham", "Blackburn", "Blackpool", "Bolton", "Bournemouth", "Brentford",
+    "Brighton", "Burnley", "Cardiff", "Chelsea", "Crystal Palace", "Everton", "Fulham", "Huddersfield", "Hull",
+    "Ipswich", "Leeds", "Leicester", "Liverpool", "Luton", "Manchester City", "Manchester Utd", "Middlesbrough",
+    "Newcastle", "Norwich", "Nottingham", "Portsmouth", "QPR", "Reading", "Sheffield Utd", "Southampton",
+    "Stoke", "Sunderland", "Swansea", "Tottenham", "Watford", "West Brom", "West Ham", "Wigan", "Wolves",
+}
+
+REQUIRED_COLUMNS = ["MatchId", "Home", "Away", "SeasonStartYear", "Referee", "H_Score", "A_Score", "WIN"]
+STATS = ["Ball_Possession", "Goal_Attempts", "Shots_on_Goal", "Free_Kicks", "Corner_Kicks", "Offsides", "Fouls"]
+STAT_COLUMNS = [f"{side}_{stat}" for stat in STATS for side in ("H", "A")]
+COUNT_COLUMNS = ["H_Score", "A_Score", "HT_H_Score", "HT_A_Score", "H_Yellow_Cards", "A_Yellow_Cards",
+                 "H_Red_Cards", "A_Red_Cards", "PenaltiesAwarded", "Attendance",
+                 "AFC", "CAF", "CONMEBOL", "CONCACAF", "OFC", "UEFA"] + STAT_COLUMNS
+# Possession is saved as a share (0.55 / 0.45); rounding gives 1.01 sometimes.
+POSSESSION_TOTAL = 1.0
+POSSESSION_TOLERANCE = 0.011
+ROUNDS = (1, 38)
+TEAMS_PER_SEASON = 20
+GAMES_PER_SIDE = 19
+CARD_COLUMNS = {"H_Yellow_Cards": "H_Yellow_Card", "A_Yellow_Cards": "A_Yellow_Card",
+                "H_Red_Cards": "H_Red_Card", "A_Red_Cards": "A_Red_Card"}
+# The ML datasets renamed a few columns.
+COLUMN_ALIASES = {"Season Start Year": "SeasonStartYear"}
+# Incidents that should always name a player.
+PLAYER_EVENTS = ["Goal", "Own", "Yellow", "Red_Card"]
+
+# name -> (columns, severity, fn). fn gets the Dataset and returns the rows
+# that break the rule: a boolean mask over df, or a frame with row / column /
+# value for rules that point at something more specific than the row. None
+# means it had nothing to check against. EVENTS in columns = the incident
+# list column.
+RULES = {}
+EVENTS = "<events>"
+
+def rule(name, columns=(), severity="error"):
+    def wrap(fn):
+        RULES[name] = (list(columns), severity, fn)
+        return fn
+    return wrap
+
+# What the rules look at. The event table and the card counts are only built
+# if a rule asks for them.
+class Dataset:
+    def __init__(self, df, excel_path=None, events_col="INC", referees=None):
+        self.df = df
+        self.excel_path = excel_path
+        self.events_col = events_col
+        self.referees = referees
+        self._events = None
+
+    def numbers(self, col):
+        return pd.to_numeric(self.df[col], errors="coerce")
+
+    def events(self):
+        if self._events is None:
+            self._events = event_table_for(self.excel_path, self.df, self.events_col)
+        return self._events
+
+def _cells(df, mask_by_column):
+    frames = [pd.DataFrame({"row": np.flatnonzero(mask), "column": col,
+                            "value": df[col].to_numpy()[np.flatnonzero(mask)]})
+              for col, mask in mask_by_column.items() if mask.any()]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["row", "column", "value"])
+
+@rule("columns")
+def columns_present(data):
+    missing = [col for col in REQUIRED_COLUMNS if col not in data.df.columns]
+    return pd.DataFrame({"row": [None] * len(missing), "column": missing, "value": "missing column"})
+
+@rule("numeric")
+def numeric(data):
+    df = data.df
+    masks = {}
+    for col in COUNT_COLUMNS + ["Round"]:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            masks[col] = (data.numbers(col).isna() & df[col].notna()).to_numpy()
+    return _cells(df, masks)
+
+@rule("error_values")
+def error_values(data):
+    df = data.df
+    masks = {}
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col]) or df[col].dtype == object:
+            masks[col] = df[col].astype("string").str.strip().str.startswith("Error").fillna(False).to_numpy(dtype=bool)
+    return _cells(df, masks)
+
+@rule("missing_stats", STAT_COLUMNS, severity="warning")
+def missing_stats(data):
+    return data.df[STAT_COLUMNS].isna().any(axis=1)
+
+@rule("possession_sum", ["H_Ball_Possession", "A_Ball_Possession"])
+def possession_sum(data):
+    home, away = data.numbers("H_Ball_Possession"), data.numbers("A_Ball_Possession")
+    total = home + away
+    out_of_range = (home < 0) | (home > 1) | (away < 0) | (away > 1)
+    return total.notna() & (((total - POSSESSION_TOTAL).abs() > POSSESSION_TOLERANCE) | out_of_range)
+
+@rule("non_negative")
+def non_negative(data):
+    cols = [col for col in COUNT_COLUMNS if col in data.df.columns]
+    return _cells(data.df, {col: (data.numbers(col) < 0).to_numpy() for col in cols})
+
+@rule("shots_vs_attempts", ["H_Shots_on_Goal", "A_Shots_on_Goal", "H_Goal_Attempts", "A_Goal_Attempts"],
+      severity="warning")
+def shots_vs_attempts(data):
+    return ((data.numbers("H_Shots_on_Goal") > data.numbers("H_Goal_Attempts"))
+            | (data.numbers("A_Shots_on_Goal") > data.numbers("A_Goal_Attempts")))
+
+@rule("halftime_vs_fulltime", ["HT_H_Score", "HT_A_Score", "H_Score", "A_Score"])
+def halftime_vs_fulltime(data):
+    return ((data.numbers("HT_H_Score") > data.numbers("H_Score"))
+            | (data.numbers("HT_A_Score") > data.numbers("A_Score")))
+
+@rule("result_vs_score", ["WIN", "H_Score", "A_Score"])
+def result_vs_score(data):
+    home, away = data.numbers("H_Score"), data.numbers("A_Score")
+    expected = np.select([home > away, home < away], ["Home", "Away"], "Draw")
+    return pd.Series(expected, index=data.df.index).where(home.notna() & away.notna()) != data.df["WIN"]
+
+@rule("round_range", ["Round"])
+def round_range(data):
+    rounds = data.numbers("Round")
+    return rounds.isna() | (rounds < ROUNDS[0]) | (rounds > ROUNDS[1])
+
+@rule("duplicate_match_id", ["MatchId"])
+def duplicate_match_id(data):
+    df = data.df
+    masks = {"MatchId": (df["MatchId"].duplicated(keep=False) | df["MatchId"].isna()).to_numpy()}
+    if "Game Link" in df.columns:
+        links = df["Game Link"]
+        masks["Game Link"] = (links.duplicated(keep=False) & links.notna()).to_numpy()
+    return _cells(df, masks)
+
+@rule("unknown_referee", ["Referee"])
+def unknown_referee(data):
+    if data.referees is None:
+        return None
+    return ~data.df["Referee"].isin(data.referees)
+
+@rule("unknown_team", ["Home", "Away"])
+def unknown_team(data):
+    df = data.df
+    return ~df["Home"].isin(KNOWN_TEAMS) | ~df["Away"].isin(KNOWN_TEAMS) | (df["Home"] == df["Away"])
+
+@rule("season_fixtures", ["SeasonStartYear", "Home", "Away"])
+def season_fixtures(data):
+    df = data.df
+    season = df["SeasonStartYear"]
+    teams = pd.concat([df[["SeasonStartYear", "Home"]].set_axis(["season", "team"], axis=1),
+                       df[["SeasonStartYear", "Away"]].set_axis(["season", "team"], axis=1)])
+    n_teams = teams.groupby("season")["team"].nunique()
+    home_games = df.groupby(["SeasonStartYear", "Home"])["Home"].transform("size")
+    away_games = df.groupby(["SeasonStartYear", "Away"])["Away"].transform("size")
+    return (season.map(n_teams) != TEAMS_PER_SEASON) | (home_games != GAMES_PER_SIDE) | (away_games != GAMES_PER_SIDE)
+
+@rule("cards_vs_incidents", list(CARD_COLUMNS) + [EVENTS])
+def cards_vs_incidents(data):
+    card_counter = load_script(CARDS_SCRIPT, "card_counter")
+    counts = card_counter.count_cards_frame(data.excel_path, data.df, data.events_col)
+    has_incidents = data.df[data.events_col].notna().to_numpy()
+    return _cells(data.df, {col: (data.numbers(col).to_numpy() != counts[counted].to_numpy()) & has_incidents
+                            for col, counted in CARD_COLUMNS.items()})
+
+@rule("score_vs_incidents", ["H_Score", "A_Score", EVENTS])
+def score_vs_incidents(data):
+    table, _ = data.events()
+    goals = table[table["event_type"].isin(["Goal", "Own"])]
+    n_rows = len(data.df)
+    home = np.bincount(goals.loc[goals["side"] == "Home", "row"], minlength=n_rows)
+    away = np.bincount(goals.loc[goals["side"] == "Away", "row"], minlength=n_rows)
+    has_incidents = data.df[data.events_col].notna().to_numpy()
+    return _cells(data.df, {"H_Score": (data.numbers("H_Score").to_numpy() != home) & has_incidents,
+                            "A_Score": (data.numbers("A_Score").to_numpy() != away) & has_incidents})
+
+@rule("incident_unparsed", [EVENTS], severity="warning")
+def incident_unparsed(data):
+    table, meta = data.events()
+    bad = (table["event_type"].isna() | (table["side"] == "Unknown")
+           | (table["event_type"].isin(PLAYER_EVENTS) & table["player"].isna())).to_numpy(dtype=bool)
+    events = pd.DataFrame({"row": table["row"].to_numpy()[bad], "column": data.events_col,
+                           "value": table["raw"].to_numpy()[bad]})
+    # Whole cells that aren't a list at all.
+    cells = pd.DataFrame({"row": [int(r) for r in meta["bad_rows"]], "column": data.events_col,
+                          "value": list(meta["bad_rows"].values())})
+    return pd.concat([events, cells], ignore_index=True)
+
+def load_referees(path=REFEREE_FILE):
+    if not os.path.exists(path):
+        return None
+    return set(read_excel(path, columns=["Referee"])["Referee"].dropna())
+
+# Runs the rules over df. Returns (summary, violations):
+    # summary    rule | severity | status | rows | seconds
+    # violations rule | severity | row | MatchId | column | value
+def validate(df, excel_path=None, events_col="INC", names=None, referees=None):
+    df = df.reset_index(drop=True).rename(columns=COLUMN_ALIASES)
+    data = Dataset(df, excel_path, events_col, referees)
+    summary, found = [], []
+    for name in (list(RULES) if names is None else names):
+        columns, severity, fn = RULES[name]
+        columns = [events_col if col == EVENTS else col for col in columns]
+        missing = [col for col in columns if col not in df.columns]
+        if EVENTS in RULES[name][0] and excel_path is None:
+            missing.append("event table")
+        start = time.perf_counter()
+        result = None if missing else fn(data)
+        if result is None:
+            summary.append({"rule": name, "severity": severity, "status": f"skipped (no {(missing or ['data'])[0]})",
+                            "rows": 0, "seconds": 0.0})
+            continue
+        if isinstance(result, pd.DataFrame):
+            hits = result
+        else:
+            mask = np.asarray(result, dtype=bool)
+            hits = pd.DataFrame({"row": np.flatnonzero(mask), "column": None, "value": None})
+        hits = hits.assign(rule=name, severity=severity)
+        rows = hits["row"].nunique(dropna=False) if len(hits) else 0
+        summary.append({"rule": name, "severity": severity, "status": "FAIL" if rows else "ok",
+                        "rows": rows, "seconds": round(time.perf_counter() - start, 3)})
+        found.append(hits)
+
+    violations = pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=["row"])
+    if "MatchId" in data.df.columns and len(violations):
+        row = pd.to_numeric(violations["row"], errors="coerce")
+        ids = data.df["MatchId"].astype(object).to_numpy()
+        violations["MatchId"] = [ids[int(r)] if pd.notna(r) else None for r in row]
+    else:
+        violations["MatchId"] = None
+    columns = ["rule", "severity", "row", "MatchId", "column", "value"]
+    return pd.DataFrame(summary), violations.reindex(columns=columns)
+
+def print_report(summary, violations, examples=3):
+    for item in summary.to_dict("records"):
+        line = f"{item['rule']:22} {item['severity']:8} {item['status']:18}"
+        if item["rows"]:
+            hits = violations[violations["rule"] == item["rule"]]
+            shown = [str(m) for m in hits["MatchId"].dropna().unique()[:examples]] or \
+                    [str(c) for c in hits["column"].dropna().unique()[:examples]]
+            line += f" {item['rows']} row(s)  e.g. {', '.join(shown)}"
+        print(line)
+
+def main(infile=DATASET, report=None, names=None, events_col="INC"):
+    start = time.perf_counter()
+    df = read_excel(infile)
+    summary, violations = validate(df, infile, events_col, names, referees=load_referees())
+    print(f"Validated {len(df)} matches from {os.path.basename(infile)} in {time.perf_counter() - start:.2f}s\n")
+    print_report(summary, violations)
+    if report:
+        if report.endswith(".csv"):
+            violations.to_csv(report, index=False)
+        else:
+            violations.to_excel(report, index=False)
+        print("\nViolations saved:", report)
+    failed = summary[(summary["severity"] == "error") & (summary["status"] == "FAIL")]
+    return 1 if len(failed) else 0
+
+def _arg(argv, name, default=None):
+    for arg in argv:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+if __name__ == "__main__":
+    files = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(files) > 1 or "--help" in sys.argv:
+        print("CMD Terminal Should Read: python3 dataset_validator.py [ExcelFile] [--report=violations.xlsx] "
+              f"[--only={','.join(RULES)}] [--events-col=INC]")
+        sys.exit(1)
+    only = _arg(sys.argv, "only")
+    sys.exit(main(files[0] if files else DATASET, report=_arg(sys.argv, "report"),
+                  names=only.split(",") if only else None, events_col=_arg(sys.argv, "events-col", "INC")))
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Incidents get passed around as str(list) blobs in the 'INC' / 'events' /
+# 'Inc' columns, so every cleanup script ran ast.literal_eval on every cell,
+# every run. This parses them ONCE into a long table (one row per event):
+    # match_id | row | seq | minute | stoppage | event_type | side | player | detail | raw
+    # "45+2' Yellow_Away - Mendy B.((Foul))" -> 45 | 2 | Yellow | Away | Mendy B. | Foul
+# 'row' is the row in the Excel file it came from, 'seq' the position in that
+# row's list, and 'raw' the original string (so the old string checks still
+# give exactly the same answers).
+# It's saved as Parquet right next to the Excel file:
+    # output_incidents_2024-2025.xlsx -> output_incidents_2024-2025.events.parquet
+# The scrapers write it when they save, and the scripts read it with
+# event_lists_for(), which falls back to parsing the Excel (and saves the
+# Parquet for next time) when it's missing or older than the Excel file.
+# One-time conversion of the files that already exist:
+    # python3 event_store.py convert {ExcelFile} [more files...] [--events-col=INC] [--id-col=MatchId]
+    # python3 event_store.py show {ParquetFile} [--match=MatchId]
+
+import os
+import re
+import ast
+import sys
+import json
+
+import pandas as pd
+
+from flashscore_urls import match_id_from_url
+
+EVENT_COLUMNS = ["match_id", "row", "seq", "minute", "stoppage", "event_type", "side", "player", "detail", "raw"]
+METADATA_KEY = b"incident_events"
+
+# <minute>[+<stoppage>]' <Type>_<Side>[ - <player>[(detail)]]
+EVENT_PATTERN = re.compile(
+    r"^\s*(?:(?P<minute>\d+)(?:\+(?P<stoppage>\d+))?'?)?\s*"
+    r"(?P<event_type>[A-Za-z_]+?)_(?P<side>Home|Away|Unknown)(?:\s*-\s*(?P<rest>.*))?$"
+)
+DETAIL_PATTERN = re.compile(r"\(+\s*(.*?)\s*\)+\s*$")
+
+def events_path_for(excel_path):
+    return os.path.splitext(excel_path)[0] + ".events.parquet"
+
+# Splits one incident string into its fields. Anything that doesn't fit the
+# pattern keeps its raw text with the other fields left empty.
+def parse_event(text):
+    match = EVENT_PATTERN.match(text)
+    if not match:
+        return {"minute": None, "stoppage": None, "event_type": None, "side": None,
+                "player": None, "detail": None, "raw": text}
+    minute, stoppage, event_type, side, rest = match.groups()
+
+    detail = None
+    rest = rest or ""
+    paren = rest.find("(")
+    if paren >= 0:
+        found = DETAIL_PATTERN.search(rest, paren)
+        detail = (found.group(1) if found else rest[paren:]) or None
+        rest = rest[:paren]
+    return {"minute": int(minute) if minute else None, "stoppage": int(stoppage) if stoppage else None,
+            "event_type": event_type, "side": side, "player": rest.strip() or None, "detail": detail, "raw": text}
+
+# Urls get turned into their Flashscore match id.
+def _match_id(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    value = str(value)
+    if value.startswith("http"):
+        return match_id_from_url(value) or value
+    return value
+
+# Which column holds the match id, if the caller didn't say.
+def guess_id_col(df):
+    for col in ("MatchId", "id", "SourceURL", "Game Link"):
+        if col in df.columns:
+            return col
+    return None
+
+# The long table for a whole sheet, plus what's needed to rebuild the lists:
+# rows that were blank, and rows whose text couldn't be read (kept as-is).
+def to_event_table(df, events_col="INC", id_col=None):
+    if id_col is None:
+        id_col = guess_id_col(df)
+    records, missing_rows, bad_rows = [], [], {}
+    # Just the two columns, not every cell of the sheet as a dict.
+    cells = df[events_col].tolist() if events_col in df.columns else [None] * len(df)
+    ids = df[id_col].tolist() if id_col in df.columns else [None] * len(df)
+    for row_number, (cell, id_value) in enumerate(zip(cells, ids)):
+        if isinstance(cell, list):
+            events = cell
+        elif not isinstance(cell, str):
+            missing_rows.append(row_number)
+            continue
+        else:
+            try:
+                events = ast.literal_eval(cell)
+            except (ValueError, SyntaxError):
+                bad_rows[row_number] = cell
+                continue
+            if not isinstance(events, (list, tuple)):
+                bad_rows[row_number] = cell
+                continue
+
+        match_id = _match_id(id_value)
+        for seq, text in enumerate(events):
+            event = parse_event(str(text))
+            event.update({"match_id": match_id, "row": row_number, "seq": seq})
+            records.append(event)
+
+    table = pd.DataFrame.from_records(records, columns=EVENT_COLUMNS)
+    table = table.astype({
+        "match_id": "string", "row": "int32", "seq": "int16", "minute": "Int16", "stoppage": "Int16",
+        "event_type": "category", "side": "category", "player": "string", "detail": "string", "raw": "string",
+    })
+    meta = {"events_col": events_col, "id_col": id_col, "n_rows": len(df),
+            "missing_rows": missing_rows, "bad_rows": {str(k): v for k, v in bad_rows.items()}}
+    return table, meta
+
+def write_event_store(table, meta, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+    schema_meta = dict(arrow_table.schema.metadata or {})
+    schema_meta[METADATA_KEY] = json.dumps(meta).encode("utf-8")
+    pq.write_table(arrow_table.replace_schema_metadata(schema_meta), path, compression="zstd")
+    return path
+
+# Parses a sheet and saves its event table next to the Excel file.
+def convert(df, excel_path, events_col="INC", id_col=None):
+    table, meta = to_event_table(df, events_col, id_col)
+    return write_event_store(table, meta, events_path_for(excel_path))
+
+# What the scrapers call after saving: writing the Parquet should never break
+# a scrape, so any problem here is just printed.
+def save_event_sidecar(df, excel_path, events_col="INC"):
+    try:
+        return convert(df, excel_path, events_col)
+    except (ImportError, OSError, ValueError) as e:
+        print("warning: could not save the event table:", e)
+        return None
+
+def read_metadata(path):
+    import pyarrow.parquet as pq
+
+    schema_meta = pq.read_schema(path).metadata or {}
+    return json.loads(schema_meta.get(METADATA_KEY, b"{}"))
+
+# Loads (part of) an event table. The filters get pushed down into the
+# Parquet reader, so asking for one match or just the cards stays cheap:
+    # load_events(path, event_types=["Yellow", "Red_Card"], columns=["match_id", "side", "player"])
+def load_events(path, match_ids=None, event_types=None, sides=None, columns=None):
+    filters = []
+    if match_ids is not None:
+        filters.append(("match_id", "in", list(match_ids)))
+    if event_types is not None:
+        filters.append(("event_type", "in", list(event_types)))
+    if sides is not None:
+        filters.append(("side", "in", list(sides)))
+    return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+# Rebuilds exactly what ast.literal_eval gave for every row of the Excel file:
+# a list of strings per row, NaN for blank cells, and the original text for
+# the cells that never parsed (so each script's own error handling still runs).
+def event_lists(path):
+    table = load_events(path, columns=["row", "seq", "raw"])
+    return _lists_from(table.sort_values(["row", "seq"]), read_metadata(path))
+
+def _lists_from(table, meta):
+    lists = [[] for _ in range(meta["n_rows"])]
+    for row_number, raw in zip(table["row"].to_numpy(), table["raw"].to_numpy()):
+        lists[row_number].append(raw)
+    for row_number in meta["missing_rows"]:
+        lists[row_number] = float("nan")
+    for row_number, text in meta["bad_rows"].items():
+        lists[int(row_number)] = text
+    return lists
+
+def _is_fresh(path, excel_path, events_col, n_rows):
+    if not os.path.exists(path):
+        return False
+    if os.path.exists(excel_path) and os.path.getmtime(path) < os.path.getmtime(excel_path):
+        return False
+    try:
+        meta = read_metadata(path)
+    except Exception:
+        return False
+    return meta.get("events_col") == events_col and meta.get("n_rows") == n_rows
+
+# The (table, meta) for `df` (which was read from excel_path). Uses the
+# Parquet if it's up to date, otherwise parses once and saves the Parquet for
+# next time.
+def event_table_for(excel_path, df, events_col="INC", columns=None):
+    path = events_path_for(excel_path)
+    try:
+        if _is_fresh(path, excel_path, events_col, len(df)):
+            return load_events(path, columns=columns), read_metadata(path)
+    except ImportError:
+        pass
+
+    table, meta = to_event_table(df, events_col)
+    try:
+        write_event_store(table, meta, path)
+    except (ImportError, OSError, ValueError):
+        pass
+    return (table[columns] if columns else table), meta
+
+# What the scripts call instead of ast.literal_eval per cell: the event lists
+# for every row of `df`, same as event_lists() but through event_table_for().
+def event_lists_for(excel_path, df, events_col="INC"):
+    table, meta = event_table_for(excel_path, df, events_col, columns=["row", "seq", "raw"])
+    return _lists_from(table.sort_values(["row", "seq"]), meta)
+
+def _arg(argv, name, default=None):
+    for arg in argv:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("convert", "show"):
+        print("CMD Terminal Should Read: python3 event_store.py convert {ExcelFile} [more files] [--events-col=INC] [--id-col=MatchId]")
+        print("                      or: python3 event_store.py show {ParquetFile} [--match=MatchId]")
+        sys.exit(1)
+
+    files = [a for a in sys.argv[2:] if not a.startswith("--")]
+    if sys.argv[1] == "convert":
+        for excel_path in files:
+            df = pd.read_excel(excel_path, dtype=str)
+            events_col = _arg(sys.argv, "events-col") or next(
+                (c for c in ("INC", "Cleaned_Events", "events", "Inc") if c in df.columns), None)
+            if events_col is None:
+                print(f"Skipping {excel_path}: no INC / events / Inc column")
+                continue
+            path = convert(df, excel_path, events_col, _arg(sys.argv, "id-col"))
+            print(f"{excel_path} -> {path} ({len(pd.read_parquet(path, columns=['row']))} events)")
+    else:
+        match = _arg(sys.argv, "match")
+        table = load_events(files[0], match_ids=[match] if match else None)
+        print(table.to_string(max_rows=60))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Almost every script (and app.py) starts with pd.read_excel on a big .xlsx,
+# and openpyxl parsing the workbook is most of their run time. This keeps
+# the Excel file as the one I open and edit, but the first read also saves
+# the sheet as Parquet right next to it:
+    # full_data_v5.xlsx -> full_data_v5.xlcache.parquet       (dtypes as read_excel gave them)
+    #                   -> full_data_v5.xlcache-str.parquet   (for dtype=str reads)
+# Every later read comes from the Parquet. The sidecar remembers the Excel
+# file's size, mtime and sha1: same size + mtime -> used as is; mtime changed
+# but same sha1 (file just got touched / copied) -> still used; anything else
+# -> the Excel gets read again and the sidecar replaced.
+# read_excel(path, columns=[...]) only loads those columns from the Parquet.
+# Columns with mixed types (ints and text in 'Years', etc.) can't be a Parquet
+# column, so those cells get pickled one by one and come back exactly as-is.
+# Anything read_excel does that this doesn't (other kwargs) just goes
+# straight to pd.read_excel.
+# python3 excel_cache.py warm {ExcelFile} [more files...]   (builds the sidecars)
+# python3 excel_cache.py bench {ExcelFile}                  (Excel vs sidecar timing)
+
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+
+import pandas as pd
+
+# Parquet (pyarrow) is optional; without it everything reads the Excel file.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW = True
+except ImportError:
+    PYARROW = False
+
+METADATA_KEY = b"excel_source"
+
+def cache_path_for(path, sheet_name=0, as_str=False):
+    tag = "xlcache"
+    if sheet_name not in (0, None):
+        tag += f"-{sheet_name}"
+    if as_str:
+        tag += "-str"
+    return os.path.splitext(path)[0] + f".{tag}.parquet"
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_info(path, with_hash=False):
+    stat = os.stat(path)
+    info = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        info["sha1"] = file_sha1(path)
+    return info
+
+def _read_source_info(cache):
+    schema_meta = pq.read_schema(cache).metadata or {}
+    return json.loads(schema_meta.get(METADATA_KEY, b"{}"))
+
+def read_cache(cache, columns=None):
+    info = _read_source_info(cache)
+    names = info.get("column_names")
+    if names is not None and columns is not None:
+        columns = [str(col) for col in columns]
+    df = pd.read_parquet(cache, columns=columns)
+    for col in info.get("mixed_columns", []):
+        if col in df.columns:
+            df[col] = df[col].map(pickle.loads).astype(object)
+    if names is not None:
+        real_names = {str(name): name for name in names}
+        df.columns = [real_names[col] for col in df.columns]
+    return df
+
+# True if the sidecar still matches the Excel file (see the summary up top).
+def is_fresh(path, cache):
+    if not os.path.exists(cache):
+        return False
+    try:
+        cached = _read_source_info(cache)
+    except Exception:
+        return False
+    return matches_source(cached, path)
+
+# Same check for anything else built from a file that saved source_info(path, True).
+def matches_source(cached, path):
+    now = source_info(path)
+    if cached.get("size") != now["size"]:
+        return False
+    if cached.get("mtime_ns") == now["mtime_ns"]:
+        return True
+    return cached.get("sha1") == file_sha1(path)
+
+# Object columns Parquet can't hold as one type.
+def mixed_columns(df):
+    mixed = []
+    for col in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            mixed.append(col)
+    return mixed
+
+def write_cache(df, path, cache):
+    mixed = mixed_columns(df)
+    names = list(df.columns)
+    # Parquet column names are text; headers Excel gave as numbers (0.8, 2020)
+    # get written as text and their real names kept in the metadata.
+    renamed = any(not isinstance(name, str) for name in names)
+    if mixed or renamed:
+        df = df.copy()
+        for col in mixed:
+            df[col] = df[col].map(pickle.dumps)
+        df.columns = [str(name) for name in names]
+    info = source_info(path, with_hash=True)
+    info["mixed_columns"] = [str(col) for col in mixed]
+    if renamed:
+        info["column_names"] = names
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[METADATA_KEY] = json.dumps(info).encode("utf-8")
+    tmp = cache + ".tmp"
+    pq.write_table(table.replace_schema_metadata(schema_meta), tmp, compression="zstd")
+    os.replace(tmp, cache)
+
+# Same as pd.read_excel(path, sheet_name=..., dtype=...), through the sidecar.
+# columns= picks columns (like usecols with a list of names).
+def read_excel(path, sheet_name=0, dtype=None, columns=None, usecols=None, **kwargs):
+    columns = columns if columns is not None else usecols
+    as_str = dtype is str or dtype == "str"
+    cacheable = (PYARROW and not kwargs and isinstance(sheet_name, (int, str))
+                 and (dtype is None or as_str)
+                 and (columns is None or isinstance(columns, (list, tuple))))
+    if not cacheable:
+        return pd.read_excel(path, sheet_name=sheet_name, dtype=dtype, usecols=columns, **kwargs)
+
+    cache = cache_path_for(path, sheet_name, as_str)
+    if is_fresh(path, cache):
+        try:
+            return read_cache(cache, list(columns) if columns is not None else None)
+        except (OSError, ValueError, KeyError, pa.ArrowException):
+            pass
+
+    df = pd.read_excel(path, sheet_name=sheet_name, dtype=dtype)
+    try:
+        write_cache(df, path, cache)
+    except (OSError, ValueError, TypeError, pa.ArrowException) as e:
+        print(f"warning: not caching {os.path.basename(path)}: {e}")
+    return df[list(columns)] if columns is not None else df
+
+def _bench(path, repeat=3):
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    excel = best(lambda: pd.read_excel(path))
+    read_excel(path)
+    cached = best(lambda: read_excel(path))
+    same = read_excel(path).equals(pd.read_excel(path))
+    print(f"{os.path.basename(path)}: excel {excel:.3f}s, sidecar {cached:.4f}s "
+          f"({excel / cached:.0f}x), same frame: {same}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("warm", "bench"):
+        print("CMD Terminal Should Read: python3 excel_cache.py warm {ExcelFile} [more files]")
+        print("                      or: python3 excel_cache.py bench {ExcelFile} [more files]")
+        sys.exit(1)
+    for excel_path in sys.argv[2:]:
+        if sys.argv[1] == "warm":
+            read_excel(excel_path)
+            print(f"{excel_path} -> {cache_path_for(excel_path)}")
+        else:
+            _bench(excel_path)
@@ -0,0 +1,30 @@
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# One place to grab the Flashscore parsers from the three scraper scripts:
+    # parse_participant_rows / classify_event  -> Incidents scraper
+    # parse_stats_soup / match_canonical       -> Stats scraper
+    # parse_summary_soup                       -> Summary scraper
+# The parsers themselves still live in (and are owned by) those scripts.
+
+import os
+from script_loader import DATA_DIR, load_script
+from flashscore_urls import STATS_TAB, SUMMARY_TAB, match_id_from_url, match_url
+
+INCIDENTS_SCRIPT = os.path.join(DATA_DIR, "Incidents", "incident_report_scraper_v3.py")
+STATS_SCRIPT = os.path.join(DATA_DIR, "Output Stats", "Flashscore - Stats Scraper.py")
+SUMMARY_SCRIPT = os.path.join(DATA_DIR, "Output Summary", "Flashscore - Summary Scraper.py")
+
+incidents_scraper = load_script(INCIDENTS_SCRIPT, "incident_report_scraper_v3")
+stats_scraper = load_script(STATS_SCRIPT, "flashscore_stats_scraper")
+summary_scraper = load_script(SUMMARY_SCRIPT, "flashscore_summary_scraper")
+
+classify_event = incidents_scraper.classify_event
+parse_participant_rows = incidents_scraper.parse_participant_rows
+match_canonical = stats_scraper.match_canonical
+parse_stats_soup = stats_scraper.parse_stats_soup
+parse_summary_soup = summary_scraper.parse_summary_soup
+CANONICAL_STATS = stats_scraper.CANONICAL_STATS
+
+# The incidents scraper's driver is the one that also handles webdriver-manager.
+get_driver = incidents_scraper.get_driver
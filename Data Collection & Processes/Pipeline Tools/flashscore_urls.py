@@ -0,0 +1,37 @@
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Small helpers for Flashscore match urls: pulling the match id out of a url,
+# building a url for a given tab, and naming the tab a url points at.
+# Kept apart from flashscore_parsers.py so it can be used without loading the
+# scraper scripts.
+
+import re
+
+# Tabs of a match page, as they show up after the '#' in the url.
+SUMMARY_TAB = "match-summary/match-summary"
+STATS_TAB = "match-summary/match-statistics/0"
+
+# Flashscore urls have looked like all of these over the years:
+    # https://www.flashscore.com/match/lE6tbhNS/#/match-summary/match-summary
+    # https://www.flashscore.com/match/football/MgRapPRs/#/match-summary/match-statistics/0
+    # https://www.flashscore.com/match/football/team-a/team-b/?mid=MgRapPRs
+MID_PATTERN = re.compile(r"[?&]mid=([A-Za-z0-9]+)")
+MATCH_PATTERN = re.compile(r"/match/(?:football/)?([A-Za-z0-9]{8})(?:/|$|#|\?)")
+
+def match_id_from_url(url):
+    if not isinstance(url, str):
+        return None
+    found = MID_PATTERN.search(url) or MATCH_PATTERN.search(url)
+    return found.group(1) if found else None
+
+def match_url(match_id, tab=SUMMARY_TAB):
+    return f"https://www.flashscore.com/match/{match_id}/#/{tab}"
+
+# '#/match-summary/match-statistics/0' -> 'statistics', '#/match-summary/match-summary' -> 'summary'
+def tab_from_url(url):
+    if not isinstance(url, str) or "#/" not in url:
+        return "summary"
+    parts = [p for p in url.split("#/", 1)[1].split("/") if p and not p.isdigit()]
+    tab = parts[-1] if parts else "match-summary"
+    return tab.replace("match-", "") or "summary"
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The HTMLs folder showed me how useful a saved page is, but the scrapers
+# used to throw the page away right after parsing it. If a selector changed
+# (ex: 'wcl-row_2oCpS') or I found a parser bug, the only fix was re-scraping.
+# Now every page_source the scrapers fetch gets saved here, gzipped:
+    # HTML Cache/objects/<ab>/<sha256>.html.gz -> the page, named by its own hash
+    # HTML Cache/index.jsonl                   -> {"match_id", "tab", "sha256"}
+# Same page saved twice = same hash = stored once.
+# 'reparse' re-runs a parser over the whole cache on all cores, no browser:
+    # python3 html_cache.py reparse incidents output_incidents_reparsed.xlsx
+    # python3 html_cache.py reparse summary output_summary_reparsed.xlsx
+    # python3 html_cache.py reparse stats output_stats_reparsed.xlsx
+# Add '--parser selectolax' (or lxml) to parse with a faster backend.
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from script_loader import DATA_DIR
+from soup_backends import BACKENDS, DEFAULT_BACKEND, make_soup
+from flashscore_urls import match_id_from_url, match_url, tab_from_url
+
+CACHE_DIR = os.path.join(DATA_DIR, "HTML Cache")
+
+# Which cached tab each parser reads.
+PARSER_TABS = {
+    "incidents": "summary",
+    "summary": "summary",
+    "stats": "statistics",
+}
+
+def _object_path(cache_dir, digest):
+    return os.path.join(cache_dir, "objects", digest[:2], f"{digest}.html.gz")
+
+# Saves one page and records which match/tab it belongs to. Returns its hash.
+def store_page(match_id, tab, html, cache_dir=CACHE_DIR):
+    data = html.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(cache_dir, digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so a crash never leaves half a page behind.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    entry = {"match_id": match_id, "tab": tab, "sha256": digest, "time": time.time()}
+    with open(os.path.join(cache_dir, "index.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return digest
+
+# What the scrapers call: figures out the match id and tab from the url.
+# Caching should never break a scrape, so any problem here is just printed.
+def store_url_page(url, html, tab=None, cache_dir=CACHE_DIR):
+    match_id = match_id_from_url(url)
+    if match_id is None or not html:
+        return None
+    try:
+        return store_page(match_id, tab or tab_from_url(url), html, cache_dir=cache_dir)
+    except OSError as e:
+        print("warning: could not cache page:", e)
+        return None
+
+def load_page(digest, cache_dir=CACHE_DIR):
+    with gzip.open(_object_path(cache_dir, digest), "rb") as f:
+        return f.read().decode("utf-8")
+
+# {(match_id, tab): sha256} for the newest copy of every page in the cache.
+def cached_pages(cache_dir=CACHE_DIR, tab=None):
+    pages = {}
+    index_path = os.path.join(cache_dir, "index.jsonl")
+    if not os.path.exists(index_path):
+        return pages
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if tab is None or entry["tab"] == tab:
+                pages[(entry["match_id"], entry["tab"])] = entry["sha256"]
+    return pages
+
+# Runs in the worker processes: unzip one page, parse it, return one row.
+def _reparse_one(args):
+    parser, match_id, digest, cache_dir, backend = args
+    from flashscore_parsers import parse_participant_rows, parse_stats_soup, parse_summary_soup
+
+    soup = make_soup(load_page(digest, cache_dir), backend)
+    row = {"MatchId": match_id, "SourceURL": match_url(match_id)}
+    if parser == "incidents":
+        row["INC"] = str(parse_participant_rows(soup))
+    elif parser == "summary":
+        row.update(parse_summary_soup(soup))
+    else:
+        row.update(parse_stats_soup(soup))
+    return row
+
+def reparse(parser, outfile, workers=None, cache_dir=CACHE_DIR, backend=DEFAULT_BACKEND):
+    pages = cached_pages(cache_dir, tab=PARSER_TABS[parser])
+    tasks = [(parser, match_id, digest, cache_dir, backend) for (match_id, _), digest in sorted(pages.items())]
+    print(f"Re-parsing {len(tasks)} cached '{PARSER_TABS[parser]}' pages with the {parser} parser ({backend})...")
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(_reparse_one, tasks, chunksize=16))
+    elapsed = time.time() - start_time
+    print(f"Parsed {len(rows)} pages in {elapsed:.1f}s")
+
+    out_df = pd.DataFrame(rows)
+    out_df.to_excel(outfile, index=False)
+    print("Saved:", outfile)
+    return out_df
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Offline tools for the raw Flashscore HTML cache.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    reparse_cmd = commands.add_parser("reparse", help="re-run a parser over every cached page")
+    reparse_cmd.add_argument("parser", choices=sorted(PARSER_TABS))
+    reparse_cmd.add_argument("outfile")
+    reparse_cmd.add_argument("--workers", type=int, default=None, help="default: one per core")
+    reparse_cmd.add_argument("--cache", default=CACHE_DIR)
+    reparse_cmd.add_argument("--parser", dest="backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                             help="html backend for the parse functions")
+    args = arg_parser.parse_args()
+
+    if args.command == "reparse":
+        reparse(args.parser, args.outfile, workers=args.workers, cache_dir=args.cache, backend=args.backend)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Every cleanup / feature script read the same workbook, parsed the same
+# incident lists and wrote yet another workbook. This parses each match's
+# incidents ONCE (through the event store) and hands that list to every
+# registered extractor in the same pass, so one run gives one frame with
+# all the columns:
+    # clean        -> Cleaned_Events, Error                  (Incident Clean Up.py)
+    # cards        -> H/A_Yellow_Card, H/A_Red_Card          (CardCounter.py)
+    # halftime     -> H_15, A_15, HT_H_Score, HT_A_Score     (HalfTime Cleanup.py)
+    # card_players -> Players Found                          (Federation Creation.py)
+# The extractors call the original functions from those scripts, so the
+# numbers are the same as running each script on its own.
+# A new feature is just another extractor:
+    # @register("late_goals", ["Late_Goals"])
+    # def late_goals(events):
+    #     if not isinstance(events, list):
+    #         return (0,)
+    #     return (sum("Goal_" in e and (halftime_cleanup.parse_time(e) or 0) >= 80 for e in events),)
+# python3 incident_features.py {InputFile} {OutputFile} [--events-col=INC] [--only=cards,halftime]
+
+import os
+import sys
+import ast
+import time
+
+import pandas as pd
+
+from event_store import event_lists_for
+from excel_cache import read_excel
+from script_loader import DATA_DIR, load_script
+
+CLEANUP_SCRIPT = os.path.join(DATA_DIR, "Incidents Cleanup", "Incident Clean Up.py")
+CARDS_SCRIPT = os.path.join(DATA_DIR, "Incidents Cleanup", "Incidents - YellowRed Cleanup - All", "CardCounter.py")
+HALFTIME_SCRIPT = os.path.join(DATA_DIR, "Halftime Cleanup", "HalfTime Cleanup.py")
+FEDERATION_SCRIPT = os.path.join(DATA_DIR, "Incident Report - Federation - Part1", "Federation Creation.py")
+
+incident_clean_up = load_script(CLEANUP_SCRIPT, "incident_clean_up")
+card_counter = load_script(CARDS_SCRIPT, "card_counter")
+halftime_cleanup = load_script(HALFTIME_SCRIPT, "halftime_cleanup")
+federation_creation = load_script(FEDERATION_SCRIPT, "federation_creation")
+
+# name -> (columns, fn). fn gets one match's events and returns one value per
+# column. The events are a list of strings, or (like the scripts always got)
+# NaN for a blank cell and the raw text for a cell that didn't parse.
+EXTRACTORS = {}
+
+def register(name, columns):
+    def wrap(fn):
+        EXTRACTORS[name] = (list(columns), fn)
+        return fn
+    return wrap
+
+@register("clean", ["Cleaned_Events", "Error"])
+def clean(events):
+    return incident_clean_up.clean_events(events)
+
+@register("cards", ["H_Yellow_Card", "A_Yellow_Card", "H_Red_Card", "A_Red_Card"])
+def cards(events):
+    return tuple(card_counter.count_cards(card_counter.parse_incidents(events)).values())
+
+@register("halftime", ["H_15", "A_15", "HT_H_Score", "HT_A_Score"])
+def halftime(events):
+    return halftime_cleanup.analyze_events(events)[1:]
+
+@register("card_players", ["Players Found"])
+def card_players(events):
+    if not isinstance(events, list):
+        return ([],)
+    return (federation_creation.card_players(events),)
+
+def _parse(cell):
+    if isinstance(cell, list) or not isinstance(cell, str):
+        return cell
+    try:
+        return ast.literal_eval(cell)
+    except (ValueError, SyntaxError):
+        return cell
+
+# One pass over the matches: every extractor sees each parsed list once.
+# Give excel_path (the file df was read from) to get the lists from the
+# event store; without it the cells get parsed here.
+def extract_features(df, events_col="INC", excel_path=None, names=None):
+    names = list(EXTRACTORS) if names is None else names
+    extractors = [EXTRACTORS[name] for name in names]
+
+    if excel_path is not None:
+        event_lists = event_lists_for(excel_path, df, events_col)
+    else:
+        event_lists = [_parse(cell) for cell in df[events_col]]
+
+    columns = {col: [] for cols, _ in extractors for col in cols}
+    for events in event_lists:
+        for cols, fn in extractors:
+            for col, value in zip(cols, fn(events)):
+                columns[col].append(value)
+    return pd.DataFrame(columns, index=df.index)
+
+def main(infile, outfile, events_col="INC", names=None):
+    df = read_excel(infile)
+    start = time.perf_counter()
+    features = extract_features(df, events_col, excel_path=infile, names=names)
+    print(f"{len(features.columns)} feature columns for {len(df)} matches in {time.perf_counter() - start:.2f}s")
+
+    # Feature columns replace any old ones with the same name.
+    df = pd.concat([df.drop(columns=features.columns, errors="ignore"), features], axis=1)
+    df.to_excel(outfile, index=False)
+    print("Saved:", outfile)
+
+def _arg(argv, name, default=None):
+    for arg in argv:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("CMD Terminal Should Read: python3 incident_features.py {InputFile} {OutputFile} "
+              f"[--events-col=INC] [--only={','.join(EXTRACTORS)}]")
+        sys.exit(1)
+    only = _arg(sys.argv, "only")
+    main(sys.argv[1], sys.argv[2], events_col=_arg(sys.argv, "events-col", "INC"),
+         names=only.split(",") if only else None)
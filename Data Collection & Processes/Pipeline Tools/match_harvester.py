@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The summary, stats and incident scrapers each load the same match page on
+# their own, so every match was being opened three times. This harvester opens
+# each match ONCE:
+    # 1. Loads the summary tab and saves its DOM (summary info + incidents).
+    # 2. Flips to the statistics tab inside the same page (no reload).
+    # 3. Saves that DOM too, then runs all three parsers on what it saved.
+# Input: Excel file with column 'URLS' (links to each game)
+# Output: Excel file with one joined row per match:
+    # SourceURL, MatchId, HomeTeam, AwayTeam, Matchday, StartDateTime,
+    # HomeTeamScore, AwayTeamScore, Referee, Attendance, INC,
+    # <Stat> - Home, <Stat> - Away (same stats as the stats scraper)
+
+import time
+import pandas as pd
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from flashscore_parsers import (
+    CANONICAL_STATS,
+    STATS_TAB,
+    SUMMARY_TAB,
+    get_driver,
+    match_id_from_url,
+    match_url,
+    parse_participant_rows,
+    parse_stats_soup,
+    parse_summary_soup,
+    stats_scraper,
+)
+from html_cache import store_url_page
+from soup_backends import DEFAULT_BACKEND, make_soup
+from scrape_journal import journal_path_for, start_journal, append_journal, compact_journal
+from event_store import save_event_sidecar
+from rate_limiter import DEFAULT_RPS, PageNotLoaded, RateLimiter, rps_from_argv
+
+SUMMARY_COLS = ["HomeTeam", "AwayTeam", "Matchday", "StartDateTime",
+                "HomeTeamScore", "AwayTeamScore", "Referee", "Attendance"]
+
+def stats_cols():
+    cols = []
+    for stat in CANONICAL_STATS:
+        cols.append(f"{stat} - Home")
+        cols.append(f"{stat} - Away")
+    return cols
+
+# Waits until at least one stat row has a number in it. Checks through the
+# driver instead of re-parsing the whole page_source every loop.
+def wait_for_stat_values(driver, timeout=15):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            strongs = driver.find_elements(By.CSS_SELECTOR, "div.wcl-row_2oCpS strong")
+            if any(s.text.strip() for s in strongs):
+                return True
+        except Exception:
+            pass
+        time.sleep(0.25)
+    return False
+
+# Opens the summary tab, grabs its html, then switches to the stats tab in the
+# same page and grabs that html. Returns (summary_html, stats_html).
+def capture_match(driver, match_id):
+    driver.get(match_url(match_id, SUMMARY_TAB))
+
+    # Incidents + participants load together on the summary tab; if they
+    # never show up the page didn't load (the rate limiter retries it).
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.smv__verticalSections.section"))
+        )
+    except TimeoutException:
+        raise PageNotLoaded(f"summary tab never loaded for match {match_id}")
+    # Referee / attendance can trail a little behind (and older games don't have them).
+    stats_scraper.wait_for_any(driver, ["div.wcl-infoValue_grawU"], timeout=3)
+    summary_html = driver.page_source
+    store_url_page(match_url(match_id, SUMMARY_TAB), summary_html)
+
+    # Flashscore is a single page app, so changing the hash swaps the tab
+    # without loading the page again.
+    driver.execute_script("window.location.hash = arguments[0];", "#/" + STATS_TAB)
+    stats_html = None
+    if stats_scraper.wait_for_any(driver, ["div.wcl-row_2oCpS", "[data-analytics-context='tab-match-statistics']"], timeout=15):
+        wait_for_stat_values(driver)
+        stats_html = driver.page_source
+        store_url_page(match_url(match_id, STATS_TAB), stats_html)
+
+    return summary_html, stats_html
+
+# Runs all three parsers over the captured html and joins them into one row.
+def parse_match(url, match_id, summary_html, stats_html, backend=DEFAULT_BACKEND):
+    summary_soup = make_soup(summary_html, backend)
+    row = {"SourceURL": url, "MatchId": match_id}
+    row.update(parse_summary_soup(summary_soup))
+    row["INC"] = str(parse_participant_rows(summary_soup))
+    if stats_html:
+        row.update(parse_stats_soup(make_soup(stats_html, backend)))
+    return row
+
+def harvest_match(driver, url, backend=DEFAULT_BACKEND):
+    match_id = match_id_from_url(url)
+    if match_id is None:
+        raise ValueError(f"Could not find a match id in: {url}")
+    summary_html, stats_html = capture_match(driver, match_id)
+    return parse_match(url, match_id, summary_html, stats_html, backend)
+
+# One match = one page load, so `rps` is matches per second.
+def main(infile, outfile, headless=True, resume=False, backend=DEFAULT_BACKEND, rps=DEFAULT_RPS):
+    limiter = RateLimiter(rps=rps)
+    df = pd.read_excel(infile, dtype=str)
+    urls = df["URLS"].dropna().tolist()
+    journal = journal_path_for(outfile)
+    done = start_journal(journal, resume=resume)
+    driver = get_driver(headless=headless)
+    start_time = time.time()
+    try:
+        for index, url in enumerate(urls, start=1):
+            if url in done:
+                continue
+            print(f"[{index}/{len(urls)}] {url} ({limiter.describe(url)})")
+            try:
+                row = limiter.fetch(url, lambda: harvest_match(driver, url, backend))
+            except Exception as e:
+                print("Error:", e)
+                row = {"SourceURL": url, "MatchId": match_id_from_url(url), "INC": "[]", "Error": str(e)}
+            append_journal(journal, url, row)
+    finally:
+        driver.quit()
+
+    elapsed = time.time() - start_time
+    print(f"Harvested {len(urls) - len(done)} matches in {elapsed / 60:.1f} min")
+
+    # Puts the columns in order; 'Error' stays at the end for the failed urls.
+    ordered_cols = ["SourceURL", "MatchId"] + SUMMARY_COLS + ["INC"] + stats_cols() + ["Error"]
+    out_df = compact_journal(journal, urls, outfile, columns=ordered_cols)
+    if out_df["Error"].isna().all():
+        out_df.drop(columns="Error").to_excel(outfile, index=False)
+    save_event_sidecar(out_df, outfile)
+    print("Saved:", outfile)
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3:
+        print("CMD Terminal Should Read: python3 'Pipeline Tools/match_harvester.py' {InputFile} {OutputFile} [--resume] [--parser=selectolax] [--rps=1]")
+        sys.exit(1)
+    backend = DEFAULT_BACKEND
+    for arg in sys.argv[3:]:
+        if arg.startswith("--parser="):
+            backend = arg.split("=", 1)[1]
+    main(sys.argv[1], sys.argv[2], headless=True, resume="--resume" in sys.argv, backend=backend,
+         rps=rps_from_argv(sys.argv))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# HalfTime Cleanup only gets goals before 15' and the half-time score, and
+# its parse_time throws the stoppage time away (45+2' -> 45). This rebuilds
+# every match's timeline from the event table (event_store) and works out
+# the game state whenever something happened, for all matches at once:
+    # - clock: minutes actually played, so 45+2' is after 45' but before 46',
+    #   and everything in the 2nd half moves back by the 1st half's stoppage
+    # - score before every event (goals / own goals count for their side,
+    #   same as analyze_events)
+    # - men on the pitch after every red card
+# Per match (H_ = home team, A_ = away team):
+    # H_Cards_0_15 ... H_Cards_76_90   cards (yellow + red) per 15' bin, stoppage
+    #                                  time goes in the last bin of its half
+    # H_Stoppage_Cards                 cards shown in stoppage time
+    # H_Cards_Leading/Level/Trailing   cards shown while the team was ahead/level/behind
+    # H_Card_Score_Diff                average goal difference (for the carded
+    #                                  team) when its cards were shown
+    # H_Mins_Down_Man                  minutes played with fewer men than the other team
+    # H_Goals_Stoppage                 goals scored in stoppage time
+# python3 match_timeline.py {ExcelFile} [more files...] {OutputFile} [--events-col=INC]
+# python3 match_timeline.py --all {OutputFile}    (every season in '[Output] Incident Reports - 2002-2025')
+
+import os
+import sys
+import glob
+import time
+
+import numpy as np
+import pandas as pd
+
+from event_store import event_table_for
+from excel_cache import read_excel
+from script_loader import DATA_DIR
+
+SEASONS_DIR = os.path.join(DATA_DIR, "Incidents", "[Output] Incident Reports - 2002-2025")
+
+GOAL_TYPES = ["Goal", "Own"]
+CARD_TYPES = ["Yellow", "Red_Card"]
+RED_TYPES = ["Red_Card"]
+
+# Regular minute bins; the last bin of each half also gets its stoppage time.
+BIN_EDGES = [15, 30, 45, 60, 75]
+BIN_NAMES = ["0_15", "16_30", "31_45", "46_60", "61_75", "76_90"]
+
+HALF_LENGTH = 45
+FULL_TIME = 90
+
+def feature_columns():
+    columns = []
+    for side in ("H", "A"):
+        columns += [f"{side}_Cards_{name}" for name in BIN_NAMES]
+        columns += [f"{side}_Stoppage_Cards", f"{side}_Cards_Leading", f"{side}_Cards_Level",
+                    f"{side}_Cards_Trailing", f"{side}_Card_Score_Diff", f"{side}_Mins_Down_Man",
+                    f"{side}_Goals_Stoppage"]
+    return columns
+
+# The timeline: every goal and card with a minute, in the order it happened,
+# with its clock (minutes played) and the score just before it.
+    # row | seq | minute | stoppage | event_type | side | clock | home_before | away_before
+# Returns (timeline, match_end) where match_end[row] is the clock at full time.
+def build_timeline(table, n_rows):
+    events = table[table["event_type"].isin(GOAL_TYPES + CARD_TYPES)
+                   & table["side"].isin(["Home", "Away"])
+                   & table["minute"].notna()]
+    rows = events["row"].to_numpy(dtype=np.int64)
+    minute = events["minute"].to_numpy(dtype=np.float64, na_value=np.nan)
+    stoppage = events["stoppage"].to_numpy(dtype=np.float64, na_value=0.0)
+    first_half = minute <= HALF_LENGTH
+
+    # Stoppage played in each half (as far as the events show it).
+    stoppage_1 = np.zeros(n_rows)
+    np.maximum.at(stoppage_1, rows[first_half], stoppage[first_half])
+    stoppage_2 = np.zeros(n_rows)
+    np.maximum.at(stoppage_2, rows[~first_half], stoppage[~first_half])
+
+    clock = minute + stoppage + np.where(first_half, 0.0, stoppage_1[rows])
+    match_end = FULL_TIME + stoppage_1 + stoppage_2
+
+    timeline = pd.DataFrame({
+        "row": rows,
+        "seq": events["seq"].to_numpy(dtype=np.int64),
+        "minute": minute,
+        "stoppage": stoppage,
+        "in_stoppage": events["stoppage"].notna().to_numpy(),
+        "event_type": events["event_type"].astype(str).to_numpy(),
+        "home": (events["side"] == "Home").to_numpy(),
+        "clock": clock,
+    })
+    # Same minute: keep the order the incident list had.
+    timeline = timeline.sort_values(["row", "clock", "seq"], kind="stable").reset_index(drop=True)
+
+    goal = timeline["event_type"].isin(GOAL_TYPES).to_numpy()
+    home = timeline["home"].to_numpy()
+    by_match = timeline["row"]
+    home_goals = pd.Series((goal & home).astype(np.int64)).groupby(by_match).cumsum().to_numpy()
+    away_goals = pd.Series((goal & ~home).astype(np.int64)).groupby(by_match).cumsum().to_numpy()
+    # "Before" = not counting the event itself.
+    timeline["home_before"] = home_goals - (goal & home)
+    timeline["away_before"] = away_goals - (goal & ~home)
+    return timeline, match_end
+
+def _count(rows, n_rows, weights=None):
+    return np.bincount(rows, weights=weights, minlength=n_rows)
+
+# Minutes each side spent a man (or more) down: between two red cards the
+# numbers don't change, so each gap counts for whoever was short in it.
+def minutes_down(timeline, match_end, n_rows):
+    reds = timeline[timeline["event_type"].isin(RED_TYPES)]
+    if reds.empty:
+        return np.zeros(n_rows), np.zeros(n_rows)
+    rows = reds["row"].to_numpy()
+    home = reds["home"].to_numpy()
+    home_reds = pd.Series(home.astype(np.int64)).groupby(rows).cumsum().to_numpy()
+    away_reds = pd.Series((~home).astype(np.int64)).groupby(rows).cumsum().to_numpy()
+
+    clock = reds["clock"].to_numpy()
+    next_clock = np.append(clock[1:], 0.0)
+    last_of_match = np.append(rows[1:] != rows[:-1], True)
+    next_clock = np.where(last_of_match, match_end[rows], next_clock)
+    gap = np.clip(next_clock - clock, 0.0, None)
+
+    home_down = _count(rows[home_reds > away_reds], n_rows, gap[home_reds > away_reds])
+    away_down = _count(rows[away_reds > home_reds], n_rows, gap[away_reds > home_reds])
+    return home_down, away_down
+
+# The per-match features for an event table (n_rows = rows in the Excel file).
+def timeline_features(table, n_rows):
+    timeline, match_end = build_timeline(table, n_rows)
+    rows = timeline["row"].to_numpy()
+    home = timeline["home"].to_numpy()
+    card = timeline["event_type"].isin(CARD_TYPES).to_numpy()
+    goal = timeline["event_type"].isin(GOAL_TYPES).to_numpy()
+    in_stoppage = timeline["in_stoppage"].to_numpy()
+    bins = np.searchsorted(BIN_EDGES, timeline["minute"].to_numpy(), side="left")
+    # Goal difference from the point of view of the team the event belongs to.
+    diff = (timeline["home_before"] - timeline["away_before"]).to_numpy()
+    diff = np.where(home, diff, -diff)
+    home_down, away_down = minutes_down(timeline, match_end, n_rows)
+
+    features = {}
+    for side, is_side, mins_down in (("H", home, home_down), ("A", ~home, away_down)):
+        cards = card & is_side
+        for b, name in enumerate(BIN_NAMES):
+            features[f"{side}_Cards_{name}"] = _count(rows[cards & (bins == b)], n_rows)
+        features[f"{side}_Stoppage_Cards"] = _count(rows[cards & in_stoppage], n_rows)
+        features[f"{side}_Cards_Leading"] = _count(rows[cards & (diff > 0)], n_rows)
+        features[f"{side}_Cards_Level"] = _count(rows[cards & (diff == 0)], n_rows)
+        features[f"{side}_Cards_Trailing"] = _count(rows[cards & (diff < 0)], n_rows)
+        n_cards = _count(rows[cards], n_rows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            features[f"{side}_Card_Score_Diff"] = _count(rows[cards], n_rows, diff[cards]) / n_cards
+        features[f"{side}_Mins_Down_Man"] = mins_down
+        features[f"{side}_Goals_Stoppage"] = _count(rows[goal & is_side & in_stoppage], n_rows)
+
+    out = pd.DataFrame(features)[feature_columns()]
+    int_cols = [c for c in out.columns if not c.endswith(("Card_Score_Diff", "Mins_Down_Man"))]
+    return out.astype({c: "int64" for c in int_cols})
+
+# Features for every row of `df` (read from excel_path), same index as df.
+def timeline_for(excel_path, df, events_col="INC"):
+    table, _ = event_table_for(excel_path, df, events_col,
+                               columns=["row", "seq", "minute", "stoppage", "event_type", "side"])
+    features = timeline_features(table, len(df))
+    features.index = df.index
+    return features
+
+def season_files():
+    return sorted(glob.glob(os.path.join(glob.escape(SEASONS_DIR), "output_incidents_[0-9]*.xlsx")))
+
+def main(infiles, outfile, events_col="INC"):
+    start = time.perf_counter()
+    frames = []
+    for infile in infiles:
+        df = read_excel(infile, dtype=str)
+        features = timeline_for(infile, df, events_col)
+        frames.append(pd.concat([df.drop(columns=features.columns, errors="ignore"), features], axis=1))
+    out = pd.concat(frames, ignore_index=True)
+    print(f"Timeline features for {len(out)} matches from {len(infiles)} file(s) in {time.perf_counter() - start:.2f}s")
+    out.to_excel(outfile, index=False)
+    print("Saved:", outfile)
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if "--all" in sys.argv and args:
+        infiles, outfile = season_files(), args[-1]
+    elif len(args) >= 2:
+        infiles, outfile = args[:-1], args[-1]
+    else:
+        print("CMD Terminal Should Read: python3 match_timeline.py {ExcelFile} [more files] {OutputFile} [--events-col=INC]")
+        print("                      or: python3 match_timeline.py --all {OutputFile}")
+        sys.exit(1)
+    events_col = "INC"
+    for arg in sys.argv[1:]:
+        if arg.startswith("--events-col="):
+            events_col = arg.split("=", 1)[1]
+    main(infiles, outfile, events_col)
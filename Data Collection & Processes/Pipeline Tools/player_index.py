@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Federation Creation.py used to look every carded player up with
+    # players_df.loc[players_df["Corrected Name"] == name, "Federation"]
+# which scans the whole player table once per player per match. This builds
+# a name -> player index ONCE from 'Player Information v3.xlsx' (federation,
+# country, name, team, years), keyed by the name after the same clean-up as
+# NormalizeNames.remove_accents (plus strip), so "Ødegaard M." and
+# "Odegaard M." land on the same player.
+# The index gets saved as Parquet next to the Excel file:
+    # Player Information v3.xlsx -> Player Information v3.index.parquet
+# and is rebuilt only when the Excel file is newer.
+# All the matches are then resolved in one join (federations_for).
+# Names that still don't match ("Al Habsi A." vs "Al-Habsi A.", "Cucho
+# Hernandez" vs "Hernandez C.", "Reid Andy" vs "Reid A.", "Hreidarsson" vs "Hreiðarsson") go through a
+# fuzzy matcher: character n-gram TF-IDF over the index, all names scored in
+# one sparse matrix product, and the first initial has to agree so
+# "McCarthy A." never turns into "McCarthy J.". Every scored name is kept in
+# an alias table (<file>.aliases.parquet) so the next run doesn't redo it.
+# python3 player_index.py build {PlayerFile}
+# python3 player_index.py lookup {PlayerFile} "Drogba D." "Essien M." ...
+# python3 player_index.py fuzzy {PlayerFile} "Al Habsi A." ... [--threshold=0.88]
+
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Only the fuzzy matcher needs scikit-learn (app.py already does).
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    SKLEARN = True
+except ImportError:
+    SKLEARN = False
+
+from excel_cache import read_excel
+from script_loader import REPO_DIR, load_script
+
+NORMALIZE_SCRIPT = os.path.join(REPO_DIR, "Master Datasets", "Player Info Dataset", "NormalizeNames.py")
+normalize_names = load_script(NORMALIZE_SCRIPT, "normalize_names")
+
+NAME_COL = "Corrected Name"
+INDEX_COLS = ["Federation", "Country", "Name", "Corrected Name", "Team", "Years"]
+UNKNOWN = "Unknown"
+
+# Below this a fuzzy match counts as unknown. Wrong pairs like "McAtee J." /
+# "McAteer J." or "Keane M." / "Kean M." score around 0.82-0.85.
+FUZZY_THRESHOLD = 0.88
+FUZZY_CANDIDATES = 10
+# "Anderson E." vs the mononym "Anderson" is often a different player, so a
+# match where only one side has an initial counts a bit less.
+ONE_SIDED_INITIAL = 0.95
+
+# Letters remove_accents leaves alone.
+FUZZY_MAPPING = {"ð": "d", "Ð": "D", "þ": "th", "Þ": "Th", "ß": "ss", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ı": "i"}
+INITIAL_PATTERN = re.compile(r"^[a-z]\.$")
+
+def index_path_for(players_path):
+    return os.path.splitext(players_path)[0] + ".index.parquet"
+
+def aliases_path_for(players_path):
+    return os.path.splitext(players_path)[0] + ".aliases.parquet"
+
+def name_key(name):
+    if not isinstance(name, str):
+        return None
+    return normalize_names.remove_accents(name).strip()
+
+# One row per name key. A name that shows up more than once keeps its first
+# row, same as .values[0] did in the old lookup.
+def build_player_index(players_df):
+    cols = [c for c in INDEX_COLS if c in players_df.columns]
+    index = players_df[cols].copy()
+    index[NAME_COL] = index[NAME_COL].str.strip()
+    index["key"] = index[NAME_COL].map(name_key)
+    index = index.dropna(subset=["key"]).drop_duplicates("key", keep="first")
+    return index.set_index("key")
+
+def save_player_index(index, path):
+    index.astype({"Years": "string"} if "Years" in index.columns else {}).to_parquet(path)
+    return path
+
+# The index for the players file: loaded from the Parquet if it's up to date,
+# otherwise built from the Excel file and saved for next time.
+def player_index_for(players_path):
+    path = index_path_for(players_path)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(players_path):
+        try:
+            return pd.read_parquet(path)
+        except (ImportError, OSError, ValueError):
+            pass
+
+    index = build_player_index(read_excel(players_path))
+    try:
+        save_player_index(index, path)
+    except (ImportError, OSError, ValueError) as e:
+        print("warning: could not save the player index:", e)
+    return index
+
+# Player rows for a list of names, in the same order (NaN where unknown).
+def lookup(names, index, columns=None):
+    keys = pd.Series(list(names), dtype=object).map(name_key)
+    found = index.reindex(keys)
+    return found[columns] if columns else found
+
+# Federations for every match at once: player_lists is one list of names per
+# match, and the result is one list of federations per match (same order,
+# UNKNOWN for players that aren't in the index). aliases (from
+# resolve_names) maps names that aren't in the index as-is to their key.
+def federations_for(player_lists, index, column="Federation", aliases=None):
+    aliases = aliases or {}
+    rows, names = [], []
+    for row_number, players in enumerate(player_lists):
+        rows.extend([row_number] * len(players))
+        names.extend(players)
+
+    # Each distinct name gets normalized once, then it's a single join.
+    keys = {name: aliases.get(name) or name_key(name) for name in set(names)}
+    long = pd.DataFrame({"row": rows, "key": [keys[name] for name in names]})
+    long = long.join(index[column], on="key")
+    long[column] = long[column].astype(object).where(long[column].notna(), UNKNOWN)
+
+    federations = [[] for _ in player_lists]
+    for row_number, value in zip(long["row"].to_numpy(), long[column].to_numpy()):
+        federations[row_number].append(value)
+    return federations
+
+# Every distinct name in player_lists that isn't in the index as-is.
+def unmatched_names(player_lists, index):
+    names = {name for players in player_lists for name in players}
+    return sorted(name for name in names if name_key(name) not in index.index)
+
+# The looser key the fuzzy matcher compares: lowercase, extra letters
+# mapped, and hyphens / apostrophes / dots-in-names treated as spaces.
+def fuzzy_key(name):
+    key = name_key(name)
+    if key is None:
+        return ""
+    key = "".join(FUZZY_MAPPING.get(c, c) for c in key).lower()
+    key = re.sub(r"[-'`\u2019]", " ", key)
+    return " ".join(key.split())
+
+# First initial ("Drogba D." -> "d"), None if the name doesn't have one.
+def first_initial(key):
+    for token in key.split()[1:]:
+        if INITIAL_PATTERN.match(token):
+            return token[0]
+    return None
+
+# A full name, written the way the index writes names (either word could be
+# the surname): "cucho hernandez" -> "hernandez c.", "cucho h."
+def initial_forms(key):
+    tokens = key.split()
+    if len(tokens) < 2 or first_initial(key) is not None:
+        return []
+    return [f"{tokens[-1]} {tokens[0][0]}.", f"{tokens[0]} {tokens[-1][0]}."]
+
+class NameMatcher:
+    def __init__(self, index):
+        if not SKLEARN:
+            raise ImportError("The fuzzy matcher needs scikit-learn: pip install scikit-learn")
+        self.keys = index.index.to_numpy()
+        fuzzy_keys = [fuzzy_key(k) for k in self.keys]
+        self.initials = [first_initial(k) for k in fuzzy_keys]
+        self.vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3), dtype=np.float32)
+        self.matrix = self.vectorizer.fit_transform(fuzzy_keys).T.tocsc()
+
+    # Best index key and its cosine score for each name, all in one go.
+    # Returns a frame: name | match | score (match is None when nothing fits).
+    def match(self, names):
+        names = list(names)
+        queries, owners = [], []
+        for position, name in enumerate(names):
+            key = fuzzy_key(name)
+            for query in [key] + initial_forms(key):
+                if query:
+                    queries.append(query)
+                    owners.append(position)
+
+        best_key = [None] * len(names)
+        best_score = np.zeros(len(names))
+        if queries:
+            scores = (self.vectorizer.transform(queries) @ self.matrix).tocsr()
+            for row, position in enumerate(owners):
+                start, end = scores.indptr[row], scores.indptr[row + 1]
+                cols, data = scores.indices[start:end], scores.data[start:end]
+                initial = first_initial(queries[row])
+                for top in np.argsort(-data)[:FUZZY_CANDIDATES]:
+                    # Different first initials = different players.
+                    other = self.initials[cols[top]]
+                    if initial is not None and other is not None and other != initial:
+                        continue
+                    score = float(data[top])
+                    if (initial is None) != (other is None):
+                        score *= ONE_SIDED_INITIAL
+                    if score > best_score[position]:
+                        best_key[position] = self.keys[cols[top]]
+                        best_score[position] = score
+        return pd.DataFrame({"name": names, "match": best_key, "score": best_score})
+
+def load_aliases(players_path):
+    path = aliases_path_for(players_path)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(players_path):
+        try:
+            return pd.read_parquet(path)
+        except (ImportError, OSError, ValueError):
+            pass
+    return pd.DataFrame({"name": pd.Series(dtype=object), "match": pd.Series(dtype=object),
+                         "score": pd.Series(dtype=float)})
+
+# name -> index key for names that aren't in the index as-is. Only names that
+# aren't in the alias table get scored; the table keeps every score, so a
+# different threshold doesn't need a re-run.
+def resolve_names(names, players_path, index=None, threshold=FUZZY_THRESHOLD):
+    index = player_index_for(players_path) if index is None else index
+    aliases = load_aliases(players_path)
+    known = set(aliases["name"])
+    missing = sorted({n for n in names if isinstance(n, str) and n not in known})
+    if missing and not SKLEARN:
+        print("warning: scikit-learn isn't installed, so names that don't match exactly stay unknown")
+    elif missing:
+        aliases = pd.concat([aliases, NameMatcher(index).match(missing)], ignore_index=True)
+        try:
+            aliases.to_parquet(aliases_path_for(players_path))
+        except (ImportError, OSError, ValueError) as e:
+            print("warning: could not save the alias table:", e)
+
+    matched = aliases[(aliases["score"] >= threshold) & aliases["match"].notna()]
+    return dict(zip(matched["name"], matched["match"]))
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("build", "lookup", "fuzzy"):
+        print("CMD Terminal Should Read: python3 player_index.py build {PlayerFile}")
+        print("                      or: python3 player_index.py lookup {PlayerFile} {Name} [more names]")
+        print("                      or: python3 player_index.py fuzzy {PlayerFile} {Name} [more names] [--threshold=0.88]")
+        sys.exit(1)
+
+    players_path = sys.argv[2]
+    if sys.argv[1] == "build":
+        index = build_player_index(read_excel(players_path))
+        path = save_player_index(index, index_path_for(players_path))
+        print(f"{len(index)} players -> {path}")
+    elif sys.argv[1] == "fuzzy":
+        names = [a for a in sys.argv[3:] if not a.startswith("--")]
+        threshold = FUZZY_THRESHOLD
+        for arg in sys.argv[3:]:
+            if arg.startswith("--threshold="):
+                threshold = float(arg.split("=", 1)[1])
+        matches = NameMatcher(player_index_for(players_path)).match(names)
+        matches["ok"] = matches["score"] >= threshold
+        print(matches.to_string(index=False))
+    else:
+        names = sys.argv[3:]
+        found = lookup(names, player_index_for(players_path))
+        found.index = names
+        print(found.to_string())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# webscrape_html.py showed Playwright can render these pages, but it does one
+# url at a time, and the selenium scrapers each run a full Chrome per script.
+# This engine runs ONE headless Chromium with a few browser contexts and many
+# pages going at once (asyncio):
+    # 1. Images, fonts, media and ad/analytics requests are blocked, since the
+    #    parsers never look at them (less to download, less memory per page).
+    # 2. Each match is visited once like the harvester: summary tab, then the
+    #    stats tab by changing the hash (no reload). Both DOMs go in the cache.
+    # 3. The rendered html goes through the same parse functions (parse_match),
+    #    in a process pool so parsing doesn't hold up the pages.
+# Output: same Excel layout as match_harvester.py, through the scrape journal
+# (so --resume works here too).
+# python3 playwright_engine.py {InputFile} {OutputFile} [--resume] [--contexts=3]
+#                              [--pages=4] [--rps=3] [--parser=selectolax]
+# A full 2002-2025 backfill is ~8,700 matches, so it needs about 2.5 matches/s
+# to finish in under an hour; --rps is the cap for that.
+
+import sys
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+import pandas as pd
+
+# Playwright is optional; the selenium scrapers don't need it.
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT = True
+except Exception:
+    PLAYWRIGHT = False
+
+from event_store import save_event_sidecar
+from flashscore_urls import STATS_TAB, SUMMARY_TAB, match_id_from_url, match_url
+from html_cache import store_url_page
+from match_harvester import SUMMARY_COLS, parse_match, stats_cols
+from rate_limiter import PageNotLoaded, RateLimiter, rps_from_argv
+from scrape_journal import journal_path_for, start_journal, append_journal, compact_journal
+from soup_backends import DEFAULT_BACKEND
+
+ENGINE_RPS = 3.0
+CONTEXTS = 3
+PAGES_PER_CONTEXT = 4
+
+# A page gets closed and reopened after this many matches (same idea as
+# DRIVER_MAX_PAGES in the incident scraper, the page slowly leaks memory).
+PAGE_MAX_MATCHES = 150
+
+# Nothing the parsers read comes from these.
+BLOCKED_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com", "google-analytics.com",
+    "googleadservices.com", "adservice.google", "amazon-adsystem.com", "adnxs.com", "criteo",
+    "taboola.com", "outbrain.com", "scorecardresearch.com", "hotjar.com", "facebook.net",
+    "facebook.com", "quantserve.com", "moatads.com", "pubmatic.com", "rubiconproject.com",
+    "casalemedia.com", "openx.net", "teads.tv", "onetrust.com", "cookielaw.org", "chartbeat",
+)
+
+STATS_READY_JS = """() => Array.prototype.some.call(
+    document.querySelectorAll("div.wcl-row_2oCpS strong"), s => s.textContent.trim())"""
+
+def is_blocked(resource_type, url):
+    if resource_type in BLOCKED_TYPES:
+        return True
+    host = urlparse(url).netloc.lower()
+    return any(blocked in host for blocked in BLOCKED_HOSTS)
+
+class Engine:
+    def __init__(self, journal, total, backend=DEFAULT_BACKEND, rps=ENGINE_RPS,
+                 contexts=CONTEXTS, pages_per_context=PAGES_PER_CONTEXT, max_matches=PAGE_MAX_MATCHES):
+        self.journal = journal
+        self.total = total
+        self.backend = backend
+        self.contexts = contexts
+        self.pages_per_context = pages_per_context
+        self.max_matches = max_matches
+        self.limiter = RateLimiter(rps=rps, max_concurrent=contexts * pages_per_context)
+        self.parse_pool = ProcessPoolExecutor()
+        self.done = 0
+        self.blocked = 0
+        self.start_time = time.time()
+
+    async def _route(self, route):
+        request = route.request
+        if is_blocked(request.resource_type, request.url):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    # Same steps as capture_match() in the harvester, with Playwright waits.
+    async def capture(self, page, match_id):
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+        await page.goto(match_url(match_id, SUMMARY_TAB), wait_until="domcontentloaded", timeout=30000)
+        try:
+            await page.wait_for_selector("div.smv__verticalSections.section", timeout=10000)
+        except PlaywrightTimeout:
+            raise PageNotLoaded(f"summary tab never loaded for match {match_id}")
+        # Referee / attendance can trail a little behind (and older games don't have them).
+        try:
+            await page.wait_for_selector("div.wcl-infoValue_grawU", timeout=3000)
+        except PlaywrightTimeout:
+            pass
+        summary_html = await page.content()
+        store_url_page(match_url(match_id, SUMMARY_TAB), summary_html)
+
+        await page.evaluate("hash => { window.location.hash = hash; }", "#/" + STATS_TAB)
+        stats_html = None
+        try:
+            await page.wait_for_selector("div.wcl-row_2oCpS, [data-analytics-context='tab-match-statistics']", timeout=15000)
+        except PlaywrightTimeout:
+            return summary_html, stats_html
+        try:
+            await page.wait_for_function(STATS_READY_JS, timeout=15000)
+        except PlaywrightTimeout:
+            pass
+        stats_html = await page.content()
+        store_url_page(match_url(match_id, STATS_TAB), stats_html)
+        return summary_html, stats_html
+
+    async def harvest(self, page, url):
+        match_id = match_id_from_url(url)
+        if match_id is None:
+            raise ValueError(f"Could not find a match id in: {url}")
+        summary_html, stats_html = await self.capture(page, match_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_pool, parse_match, url, match_id,
+                                          summary_html, stats_html, self.backend)
+
+    # One page, pulling (index, url) off the queue until it gets None.
+    async def worker(self, context, tasks):
+        page = await context.new_page()
+        matches = 0
+        while True:
+            task = await tasks.get()
+            if task is None:
+                break
+            _, url = task
+            if matches >= self.max_matches:
+                await page.close()
+                page = await context.new_page()
+                matches = 0
+            matches += 1
+            try:
+                row = await self.limiter.fetch_async(url, lambda: self.harvest(page, url))
+            except Exception as e:
+                print("Error:", e)
+                row = {"SourceURL": url, "MatchId": match_id_from_url(url), "INC": "[]", "Error": str(e)}
+                # The page may have crashed, so start the next match on a new one.
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+                page = await context.new_page()
+                matches = 0
+            append_journal(self.journal, url, row)
+
+            self.done += 1
+            elapsed = time.time() - self.start_time
+            rate = self.done / elapsed * 60 if elapsed else 0.0
+            print(f"[{self.done}/{self.total}] {url} ({rate:.1f} matches/min, {self.limiter.describe(url)})")
+        await page.close()
+
+    async def run(self, tasks_list, headless=True):
+        tasks = asyncio.Queue()
+        for task in tasks_list:
+            tasks.put_nowait(task)
+        n_workers = self.contexts * self.pages_per_context
+        for _ in range(n_workers):
+            tasks.put_nowait(None)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless, args=["--disable-dev-shm-usage"])
+            contexts = []
+            try:
+                for _ in range(self.contexts):
+                    context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+                    await context.route("**/*", self._route)
+                    contexts.append(context)
+                workers = [self.worker(contexts[i % self.contexts], tasks) for i in range(n_workers)]
+                await asyncio.gather(*workers)
+            finally:
+                for context in contexts:
+                    await context.close()
+                await browser.close()
+                self.parse_pool.shutdown()
+
+def main(infile, outfile, headless=True, resume=False, backend=DEFAULT_BACKEND, rps=ENGINE_RPS,
+         contexts=CONTEXTS, pages_per_context=PAGES_PER_CONTEXT):
+    if not PLAYWRIGHT:
+        print("Playwright isn't installed: pip install playwright && playwright install chromium")
+        sys.exit(1)
+
+    df = pd.read_excel(infile, dtype=str)
+    urls = df["URLS"].dropna().tolist()
+    journal = journal_path_for(outfile)
+    done = start_journal(journal, resume=resume)
+    pending = [(index, url) for index, url in enumerate(urls) if url not in done]
+
+    if pending:
+        engine = Engine(journal, len(pending), backend=backend, rps=rps,
+                        contexts=contexts, pages_per_context=pages_per_context)
+        asyncio.run(engine.run(pending, headless=headless))
+        elapsed = time.time() - engine.start_time
+        rate = len(pending) / elapsed * 60 if elapsed else 0.0
+        print(f"Harvested {len(pending)} matches in {elapsed / 60:.1f} min ({rate:.1f} matches/min), "
+              f"blocked {engine.blocked} requests")
+
+    ordered_cols = ["SourceURL", "MatchId"] + SUMMARY_COLS + ["INC"] + stats_cols() + ["Error"]
+    out_df = compact_journal(journal, urls, outfile, columns=ordered_cols)
+    if out_df["Error"].isna().all():
+        out_df.drop(columns="Error").to_excel(outfile, index=False)
+    save_event_sidecar(out_df, outfile)
+    print("Saved:", outfile)
+
+def _int_arg(argv, name, default):
+    for arg in argv:
+        if arg.startswith(f"--{name}="):
+            return int(arg.split("=", 1)[1])
+    return default
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("CMD Terminal Should Read: python3 'Pipeline Tools/playwright_engine.py' {InputFile} {OutputFile} "
+              "[--resume] [--contexts=3] [--pages=4] [--rps=3] [--parser=selectolax]")
+        sys.exit(1)
+    backend = DEFAULT_BACKEND
+    for arg in sys.argv[3:]:
+        if arg.startswith("--parser="):
+            backend = arg.split("=", 1)[1]
+    main(sys.argv[1], sys.argv[2], headless=True, resume="--resume" in sys.argv, backend=backend,
+         rps=rps_from_argv(sys.argv, default=ENGINE_RPS),
+         contexts=_int_arg(sys.argv, "contexts", CONTEXTS),
+         pages_per_context=_int_arg(sys.argv, "pages", PAGES_PER_CONTEXT))
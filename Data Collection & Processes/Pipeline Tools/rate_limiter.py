@@ -0,0 +1,170 @@
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The scrapers used to be polite with fixed sleeps (0.5s, 1s, or nothing),
+# which is too slow when Flashscore is fine and too pushy when it starts to
+# throttle. This is the one rate limiter they all share now:
+    # - Token bucket per host: at most `rps` requests per second (the budget).
+    # - Concurrency cap per host: at most `max_concurrent` pages loading at once.
+    # - Backoff on pages that didn't load (driver timeout, or the scraper
+    #   raising PageNotLoaded when the page container never showed up): waits
+    #   2s, 4s, 8s... (with jitter) before hitting that host again, and
+    #   retries the page. A page that loaded but has no data (older seasons
+    #   without stats, matches without incidents) is a normal answer: it
+    #   counts as ok and isn't retried.
+    # - Adapts: the live rate creeps up while pages come back fast and clean,
+    #   and gets cut in half on errors or when pages start getting slow.
+# When several workers run at once (incident pool mode), each one gets an
+# equal slice of the budget (rps / workers), so all of them together stay
+# under `rps`. Each pool worker only has one Chrome, so there the concurrency
+# cap is just the number of workers.
+
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+# Requests per second across all workers, if a scraper isn't told otherwise.
+DEFAULT_RPS = 1.0
+
+# What a scraper raises when the page itself never loaded (as opposed to a
+# page that loaded with nothing on it). Counts as a timeout for retries.
+class PageNotLoaded(TimeoutError):
+    pass
+
+class HostState:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.backoff_until = 0.0
+        self.failures = 0
+        self.latency = None
+        self.error_rate = 0.0
+
+class RateLimiter:
+    def __init__(self, rps=DEFAULT_RPS, start_rps=None, min_rps=0.05, burst=1, max_concurrent=1,
+                 slow_latency=8.0, base_backoff=2.0, max_backoff=60.0):
+        self.max_rate = rps
+        self.start_rate = start_rps if start_rps is not None else rps / 2
+        self.min_rate = min(min_rps, rps)
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.slow_latency = slow_latency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.hosts = {}
+        self.semaphores = {}
+        self.async_semaphores = {}
+        self.lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlparse(url).netloc or url
+        if host not in self.hosts:
+            self.hosts[host] = HostState(self.start_rate, self.burst)
+            self.semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+        return host, self.hosts[host]
+
+    # Takes a token for the host and returns how long to wait before using it.
+    # Tokens can go negative, which just queues the caller behind the others.
+    def reserve(self, url):
+        with self.lock:
+            _, state = self._host(url)
+            now = time.monotonic()
+            state.tokens = min(self.burst, state.tokens + (now - state.last) * state.rate)
+            state.last = now
+            state.tokens -= 1
+            wait = 0.0 if state.tokens >= 0 else -state.tokens / state.rate
+            return max(wait, state.backoff_until - now)
+
+    def semaphore_for(self, url):
+        with self.lock:
+            host, _ = self._host(url)
+            return self.semaphores[host]
+
+    # Feeds one result back in so the rate can adapt.
+    def record(self, url, ok, latency=None):
+        with self.lock:
+            _, state = self._host(url)
+            state.error_rate = 0.9 * state.error_rate + (0.0 if ok else 0.1)
+            if ok:
+                state.failures = 0
+                if latency is not None:
+                    state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+                # Slow pages are the first sign of throttling, so ease off a bit.
+                if state.latency is not None and state.latency > self.slow_latency:
+                    state.rate = max(self.min_rate, state.rate * 0.9)
+                else:
+                    state.rate = min(self.max_rate, state.rate + 0.05 * self.max_rate)
+            else:
+                state.failures += 1
+                state.rate = max(self.min_rate, state.rate * 0.5)
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (state.failures - 1))
+                # Full-ish jitter so several workers don't all come back at once.
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                state.backoff_until = time.monotonic() + delay
+
+    # Waits for a token + a free slot, runs fn(), and feeds the outcome back.
+    # Whatever fn() returns (empty or not) is a good page. Timeouts /
+    # PageNotLoaded get retried after a backoff and raised once the retries
+    # run out; other errors are raised right away.
+    def fetch(self, url, fn, retries=2):
+        for attempt in range(retries + 1):
+            time.sleep(self.reserve(url))
+            semaphore = self.semaphore_for(url)
+            semaphore.acquire()
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                latency = time.monotonic() - start
+                self.record(url, ok=False, latency=latency)
+                if attempt < retries and is_timeout(e):
+                    continue
+                raise
+            finally:
+                semaphore.release()
+
+            self.record(url, ok=True, latency=time.monotonic() - start)
+            return result
+
+    # Same as fetch() for the asyncio engine: fn() returns a coroutine, and the
+    # waiting happens with asyncio.sleep so the other pages keep going.
+    async def fetch_async(self, url, fn, retries=2):
+        host = urlparse(url).netloc or url
+        if host not in self.async_semaphores:
+            self.async_semaphores[host] = asyncio.Semaphore(self.max_concurrent)
+        semaphore = self.async_semaphores[host]
+        for attempt in range(retries + 1):
+            await asyncio.sleep(self.reserve(url))
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    result = await fn()
+                except Exception as e:
+                    self.record(url, ok=False, latency=time.monotonic() - start)
+                    if attempt < retries and is_timeout(e):
+                        continue
+                    raise
+                latency = time.monotonic() - start
+
+            self.record(url, ok=True, latency=latency)
+            return result
+
+    # One line for the progress prints: live rate, latency, error rate.
+    def describe(self, url):
+        with self.lock:
+            _, state = self._host(url)
+            latency = f"{state.latency:.1f}s" if state.latency is not None else "-"
+            return f"{state.rate:.2f} req/s, latency {latency}, errors {state.error_rate:.0%}"
+
+def is_timeout(error):
+    return isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower()
+
+# Reads '--rps=2' off the command line (the budget), or the default.
+def rps_from_argv(argv, default=DEFAULT_RPS):
+    for arg in argv:
+        if arg.startswith("--rps="):
+            return float(arg.split("=", 1)[1])
+    return default
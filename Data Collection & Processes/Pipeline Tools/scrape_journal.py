@@ -0,0 +1,69 @@
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The scrapers used to hold every row in memory and only write the Excel file
+# at the very end. If Chrome crashed at match 300, everything was gone (that's
+# why the referee results got split into 15 files by hand).
+# Now every scraped url gets appended to a journal file right away:
+    # <outfile>.journal.jsonl -> one json line per url: {"url", "ok", "row"}
+# With resume on, urls that already finished without an error are skipped.
+# Once a run finishes, the journal gets compacted into the usual Excel file.
+
+import os
+import json
+import time
+import pandas as pd
+
+def journal_path_for(outfile):
+    return f"{outfile}.journal.jsonl"
+
+# Reads the journal back. If a url shows up more than once, the last line wins.
+def load_journal(path):
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Half-written last line from a crash; everything before it is fine.
+                continue
+            entries[entry["url"]] = entry
+    return entries
+
+# Urls that already finished without an error.
+def completed_urls(path):
+    return {url for url, entry in load_journal(path).items() if entry.get("ok")}
+
+# Without resume the run starts over, so the old journal gets cleared.
+def start_journal(path, resume=False):
+    if resume:
+        done = completed_urls(path)
+        print(f"Resuming: {len(done)} urls already done in {path}")
+        return done
+    open(path, "w", encoding="utf-8").close()
+    return set()
+
+# Appends one url's row and flushes it to disk straight away.
+def append_journal(path, url, row, ok=None):
+    if ok is None:
+        ok = "Error" not in row
+    entry = {"url": url, "ok": bool(ok), "time": time.time(), "row": row}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+# Builds the final Excel file from the journal, in the same order as `urls`.
+def compact_journal(path, urls, outfile, columns=None):
+    entries = load_journal(path)
+    rows = [entries[url]["row"] for url in urls if url in entries]
+    out_df = pd.DataFrame(rows)
+    if columns is not None:
+        out_df = out_df.reindex(columns=columns)
+    out_df.to_excel(outfile, index=False)
+    return out_df
@@ -0,0 +1,35 @@
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Most of my scripts have spaces in their file names (ex: 'Flashscore - Stats
+# Scraper.py'), so python can't 'import' them the normal way. This loads a
+# script straight from its path so the newer tools can reuse its functions
+# instead of copy/pasting them.
+# Only load scripts whose work sits under an `if __name__ == "__main__":`
+# guard, otherwise loading them would kick off the whole script.
+
+import os
+import sys
+import importlib.util
+
+# Root folders, so every tool builds paths the same way.
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.dirname(TOOLS_DIR)
+REPO_DIR = os.path.dirname(DATA_DIR)
+
+def load_script(path, name):
+    # Reuse the module if it was already loaded once in this process.
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load script: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[name]
+        raise
+    return module
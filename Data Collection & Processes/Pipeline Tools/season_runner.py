@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# 'Incident Clean Up.py' and the incident scraper both have 23 commented out
+# lines, one per season, so doing every season meant editing the file and
+# running it 23 times. This finds every season file for a stage and runs the
+# stage over all of them in a process pool (one season per core):
+    # clean   Pre Clean/output_incidents_YYYY-YYYY.xlsx -> Post Clean/cleaned_file_YYYY-YYYY.xlsx
+    # scrape  [Input]/input_urls_YYYY-YYYY.xlsx          -> [Output]/output_incidents_YYYY-YYYY.xlsx
+# Every season still gets its own output file, then they're all stacked into
+# one combined file (in season order) in the output folder, named after the
+# seasons in it (combined_2002-2003_to_2024-2025.xlsx). It never touches the
+# hand-built combined.xlsx. With --seasons picking only some of the seasons
+# (or a season failing) there's no combined file unless --combined asks for
+# one. It prints the time and row count per season as they finish.
+# python3 season_runner.py {clean|scrape} [--seasons=2010-2011,2011-2012] [--workers=8]
+#                          [--combined | --no-combined] [--rps=1] [--js] [--resume]
+# For scrape, the --rps budget gets split across the seasons running at once.
+
+import os
+import re
+import sys
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from excel_cache import read_excel
+from rate_limiter import DEFAULT_RPS, rps_from_argv
+from script_loader import DATA_DIR, load_script
+
+SEASON_PATTERN = re.compile(r"(\d{4}-\d{4})\.xlsx$")
+COMBINED_NAME = "combined_{first}_to_{last}.xlsx"
+
+# name -> where the inputs are, what the outputs are called, and which
+# script / function runs one season.
+STAGES = {
+    "clean": {
+        "input_dir": os.path.join(DATA_DIR, "Incidents Cleanup", "Incidents - Pre Clean - 2002-2025"),
+        "input_name": "output_incidents_{season}.xlsx",
+        "output_dir": os.path.join(DATA_DIR, "Incidents Cleanup", "Incidents - Post Clean - 2002-2025"),
+        "output_name": "cleaned_file_{season}.xlsx",
+        "script": os.path.join(DATA_DIR, "Incidents Cleanup", "Incident Clean Up.py"),
+        "module": "incident_clean_up",
+    },
+    "scrape": {
+        "input_dir": os.path.join(DATA_DIR, "Incidents", "[Input] Incident URLs - 2002-2025"),
+        "input_name": "input_urls_{season}.xlsx",
+        "output_dir": os.path.join(DATA_DIR, "Incidents", "[Output] Incident Reports - 2002-2025"),
+        "output_name": "output_incidents_{season}.xlsx",
+        "script": os.path.join(DATA_DIR, "Incidents", "incident_report_scraper_v3.py"),
+        "module": "incident_report_scraper_v3",
+    },
+}
+
+def discover_seasons(stage):
+    config = STAGES[stage]
+    pattern = config["input_name"].format(season="*")
+    seasons = []
+    for path in glob.glob(os.path.join(glob.escape(config["input_dir"]), pattern)):
+        match = SEASON_PATTERN.search(path)
+        if match:
+            seasons.append(match.group(1))
+    return sorted(seasons)
+
+def season_paths(stage, season):
+    config = STAGES[stage]
+    return (os.path.join(config["input_dir"], config["input_name"].format(season=season)),
+            os.path.join(config["output_dir"], config["output_name"].format(season=season)))
+
+# Runs one season in a worker process. Returns (season, rows, seconds, error).
+def run_season(stage, season, options):
+    infile, outfile = season_paths(stage, season)
+    start = time.perf_counter()
+    try:
+        script = load_script(STAGES[stage]["script"], STAGES[stage]["module"])
+        if stage == "scrape":
+            script.main(infile, outfile, headless=True, resume=options.get("resume", False),
+                        extract=options.get("extract", "soup"), rps=options.get("rps", DEFAULT_RPS))
+        else:
+            script.main(infile, outfile)
+        rows = len(pd.read_excel(outfile, usecols=[0]))
+        return season, rows, time.perf_counter() - start, None
+    except Exception as e:
+        return season, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+def combined_path(stage, seasons):
+    seasons = sorted(seasons)
+    return os.path.join(STAGES[stage]["output_dir"], COMBINED_NAME.format(first=seasons[0], last=seasons[-1]))
+
+# Stacks the per-season outputs (in season order) into the combined file.
+def write_combined(stage, seasons):
+    frames = []
+    included = []
+    for season in sorted(seasons):
+        _, outfile = season_paths(stage, season)
+        if os.path.exists(outfile):
+            frames.append(read_excel(outfile))
+            included.append(season)
+    if not frames:
+        return None
+    path = combined_path(stage, included)
+    pd.concat(frames, ignore_index=True).to_excel(path, index=False)
+    return path
+
+# combined: True / False, or None = only when every season ran fine.
+def main(stage, seasons=None, workers=None, combined=None, options=None):
+    options = dict(options or {})
+    every_season = discover_seasons(stage)
+    seasons = seasons or every_season
+    if not seasons:
+        print(f"No season files found for '{stage}' in {STAGES[stage]['input_dir']}")
+        return 1
+    workers = max(1, min(workers or os.cpu_count() or 1, len(seasons)))
+    if stage == "scrape":
+        # Every season running at once shares the one budget.
+        options["rps"] = options.get("rps", DEFAULT_RPS) / workers
+    print(f"{stage}: {len(seasons)} seasons on {workers} worker(s)")
+
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_season, stage, season, options) for season in seasons]
+        for future in as_completed(futures):
+            season, rows, seconds, error = future.result()
+            results[season] = (rows, seconds, error)
+            status = f"FAILED ({error})" if error else f"{rows} rows"
+            print(f"  {season}: {status} in {seconds:.1f}s")
+
+    failed = sorted(season for season, (_, _, error) in results.items() if error)
+    total_rows = sum(rows for rows, _, _ in results.values())
+    print(f"Done: {len(seasons) - len(failed)}/{len(seasons)} seasons, {total_rows} rows "
+          f"in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print("Failed:", ", ".join(failed))
+
+    if combined is None:
+        combined = not failed and set(seasons) >= set(every_season)
+        if not combined:
+            print("Not writing a combined file for only some of the seasons (--combined to write one anyway)")
+    if combined:
+        path = write_combined(stage, [s for s in seasons if s not in failed])
+        if path:
+            print("Combined:", path)
+    return 1 if failed else 0
+
+def _arg(argv, name, default=None):
+    for arg in argv:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in STAGES:
+        print(f"CMD Terminal Should Read: python3 season_runner.py {{{'|'.join(STAGES)}}} "
+              "[--seasons=2010-2011,2011-2012] [--workers=8] [--combined | --no-combined] [--rps=1] [--js] [--resume]")
+        sys.exit(1)
+    seasons = _arg(sys.argv, "seasons")
+    workers = _arg(sys.argv, "workers")
+    options = {"resume": "--resume" in sys.argv, "extract": "js" if "--js" in sys.argv else "soup",
+               "rps": rps_from_argv(sys.argv)}
+    combined = False if "--no-combined" in sys.argv else (True if "--combined" in sys.argv else None)
+    sys.exit(main(sys.argv[1], seasons=seasons.split(",") if seasons else None,
+                  workers=int(workers) if workers else None, combined=combined,
+                  options=options))
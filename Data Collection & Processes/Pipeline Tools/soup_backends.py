@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# All the parse_* functions build BeautifulSoup(..., "html.parser") trees over
+# 600+ KB pages, and building that tree in pure python is most of the time a
+# reparse takes. make_soup() lets the same parse functions (same CSS
+# selectors) run on a faster backend:
+    # "html.parser" -> BeautifulSoup + python's parser (the original, the fallback)
+    # "lxml"        -> BeautifulSoup + lxml's C parser (same soup, faster build)
+    # "selectolax"  -> selectolax's lexbor parser, wrapped so it answers the
+    #                  handful of BeautifulSoup calls the parsers make
+# If lxml/selectolax isn't installed, it falls back to "html.parser".
+# Run this file to check every backend gives the exact same results as
+# "html.parser" on the saved pages in the HTMLs folder:
+    # python3 soup_backends.py
+
+import os
+import sys
+import glob
+from bs4 import BeautifulSoup
+
+# Optional, faster backends.
+try:
+    import lxml  # noqa: F401
+    LXML = True
+except Exception:
+    LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX = True
+except Exception:
+    SELECTOLAX = False
+
+DEFAULT_BACKEND = "html.parser"
+BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+# Text inside these never counts as text (BeautifulSoup skips them too).
+SKIP_TEXT_IN = {"script", "style", "template"}
+
+# --------------------------------------------------------------------------- #
+# selectolax wrapper: only the BeautifulSoup bits the parse_* functions use:
+# select / select_one / find / find_next_sibling / get / get_text
+# --------------------------------------------------------------------------- #
+class LexborTag:
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, css):
+        return [LexborTag(n) for n in self.node.css(css)]
+
+    def select_one(self, css):
+        node = self.node.css_first(css)
+        return LexborTag(node) if node is not None else None
+
+    # find("div", class_="x") -> first descendant <div> with class x.
+    def find(self, name=None, class_=None):
+        return self.select_one(_css_for(name, class_))
+
+    # Next sibling *element* with the given class (text nodes are skipped).
+    def find_next_sibling(self, name=None, class_=None):
+        node = self.node.next
+        while node is not None:
+            if node.tag not in ("-text", "-comment") and _matches(node, name, class_):
+                return LexborTag(node)
+            node = node.next
+        return None
+
+    # 'class' comes back as a list, just like BeautifulSoup does it.
+    def get(self, key, default=None):
+        attrs = self.node.attributes
+        if key not in attrs:
+            return default
+        value = attrs[key]
+        if key == "class":
+            return (value or "").split()
+        return value if value is not None else ""
+
+    def get_text(self, separator="", strip=False):
+        parts = []
+        for text in _text_nodes(self.node):
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            parts.append(text)
+        return separator.join(parts)
+
+# The document itself; select/select_one work from the top of the page.
+class LexborSoup(LexborTag):
+    __slots__ = ("tree",)
+
+    def __init__(self, html):
+        self.tree = LexborHTMLParser(html)
+        super().__init__(self.tree.root)
+
+def _css_for(name, class_):
+    css = name or "*"
+    if class_:
+        css += "." + ".".join(class_.split())
+    return css
+
+def _matches(node, name, class_):
+    if name and node.tag != name:
+        return False
+    if class_:
+        classes = (node.attributes.get("class") or "").split()
+        if class_ not in classes and class_ != node.attributes.get("class"):
+            return False
+    return True
+
+# Every text node under `node`, in order, skipping <script>/<style> text.
+def _text_nodes(node):
+    child = node.child
+    while child is not None:
+        if child.tag == "-text":
+            yield child.text_content or ""
+        elif child.tag not in SKIP_TEXT_IN and child.tag != "-comment":
+            yield from _text_nodes(child)
+        child = child.next
+
+# --------------------------------------------------------------------------- #
+
+def available_backends():
+    return [b for b in BACKENDS if b == "html.parser" or (b == "lxml" and LXML) or (b == "selectolax" and SELECTOLAX)]
+
+# What the scrapers/reparse call instead of BeautifulSoup(html, "html.parser").
+def make_soup(html, backend=DEFAULT_BACKEND):
+    if backend == "selectolax" and SELECTOLAX:
+        return LexborSoup(html)
+    if backend == "lxml" and LXML:
+        return BeautifulSoup(html, "lxml")
+    if backend not in (DEFAULT_BACKEND, None):
+        print(f"warning: parser backend '{backend}' isn't installed, using {DEFAULT_BACKEND}")
+    return BeautifulSoup(html, DEFAULT_BACKEND)
+
+# Runs every parser over every saved page with every backend and compares it
+# against "html.parser". Returns the list of mismatches.
+def compare_backends(html_files, backends=None):
+    from flashscore_parsers import parse_participant_rows, parse_stats_soup, parse_summary_soup
+    parsers = {
+        "incidents": parse_participant_rows,
+        "stats": parse_stats_soup,
+        "summary": parse_summary_soup,
+    }
+
+    mismatches = []
+    for path in html_files:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        expected = {name: fn(make_soup(html, DEFAULT_BACKEND)) for name, fn in parsers.items()}
+        for backend in backends or available_backends():
+            for name, fn in parsers.items():
+                got = fn(make_soup(html, backend))
+                status = "ok" if got == expected[name] else "MISMATCH"
+                print(f"{status:8} {os.path.basename(path):34} {backend:12} {name}")
+                if got != expected[name]:
+                    mismatches.append((path, backend, name, expected[name], got))
+    return mismatches
+
+if __name__ == "__main__":
+    from script_loader import DATA_DIR
+
+    files = sys.argv[1:] or sorted(glob.glob(os.path.join(DATA_DIR, "HTMLs", "*.html")))
+    bad = compare_backends(files)
+    for path, backend, name, expected, got in bad:
+        print(f"\n{os.path.basename(path)} / {backend} / {name}:\n  expected: {expected}\n  got:      {got}")
+    sys.exit(1 if bad else 0)
@@ -6,9 +6,14 @@
 # language. By replacing them with their english counterpart, i'm able
 # to connect this player info dataset with the master dataset.
 
-import pandas as pd
+import os
+import sys
 import unicodedata
 
+# Shared tools (excel cache, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data Collection & Processes", "Pipeline Tools"))
+from excel_cache import read_excel
+
 # Mapping special characters into english.
 mapping = {
     "ø": "o", "Ø": "O",
@@ -34,14 +39,15 @@ def remove_accents(text):
     
     return text
 
-# Input and output file names
-input_file = "Player Information.xlsx"
-output_file = "Revised_PlayerInformation.xlsx"
-df = pd.read_excel(input_file)
+def main(input_file="Player Information.xlsx", output_file="Revised_PlayerInformation.xlsx"):
+    df = read_excel(input_file)
+
+    # Apply transformation
+    df["Corrected Name"] = df["Corrected Name"].apply(remove_accents)
 
-# Apply transformation
-df["Corrected Name"] = df["Corrected Name"].apply(remove_accents)
+    # Saves our file! :D
+    df.to_excel(output_file, index=False)
+    print(f"Finished! Cleaned file is complete!")
 
-# Saves our file! :D
-df.to_excel(output_file, index=False)
-print(f"Finished! Cleaned file is complete!")
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,17 @@
 # ----------------------------------------------------------------------- #
 # This file collects all of the 'strong' tags in a certain location.
 # Then returns the first and last value [ref, attendance].
-# There is a second delay between requests to avoid suspicion.
+# Requests go through the shared rate limiter (1 per second by default, or
+# --rps=N), which backs off and retries when a page times out.
 # This is the fourth iteration of the file. 
+# Every url is written to 'results.xlsx.journal.jsonl' as soon as it's done,
+# so a crash doesn't lose the run. Run with --resume to skip the urls that
+# already finished fine (no more splitting the run up into results_* files).
+# Run with --js to read all the info boxes in one in-page script instead of
+# one WebDriver call per box.
 
+import os
+import sys
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -13,8 +21,19 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 
+# Shared tools (scrape journal, etc.) live in the 'Pipeline Tools' folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Data Collection & Processes", "Pipeline Tools"))
+from scrape_journal import journal_path_for, start_journal, append_journal, compact_journal
+from html_cache import store_url_page
+from browser_extract import extract_info_values
+from rate_limiter import RateLimiter, rps_from_argv
+
 df = pd.read_excel("urls.xlsx")
 urls = df["URL"].tolist()
+journal = journal_path_for("results.xlsx")
+done = start_journal(journal, resume="--resume" in sys.argv)
+use_js = "--js" in sys.argv
+limiter = RateLimiter(rps=rps_from_argv(sys.argv))
 
 options = webdriver.ChromeOptions()
 options.add_argument("--headless=new")
@@ -23,11 +42,31 @@ options.add_argument("--no-sandbox")
 options.add_argument("--disable-dev-shm-usage")
 driver = webdriver.Chrome(options=options)
 
+# Loads the page and collects the <strong> text of every info box.
+def read_info_values(url):
+    if use_js:
+        # One in-page script grabs every <strong> at once.
+        return extract_info_values(driver, url)
+
+    driver.get(url)
+
+    # Wait until the divs are loaded.
+    divs = WebDriverWait(driver, 15).until(
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.wcl-infoValue_grawU"))
+    )
+
+    # Keep a copy of the page so it can be re-parsed later without the browser.
+    store_url_page(url, driver.page_source)
+
+    # Collect all <strong> text/tags in a specific div
+    return [div.find_element(By.TAG_NAME, "strong").text.strip() for div in divs]
+
 start_time = time.time()
-results = []
 total = len(urls)
 
 for index, url in enumerate(urls, start=1):
+    if url in done:
+        continue
     try:
 
         # Gives time elapsed, and which url we're on.
@@ -35,33 +74,24 @@ for index, url in enumerate(urls, start=1):
         minutes = int(elapsed // 60)
         seconds = int(elapsed % 60)
 
-        print(f"[{index}/{total}] - TIME: {minutes:02d}:{seconds:02d}")
-        driver.get(url)
-        
-        # Wait until the divs are loaded.
-        divs = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.wcl-infoValue_grawU"))
-        )
-        
-        # Collect all <strong> text/tags in a specific div
-        temp_results = [div.find_element(By.TAG_NAME, "strong").text.strip() for div in divs]
+        print(f"[{index}/{total}] - TIME: {minutes:02d}:{seconds:02d} ({limiter.describe(url)})")
+
+        temp_results = limiter.fetch(url, lambda: read_info_values(url), is_empty=lambda values: not values)
         
         # Grab first and last [ref, attendance]
         refereeName = temp_results[0]
         attendance = temp_results[-1].replace(" ", "")  # remove spaces
         
         # PUT IT ALL TOGETHER !
-        results.append([refereeName, attendance, url])
-        time.sleep(1) 
+        append_journal(journal, url, {"Referee": refereeName, "Attendance": attendance, "URL": url})
         
     except Exception as e:
         print(f"Error processing {url}: {e}")
-        results.append(["Error", "Error", url])
+        append_journal(journal, url, {"Referee": "Error", "Attendance": "Error", "URL": url}, ok=False)
 
 driver.quit()
 
 # Save results to Excel
-results_df = pd.DataFrame(results, columns=["Referee", "Attendance", "URL"])
-results_df.to_excel("results.xlsx", index=False)
+compact_journal(journal, urls, "results.xlsx", columns=["Referee", "Attendance", "URL"])
 
 print("Scraping complete! Results saved to results.xlsx")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# app.py predicts one match at a time from the sliders. This scores a whole
+# fixture list (CSV / Parquet / xlsx, one match per row, same column names as
+# MasterDataset_ML.xlsx) in one go with the same steps the app uses:
+    # the model's inference bundle: encoder -> imputer -> scaler -> predict_proba
+# Every step runs on the whole chunk at once (no per-row loop), chunk_size
+# rows at a time so a huge file doesn't need all of its features in memory.
+    # referee -> Referee_1, Referee_1_Prob ... Referee_k, Referee_k_Prob
+    # result  -> one Prob_<class> column per outcome + Predicted_Result
+# The input columns come back too, so fixture ids / dates stay attached.
+# A row's encoding doesn't depend on what else is in the file, and feature
+# columns the file doesn't have are 0, like app.py does (H_Score / A_Score
+# for the referee model, WIN or Referee for the other).
+# python3 batch_predict.py {referee|result} {InputFile} {OutputFile} [--top=3] [--chunk=50000]
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import model_registry
+from excel_cache import read_excel  # importable once model_registry put Pipeline Tools on sys.path
+
+CHUNK_SIZE = 50000
+TOP_K = 3
+
+# How each model's scores get written out.
+OUTPUT = {"referee": "top_k", "result": "probabilities"}
+
+def top_k_frame(proba, classes, top_k, label):
+    top_k = min(top_k, proba.shape[1])
+    # argpartition gets the k best per row, then only those k get sorted.
+    best = np.argpartition(-proba, top_k - 1, axis=1)[:, :top_k]
+    best_proba = np.take_along_axis(proba, best, axis=1)
+    order = np.argsort(-best_proba, axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    best_proba = np.take_along_axis(best_proba, order, axis=1)
+    out = {}
+    for k in range(top_k):
+        out[f"{label}_{k + 1}"] = classes[best[:, k]]
+        out[f"{label}_{k + 1}_Prob"] = best_proba[:, k]
+    return pd.DataFrame(out)
+
+def probability_frame(proba, classes, label):
+    out = pd.DataFrame(proba, columns=[f"Prob_{c}" for c in classes])
+    out[f"Predicted_{label}"] = classes[proba.argmax(axis=1)]
+    return out
+
+# The fixtures with the prediction columns added on the right.
+def predict_frame(df, name, top_k=TOP_K, chunk_size=CHUNK_SIZE):
+    bundle = model_registry.get_bundle(name)
+    parts = []
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        proba = bundle.predict_proba(chunk)
+        if OUTPUT[name] == "top_k":
+            parts.append(top_k_frame(proba, bundle.classes, top_k, "Referee"))
+        else:
+            parts.append(probability_frame(proba, bundle.classes, "Result"))
+    if not parts:
+        return df.copy()
+    scores = pd.concat(parts, ignore_index=True)
+    scores.index = df.index
+    return pd.concat([df, scores], axis=1)
+
+# --------- #
+# File I/O  #
+# --------- #
+
+def read_fixtures(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(path)
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext in (".xlsx", ".xls"):
+        return read_excel(path)
+    raise ValueError(f"Don't know how to read '{ext}' files (use .csv, .parquet or .xlsx)")
+
+def write_predictions(df, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        df.to_csv(path, index=False)
+    elif ext == ".parquet":
+        df.to_parquet(path, index=False)
+    elif ext == ".xlsx":
+        df.to_excel(path, index=False)
+    else:
+        raise ValueError(f"Don't know how to write '{ext}' files (use .csv, .parquet or .xlsx)")
+
+def main(name, infile, outfile, top_k=TOP_K, chunk_size=CHUNK_SIZE):
+    fixtures = read_fixtures(infile)
+    start = time.perf_counter()
+    predictions = predict_frame(fixtures, name, top_k=top_k, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - start
+    write_predictions(predictions, outfile)
+    rate = len(fixtures) / elapsed * 60 if elapsed else 0
+    print(f"Scored {len(fixtures):,} fixtures with the {name} model in {elapsed:.2f}s "
+          f"({rate:,.0f} rows/min) -> {outfile}")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+    if len(args) != 3 or args[0] not in model_registry.MODELS:
+        print("CMD Terminal Should Read: python3 batch_predict.py {referee|result} {InputFile} {OutputFile} "
+              "[--top=3] [--chunk=50000]")
+        sys.exit(1)
+    main(args[0], args[1], args[2], top_k=int(flags.get("top", TOP_K)),
+         chunk_size=int(flags.get("chunk", CHUNK_SIZE)))
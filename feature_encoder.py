@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Turns match details into the feature row a model was trained on, without
+# pd.get_dummies. The encoder is built once from model_columns.pkl:
+    # "Home_Arsenal"      -> ("Home", "Arsenal") sets its own fixed column
+    # "Stadium Capacity"  -> the number is copied straight into its column
+# and then every prediction just fills a preallocated NumPy array: numbers
+# are copied in, each categorical value sets a single 1.
+# Same result as the notebook's get_dummies(drop_first=True): the value that
+# drop_first left out has no column, so it (and any team / city / referee the
+# model never saw) comes out as all zeros. Feature columns that aren't given
+# are 0, like app.py always did.
+# Works on one match (a dict), a few (a list of dicts) or a whole DataFrame.
+    # encoder = FeatureEncoder(model_columns, ["Home", "Away", ...])
+    # encoder.transform({"Home": "Arsenal", "Away": "Chelsea", ...})   -> (1, n) array
+    # encoder.transform(fixtures_df)                                   -> (len, n) array
+# python3 feature_encoder.py bench   (get_dummies + padding vs the encoder)
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# How a category value is named in a dummy column: 2015 and 2015.0 both
+# have to find "Season Start Year_2015".
+def category_key(value):
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+def _missing(value):
+    return value is None or (isinstance(value, (float, np.floating)) and np.isnan(value))
+
+class FeatureEncoder:
+    def __init__(self, columns, categorical):
+        self.columns = list(columns)
+        self.categorical = list(categorical)
+        self.numeric = {}
+        self.dummies = {col: {} for col in self.categorical}
+        # Longest name first so "Referee - UK Region of Birth_North" isn't
+        # taken for a referee called "- UK Region of Birth_North".
+        prefixes = sorted(self.categorical, key=len, reverse=True)
+        for i, name in enumerate(self.columns):
+            for col in prefixes:
+                if name.startswith(col + "_"):
+                    self.dummies[col][name[len(col) + 1:]] = i
+                    break
+            else:
+                self.numeric[name] = i
+
+    def __len__(self):
+        return len(self.columns)
+
+    def _fill_row(self, row, match):
+        for col, value in match.items():
+            i = self.numeric.get(col)
+            if i is not None:
+                row[i] = np.nan if _missing(value) else value
+                continue
+            lookup = self.dummies.get(col)
+            if lookup is not None and not _missing(value):
+                j = lookup.get(category_key(value))
+                if j is not None:
+                    row[j] = 1.0
+
+    def _fill_frame(self, out, df):
+        for col in df.columns:
+            i = self.numeric.get(col)
+            if i is not None:
+                out[:, i] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                continue
+            lookup = self.dummies.get(col)
+            if lookup is None:
+                continue
+            # Look up each distinct value once, then scatter the 1s.
+            codes, uniques = pd.factorize(df[col])
+            targets = np.array([lookup.get(category_key(u), -1) for u in uniques] + [-1], dtype=np.intp)
+            hit = targets[codes]
+            rows = np.flatnonzero(hit >= 0)
+            out[rows, hit[rows]] = 1.0
+
+    # One match (dict), several (list of dicts) or a DataFrame -> float array.
+    def transform(self, data):
+        if isinstance(data, pd.DataFrame):
+            # Column-major, so filling one feature for every row is one
+            # contiguous write (and pandas wraps it without copying).
+            out = np.zeros((len(data), len(self.columns)), order="F")
+            self._fill_frame(out, data)
+            return out
+        matches = [data] if isinstance(data, dict) else list(data)
+        out = np.zeros((len(matches), len(self.columns)))
+        for row, match in zip(out, matches):
+            self._fill_row(row, match)
+        return out
+
+    # Same thing with the column names on (the imputer was fitted on a
+    # DataFrame and warns about a bare array). Wraps the array, no copy.
+    def transform_frame(self, data):
+        return pd.DataFrame(self.transform(data), columns=self.columns, copy=False)
+
+# What app.py did for one slider row vs the encoder (needs the exported
+# model_columns.pkl files).
+def _bench(repeat=200):
+    import warnings
+    import model_registry
+
+    # The old way's column-by-column inserts warn about fragmentation (and
+    # the 1.6.1 pickles about the sklearn version) on every call.
+    warnings.simplefilter("ignore")
+
+    match = {
+        "Home": "Arsenal", "Away": "Chelsea", "Stadium City": "London",
+        "Season Start Year": 2020, "Referee - UK Region of Birth": "North",
+        "Stadium Capacity": 60000, "Stadium Attendance": 59000,
+        "H_Ball_Possession": 0.55, "A_Ball_Possession": 0.45, "H_Free_Kicks": 10,
+        "A_Free_Kicks": 12, "H_Corner_Kicks": 6, "A_Corner_Kicks": 4, "H_Fouls": 11,
+        "A_Fouls": 13, "H_Yellow_Cards": 2, "A_Yellow_Cards": 3, "H_Red_Cards": 0,
+        "A_Red_Cards": 0, "PenaltiesAwarded": 0,
+    }
+    for name, config in model_registry.MODELS.items():
+        columns = model_registry.load_artifact(model_registry.artifact_paths(name)["columns"])
+        encoder = FeatureEncoder(columns, config["categorical"])
+
+        def old_way():
+            encoded = pd.get_dummies(pd.DataFrame({k: [v] for k, v in match.items()}),
+                                     columns=model_registry.CATEGORICAL, drop_first=True)
+            for col in columns:
+                if col not in encoded.columns:
+                    encoded[col] = 0
+            return encoded[columns]
+
+        def timed(fn):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            return (time.perf_counter() - start) / repeat
+
+        old = timed(old_way)
+        new = timed(lambda: encoder.transform(match))
+        print(f"{name}: {len(columns)} columns, get_dummies + padding {old * 1000:.2f}ms, "
+              f"encoder {new * 1000:.3f}ms ({old / new:.0f}x)")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "bench":
+        print("CMD Terminal Should Read: python3 feature_encoder.py bench")
+        sys.exit(1)
+    _bench()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Each model used to be five separate pickles (model, target_labelencoder,
+# imputer, scaler, model_columns) that app.py glued back together by hand,
+# twice. An inference bundle is all of it in one file per model:
+    # Jupyter/Referee_Model/referee.bundle.joblib
+    # Jupyter/Result_Model/result.bundle.joblib
+# holding the FeatureEncoder, imputer, scaler, the fitted model, the class
+# names (already decoded) and metadata: bundle version, feature columns,
+# categorical columns, which file it was trained on (size + sha1), the
+# sklearn version and when it was built.
+# The notebook writes it right after the five pickles (export_bundle).
+# load_bundle() is one joblib.load and checks the pieces still agree with
+# each other before anything predicts. load_bundle(path, mmap=True) memory-
+# maps the numpy arrays instead: slower to open for a forest (every tree is
+# a handful of small arrays) but processes serving the same bundle share the
+# pages. After that a prediction is one call:
+    # bundle.predict_proba({"Home": "Arsenal", ...})   (dict, list of dicts or DataFrame)
+    # bundle.predict(fixtures_df)
+# python3 inference_bundle.py build {referee|result} [--training-file=...]
+#     (bundle from the five pickles already exported; the training data defaults
+#     to the notebook's MasterDataset_ML - old 2.xlsx)
+# python3 inference_bundle.py info {BundleFile}
+# python3 inference_bundle.py bench {referee|result}   (five pickles vs the bundle, cold load)
+
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from feature_encoder import FeatureEncoder
+
+# Bump when what's inside a bundle changes; older bundles then refuse to load.
+BUNDLE_VERSION = 1
+
+def bundle_path(folder, name):
+    return os.path.join(folder, f"{name}.bundle.joblib")
+
+# Size + sha1 of the file a model was trained on (None if it isn't known).
+def training_data_info(path):
+    if path is None:
+        return None
+    from excel_cache import source_info
+    info = source_info(path, with_hash=True)
+    return {"file": os.path.basename(path), "size": info["size"], "sha1": info["sha1"]}
+
+class InferenceBundle:
+    def __init__(self, name, model, label_encoder, imputer, scaler, columns, categorical, training_data=None):
+        self.name = name
+        self.encoder = FeatureEncoder(columns, categorical)
+        self.imputer = imputer
+        self.scaler = scaler
+        self.model = model
+        # Class names in predict_proba's column order.
+        self.classes = np.asarray(label_encoder.inverse_transform(model.classes_))
+        self.metadata = {
+            "bundle_version": BUNDLE_VERSION,
+            "model": name,
+            "columns": list(columns),
+            "categorical": list(categorical),
+            "classes": self.classes.tolist(),
+            "training_data": training_data,
+            "sklearn_version": sklearn.__version__,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    # Raises ValueError if the pieces don't fit together any more.
+    def check(self, source="bundle"):
+        meta = self.metadata
+        if meta.get("bundle_version") != BUNDLE_VERSION:
+            raise ValueError(f"{source} is bundle version {meta.get('bundle_version')}, this code reads version "
+                             f"{BUNDLE_VERSION} (rebuild it: python3 inference_bundle.py build {meta.get('model')})")
+        columns = meta["columns"]
+        if self.encoder.columns != columns:
+            raise ValueError(f"{source}: the encoder's columns don't match the saved feature columns")
+        for part in ("imputer", "scaler", "model"):
+            expected = getattr(getattr(self, part), "n_features_in_", len(columns))
+            if expected != len(columns):
+                raise ValueError(f"{source}: the {part} expects {expected} features, the bundle has {len(columns)}")
+        names = getattr(self.imputer, "feature_names_in_", None)
+        if names is not None and list(names) != columns:
+            raise ValueError(f"{source}: the imputer was fitted on different columns than the bundle's")
+        if len(self.classes) != len(self.model.classes_):
+            raise ValueError(f"{source}: {len(self.classes)} class names for {len(self.model.classes_)} model classes")
+        return self
+
+    def predict_proba(self, data):
+        return self.predict_proba_encoded(self.encoder.transform(data))
+
+    # Rows that already went through self.encoder.transform (e.g. several
+    # requests' rows stacked into one batch).
+    def predict_proba_encoded(self, encoded):
+        # Column names on, the imputer was fitted on a DataFrame.
+        encoded = pd.DataFrame(encoded, columns=self.encoder.columns, copy=False)
+        return self.model.predict_proba(self.scaler.transform(self.imputer.transform(encoded)))
+
+    def predict(self, data):
+        return self.classes[self.predict_proba(data).argmax(axis=1)]
+
+def save_bundle(bundle, path):
+    tmp = path + ".tmp"
+    # Not compressed, so loading can memory-map the arrays.
+    joblib.dump(bundle, tmp)
+    os.replace(tmp, path)
+    return path
+
+# What the notebook calls after training (folder = where the pickles go).
+def export_bundle(name, model, label_encoder, imputer, scaler, columns, folder, training_file=None):
+    import model_registry
+    bundle = InferenceBundle(name, model, label_encoder, imputer, scaler, columns,
+                             model_registry.MODELS[name]["categorical"], training_data_info(training_file))
+    return save_bundle(bundle.check(), bundle_path(folder, name))
+
+def load_bundle(path, mmap=False):
+    try:
+        bundle = joblib.load(path, mmap_mode="r" if mmap else None)
+    except ValueError:
+        bundle = joblib.load(path)
+    if not isinstance(bundle, InferenceBundle):
+        raise ValueError(f"{path} isn't an inference bundle")
+    saved = bundle.metadata.get("sklearn_version")
+    if saved != sklearn.__version__:
+        print(f"warning: {os.path.basename(path)} was built with sklearn {saved}, this is {sklearn.__version__}")
+    return bundle.check(path)
+
+# A bundle out of the five pickles a notebook run already exported. The
+# training data is the notebook's workbook unless another one is given (and
+# left out if that workbook isn't there).
+def bundle_from_pickles(name, training_file=None):
+    import model_registry
+    if training_file is None and os.path.exists(model_registry.TRAINING_DATA):
+        training_file = model_registry.TRAINING_DATA
+    parts = model_registry.get_model(name)
+    return InferenceBundle(name, parts["model"], parts["label_encoder"], parts["imputer"], parts["scaler"],
+                           parts["columns"], model_registry.MODELS[name]["categorical"],
+                           training_data_info(training_file)).check()
+
+def _bench(name, repeat=5):
+    import model_registry
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    paths = list(model_registry.artifact_paths(name).values())
+    path = bundle_path(model_registry.MODELS[name]["dir"], name)
+    five = best(lambda: [joblib.load(p) for p in paths])
+    plain = best(lambda: load_bundle(path))
+    mapped = best(lambda: load_bundle(path, mmap=True))
+    print(f"{name}: five pickles {five:.3f}s, bundle {plain:.3f}s, bundle memory-mapped {mapped:.3f}s")
+
+if __name__ == "__main__":
+    commands = ("build", "info", "bench")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+    if len(args) != 2 or args[0] not in commands:
+        print("CMD Terminal Should Read: python3 inference_bundle.py build {referee|result} [--training-file=...]")
+        print("                      or: python3 inference_bundle.py info {BundleFile}")
+        print("                      or: python3 inference_bundle.py bench {referee|result}")
+        sys.exit(1)
+    # Through the module, so the pickle says inference_bundle.InferenceBundle
+    # and not __main__.InferenceBundle.
+    import inference_bundle
+    import model_registry
+    if args[0] == "build":
+        name = args[1]
+        bundle = inference_bundle.bundle_from_pickles(name, flags.get("training-file"))
+        print("Saved:", inference_bundle.save_bundle(bundle, bundle_path(model_registry.MODELS[name]["dir"], name)))
+    elif args[0] == "info":
+        for key, value in inference_bundle.load_bundle(args[1]).metadata.items():
+            print(f"{key}: {len(value)} entries" if key in ("columns", "classes") else f"{key}: {value}")
+    else:
+        inference_bundle._bench(args[1])
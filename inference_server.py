@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# The referee and match-result models over HTTP, for other tools that
+# don't want the Streamlit UI. Standard library only (plus what the models
+# already need); both models get loaded once at start-up.
+    # POST /predict/referee   -> top-k referees per match
+    # POST /predict/result    -> Away / Draw / Home probabilities per match
+    # GET  /metrics           -> p50 / p99 latency, requests, rows/sec, batch sizes
+    # GET  /health
+# A body is one match (same keys as app.py's input_match), a list of them,
+# or {"matches": [...]}. Every response has one prediction per match.
+# Micro-batching: each request's matches get encoded on its own thread (a
+# bad value, e.g. text or Infinity for a number, is a 400 for that request
+# only), then wait in the model's queue. One thread per model takes
+# whatever is queued, up to --max-batch matches or until --max-wait-ms after
+# the first one, and runs imputer -> scaler -> predict_proba once for all of
+# them. Under load many requests share one
+# predict_proba call; a lone request waits at most max-wait-ms. If a batch
+# still fails, its requests are re-run one by one so only the bad one errors.
+# python3 inference_server.py [--host=127.0.0.1] [--port=8765] [--max-batch=32] [--max-wait-ms=5] [--top=3]
+# python3 inference_server.py bench [--clients=16] [--requests=200] [--max-batch=32] [--max-wait-ms=5]
+#     (starts a server and hammers it; --max-batch=1 for no batching)
+
+import sys
+import json
+import time
+import queue
+import threading
+import http.client
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import model_registry
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BATCH = 32
+MAX_WAIT_MS = 5
+TOP_K = 3
+
+# Latencies kept per endpoint for the percentiles (the most recent ones).
+LATENCY_WINDOW = 10000
+# Seconds of history behind the "recent" requests/sec number.
+RECENT_SECONDS = 10
+
+# ------------- #
+# Micro-batches #
+# ------------- #
+
+class MicroBatcher:
+    def __init__(self, bundle, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.bundle = bundle
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.batched_rows = 0
+        threading.Thread(target=self._run, name=f"batcher-{bundle.name}", daemon=True).start()
+
+    # Encoded rows in, their predict_proba rows out (blocks until its batch ran).
+    def predict_proba(self, encoded):
+        future = Future()
+        self.queue.put((encoded, future))
+        return future.result()
+
+    def _next_batch(self):
+        items = [self.queue.get()]
+        rows = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch:
+            try:
+                remaining = deadline - time.perf_counter()
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            rows += len(item[0])
+        return items, rows
+
+    # A batch that fails gets re-run one request at a time, so only the
+    # request that broke it gets the error.
+    def _run_alone(self, items):
+        for encoded, future in items:
+            try:
+                future.set_result(self.bundle.predict_proba_encoded(encoded))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _run(self):
+        while True:
+            items, rows = self._next_batch()
+            try:
+                proba = self.bundle.predict_proba_encoded(np.vstack([encoded for encoded, _ in items]))
+            except Exception:
+                self._run_alone(items)
+                continue
+            self.batches += 1
+            self.batched_rows += rows
+            start = 0
+            for encoded, future in items:
+                future.set_result(proba[start:start + len(encoded)])
+                start += len(encoded)
+
+# ------- #
+# Metrics #
+# ------- #
+
+class Metrics:
+    def __init__(self, names):
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.latencies = {name: deque(maxlen=LATENCY_WINDOW) for name in names}
+        self.requests = dict.fromkeys(names, 0)
+        self.rows = dict.fromkeys(names, 0)
+        self.errors = dict.fromkeys(names, 0)
+
+    # Failed requests only count as errors (their latency would skew p50).
+    def record(self, name, seconds, rows, ok=True):
+        with self.lock:
+            self.requests[name] += 1
+            if not ok:
+                self.errors[name] += 1
+                return
+            self.latencies[name].append((time.time(), seconds))
+            self.rows[name] += rows
+
+    def snapshot(self, batchers):
+        now = time.time()
+        uptime = now - self.started
+        out = {"uptime_sec": round(uptime, 1), "models": {}}
+        with self.lock:
+            for name, samples in self.latencies.items():
+                ms = np.array([seconds for _, seconds in samples]) * 1000
+                recent = sum(1 for stamp, _ in samples if stamp >= now - RECENT_SECONDS)
+                batcher = batchers[name]
+                out["models"][name] = {
+                    "requests": self.requests[name],
+                    "errors": self.errors[name],
+                    "rows": self.rows[name],
+                    "p50_ms": round(float(np.percentile(ms, 50)), 3) if len(ms) else None,
+                    "p99_ms": round(float(np.percentile(ms, 99)), 3) if len(ms) else None,
+                    "requests_per_sec": round(self.requests[name] / uptime, 2) if uptime else 0,
+                    "recent_requests_per_sec": round(recent / min(RECENT_SECONDS, uptime or 1), 2),
+                    "rows_per_sec": round(self.rows[name] / uptime, 2) if uptime else 0,
+                    "batches": batcher.batches,
+                    "avg_batch_rows": round(batcher.batched_rows / batcher.batches, 2) if batcher.batches else None,
+                }
+        return out
+
+# ------------ #
+# HTTP handler #
+# ------------ #
+
+def matches_from_body(body):
+    data = json.loads(body or b"null")
+    if isinstance(data, dict) and "matches" in data:
+        data = data["matches"]
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list) or not data or not all(isinstance(match, dict) for match in data):
+        raise ValueError("send one match object, a list of them, or {\"matches\": [...]}")
+    return data
+
+def referee_predictions(proba, classes, top_k):
+    best = np.argsort(-proba, axis=1)[:, :top_k]
+    return [{"top": [{"referee": str(classes[i]), "probability": float(row[i])} for i in order]}
+            for row, order in zip(proba, best)]
+
+def result_predictions(proba, classes):
+    return [{"prediction": str(classes[row.argmax()]),
+             "probabilities": {str(c): float(p) for c, p in zip(classes, row)}} for row in proba]
+
+class Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so a client can send many requests on one connection.
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "models": list(self.server.batchers)})
+        elif self.path == "/metrics":
+            self._send(200, self.server.metrics.snapshot(self.server.batchers))
+        else:
+            self._send(404, {"error": f"no such endpoint: {self.path}"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        prefix = "/predict/"
+        name = self.path[len(prefix):] if self.path.startswith(prefix) else None
+        if name not in self.server.batchers:
+            self._send(404, {"error": f"no such endpoint: {self.path}"})
+            return
+        batcher = self.server.batchers[name]
+        try:
+            matches = matches_from_body(body)
+            encoded = batcher.bundle.encoder.transform(matches)
+            bad = ~np.isfinite(encoded) & ~np.isnan(encoded)
+            if bad.any():
+                row, col = np.argwhere(bad)[0]
+                raise ValueError(f"match {row}: '{batcher.bundle.encoder.columns[col]}' has to be a finite number")
+        except (ValueError, TypeError) as e:
+            self.server.metrics.record(name, time.perf_counter() - start, 0, ok=False)
+            self._send(400, {"error": str(e)})
+            return
+        try:
+            proba = batcher.predict_proba(encoded)
+        except Exception as e:
+            self.server.metrics.record(name, time.perf_counter() - start, 0, ok=False)
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        classes = batcher.bundle.classes
+        if name == "referee":
+            predictions = referee_predictions(proba, classes, self.server.top_k)
+        else:
+            predictions = result_predictions(proba, classes)
+        self.server.metrics.record(name, time.perf_counter() - start, len(matches))
+        self._send(200, {"model": name, "predictions": predictions})
+
+    # One line per request would be most of the work under load.
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host=HOST, port=PORT, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, top_k=TOP_K):
+    batchers = {name: MicroBatcher(model_registry.get_bundle(name), max_batch, max_wait_ms)
+                for name in model_registry.MODELS}
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.batchers = batchers
+    server.metrics = Metrics(batchers)
+    server.top_k = top_k
+    return server
+
+# ----- #
+# Bench #
+# ----- #
+
+# Starts a server on a free port and sends it requests from several threads
+# at once (one match per request, real rows from MasterDataset_ML).
+def _bench(clients=16, requests=200, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+    df = model_registry.read_excel(model_registry.DATASET)
+    matches = json.loads(df.drop(columns=["Referee", "WIN", "H_Score", "A_Score"], errors="ignore")
+                         .head(1000).to_json(orient="records"))
+    server = make_server(port=0, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    def client(worker):
+        conn = http.client.HTTPConnection(HOST, port)
+        for i in range(requests):
+            name = "referee" if i % 2 == 0 else "result"
+            body = json.dumps(matches[(worker * requests + i) % len(matches)])
+            conn.request("POST", f"/predict/{name}", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"{name}: HTTP {response.status}")
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    snapshot = server.metrics.snapshot(server.batchers)
+    server.shutdown()
+    total = clients * requests
+    print(f"max_batch={max_batch} max_wait_ms={max_wait_ms}: {total} requests from {clients} clients "
+          f"in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    for name, stats in snapshot["models"].items():
+        print(f"  {name}: p50 {stats['p50_ms']}ms, p99 {stats['p99_ms']}ms, {stats['batches']} batches, "
+              f"{stats['avg_batch_rows']} matches per batch")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+    if args not in ([], ["bench"]) or any("=" not in arg for arg in sys.argv[1:] if arg.startswith("--")):
+        print("CMD Terminal Should Read: python3 inference_server.py [--host=127.0.0.1] [--port=8765] "
+              "[--max-batch=32] [--max-wait-ms=5] [--top=3]")
+        print("                      or: python3 inference_server.py bench [--clients=16] [--requests=200] "
+              "[--max-batch=32] [--max-wait-ms=5]")
+        sys.exit(1)
+    max_batch = int(flags.get("max-batch", MAX_BATCH))
+    max_wait_ms = float(flags.get("max-wait-ms", MAX_WAIT_MS))
+    if args == ["bench"]:
+        _bench(int(flags.get("clients", 16)), int(flags.get("requests", 200)), max_batch, max_wait_ms)
+        sys.exit(0)
+    try:
+        server = make_server(flags.get("host", HOST), int(flags.get("port", PORT)), max_batch, max_wait_ms,
+                             int(flags.get("top", TOP_K)))
+    except FileNotFoundError as e:
+        print(e)
+        sys.exit(1)
+    host, port = server.server_address[:2]
+    print(f"Serving {', '.join(server.batchers)} on http://{host}:{port} "
+          f"(max batch {max_batch}, max wait {max_wait_ms}ms) - Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
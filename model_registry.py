@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+# ----------------------------------------------------------------------- #
+# Summary:
+# ----------------------------------------------------------------------- #
+# Streamlit re-runs app.py from the top on every click / slider drag, so the
+# app did all 10 joblib.load calls, read the whole MasterDataset_ML.xlsx and
+# rebuilt the dropdown lists every single time. This is where the app (and
+# anything else that predicts) gets those from instead:
+    # get_bundle("referee") / get_bundle("result")
+    #     the model's inference bundle (inference_bundle.py): encoder,
+    #     imputer, scaler, model and class names, one predict_proba call.
+    #     Read from <name>.bundle.joblib, or put together from the five
+    #     pickles when a notebook run hasn't written the bundle yet.
+    # get_model("referee") / get_model("result")
+    #     model, label encoder, scaler, imputer, training columns and the
+    #     FeatureEncoder built from those columns for one model.
+    # ui_options()
+    #     the dropdown lists and number defaults app.py shows, worked out
+    #     once from MasterDataset_ML.xlsx and kept in Jupyter/app_options.json
+    #     (rebuilt only when the dataset's size + mtime / sha1 change).
+# Each model file is loaded once per process (every session shares it) and
+# only when something first asks for that model. joblib memory-maps the numpy
+# arrays inside when the file allows it.
+# A file that changes on disk (re-trained model, new dataset) gets picked up
+# on the next call, no restart needed.
+# python3 model_registry.py options     (rebuilds app_options.json)
+# python3 model_registry.py bench       (old way vs the registry, per rerun)
+
+import os
+import sys
+import json
+import time
+import threading
+
+import joblib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "Data Collection & Processes", "Pipeline Tools"))
+from excel_cache import matches_source, read_excel, source_info
+from feature_encoder import FeatureEncoder
+import inference_bundle
+
+DATASET = os.path.join(ROOT, "Jupyter", "MasterDataset_ML.xlsx")
+# What the notebook trains both models on (Step 1).
+TRAINING_DATA = os.path.join(ROOT, "Jupyter", "MasterDataset_ML - old 2.xlsx")
+OPTIONS_PATH = os.path.join(ROOT, "Jupyter", "app_options.json")
+
+# Columns the notebook one-hot encoded (Step 4) for both models; each model
+# also encodes the other model's target.
+CATEGORICAL = ["Home", "Away", "Stadium City", "Referee - UK Region of Birth", "Season Start Year"]
+
+# name -> folder, the file for each piece of the model, and its categorical columns.
+MODELS = {
+    "referee": {"dir": os.path.join(ROOT, "Jupyter", "Referee_Model"), "model": "referee_model.pkl",
+                "categorical": CATEGORICAL + ["WIN"]},
+    "result": {"dir": os.path.join(ROOT, "Jupyter", "Result_Model"), "model": "result_model.pkl",
+               "categorical": CATEGORICAL + ["Referee"]},
+}
+ARTIFACTS = {
+    "label_encoder": "target_labelencoder.pkl",
+    "scaler": "scaler.pkl",
+    "imputer": "imputer.pkl",
+    "columns": "model_columns.pkl",
+}
+
+# Referees with fewer matches than this were left out of training.
+MIN_REFEREE_MATCHES = 70
+
+_artifacts = {}
+_encoders = {}
+_bundles = {}
+_lock = threading.Lock()
+
+def _joblib_load(path):
+    try:
+        return joblib.load(path, mmap_mode="r")
+    except ValueError:
+        # Compressed pickles can't be memory-mapped.
+        return joblib.load(path)
+
+# One joblib file, loaded once per process (and again only if it changes).
+def load_artifact(path, loader=_joblib_load):
+    stamp = os.stat(path).st_mtime_ns
+    cached = _artifacts.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with _lock:
+        cached = _artifacts.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = loader(path)
+        _artifacts[path] = (stamp, value)
+        return value
+
+def artifact_paths(name):
+    config = MODELS[name]
+    paths = {"model": os.path.join(config["dir"], config["model"])}
+    paths.update({key: os.path.join(config["dir"], file) for key, file in ARTIFACTS.items()})
+    return paths
+
+# The FeatureEncoder for one model, rebuilt only when model_columns.pkl is.
+def get_encoder(name, columns):
+    cached = _encoders.get(name)
+    if cached is None or cached[0] is not columns:
+        cached = (columns, FeatureEncoder(columns, MODELS[name]["categorical"]))
+        _encoders[name] = cached
+    return cached[1]
+
+# {"model", "label_encoder", "scaler", "imputer", "columns", "encoder"} for one model.
+def get_model(name):
+    if name not in MODELS:
+        raise KeyError(f"Unknown model '{name}', pick one of: {', '.join(MODELS)}")
+    paths = artifact_paths(name)
+    missing = [path for path in paths.values() if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"The {name} model is missing {', '.join(os.path.basename(p) for p in missing)} "
+                                f"(re-run the notebook to export it into {MODELS[name]['dir']})")
+    bundle = {key: load_artifact(path) for key, path in paths.items()}
+    bundle["encoder"] = get_encoder(name, bundle["columns"])
+    return bundle
+
+# The InferenceBundle for one model, loaded (and schema-checked) once.
+def get_bundle(name):
+    if name not in MODELS:
+        raise KeyError(f"Unknown model '{name}', pick one of: {', '.join(MODELS)}")
+    path = inference_bundle.bundle_path(MODELS[name]["dir"], name)
+    if os.path.exists(path):
+        return load_artifact(path, inference_bundle.load_bundle)
+    parts = get_model(name)
+    cached = _bundles.get(name)
+    if cached is None or cached[0] is not parts["model"]:
+        cached = (parts["model"], inference_bundle.bundle_from_pickles(name))
+        _bundles[name] = cached
+    return cached[1]
+
+# ------------------ #
+# Dropdowns/defaults #
+# ------------------ #
+
+# Exactly what app.py used to work out on every rerun.
+def build_ui_options(df):
+    counts = df["Referee"].value_counts()
+    rare_refs = counts[counts < MIN_REFEREE_MATCHES].index
+    df = df[~df["Referee"].isin(rare_refs)]
+    return {
+        "home_teams": df["Home"].sort_values().unique().tolist(),
+        "away_teams": sorted(df["Away"].unique().tolist()),
+        "stadium_cities": df["Stadium City"].sort_values().unique().tolist(),
+        "season_years": [int(year) for year in df["Season Start Year"].sort_values().unique()],
+        "uk_regions": df["Referee - UK Region of Birth"].sort_values().unique().tolist(),
+        "stadium_capacity": int(df["Stadium Capacity"].mean()),
+        "stadium_attendance": int(df["Stadium Attendance"].mean()),
+    }
+
+def save_ui_options(options, dataset=DATASET, path=OPTIONS_PATH):
+    payload = {"source": source_info(dataset, with_hash=True), "options": options}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+_options = {}
+
+# The options for the dataset, from app_options.json while it still matches.
+def ui_options(dataset=DATASET, path=OPTIONS_PATH):
+    stamp = os.stat(dataset).st_mtime_ns
+    cached = _options.get(dataset)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    options = None
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+            if matches_source(payload["source"], dataset):
+                options = payload["options"]
+        except (OSError, ValueError, KeyError):
+            options = None
+    if options is None:
+        options = build_ui_options(read_excel(dataset))
+        try:
+            save_ui_options(options, dataset, path)
+        except OSError as e:
+            print("warning: could not save the app options:", e)
+    _options[dataset] = (stamp, options)
+    return options
+
+# What every rerun used to cost vs what it costs now (models that aren't
+# exported are left out of both).
+def _bench(repeat=5):
+    import pandas as pd
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    files = [p for name in MODELS for p in artifact_paths(name).values() if os.path.exists(p)]
+
+    def old_rerun():
+        for path in files:
+            joblib.load(path)
+        build_ui_options(pd.read_excel(DATASET))
+
+    def new_rerun():
+        for path in files:
+            load_artifact(path)
+        ui_options()
+
+    old = best(old_rerun)
+    new_rerun()
+    new = best(new_rerun)
+    print(f"{len(files)} model files + dropdowns per rerun: before {old:.3f}s, registry {new * 1000:.3f}ms "
+          f"({old / new:.0f}x)")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("options", "bench"):
+        print("CMD Terminal Should Read: python3 model_registry.py options")
+        print("                      or: python3 model_registry.py bench")
+        sys.exit(1)
+    if sys.argv[1] == "options":
+        path = save_ui_options(build_ui_options(read_excel(DATASET)))
+        print("Saved:", path)
+    else:
+        _bench()